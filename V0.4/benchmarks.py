@@ -0,0 +1,1146 @@
+"""
+Smart File Renamer v0.4 벤치마크
+
+사용법:
+    python benchmarks.py recursive-scan [--depth 4] [--fanout 5] [--files 20] [--latency-ms 2]
+    python benchmarks.py classify [--count 500000]
+    python benchmarks.py collision [--count 100000]
+    python benchmarks.py parallel-rename [--count 2000] [--latency-ms 2] [--workers 1,4,16]
+    python benchmarks.py dir-fd [--count 20000] [--nesting 40]
+    python benchmarks.py journal [--count 50000] [--group-size 2000]
+    python benchmarks.py history [--count 1000000]
+    python benchmarks.py live-preview [--count 100000]
+    python benchmarks.py template [--count 1000000]
+    python benchmarks.py batch-progress [--count 20000]
+    python benchmarks.py file-table [--counts 100000,1000000] [--timeout 600]
+    python benchmarks.py folder-batch [--folders 200] [--files 500] [--workers 1,2,4,8]
+    python benchmarks.py suite [--sizes 10000,100000,1000000] [--dir /dev/shm] [--json out.json] [--baseline old.json] [--timeout 3600]
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import queue
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from rename_engine import (
+    BatchControl, CollisionIndex, DirFdRenameBackend, FileTypeClassifier, FolderBatchRunner, FolderScanner,
+    NamePlan, PathRenameBackend, RecursiveFolderScanner, RenameJournal, RenameMode, RenameTemplate, UndoHistory
+)
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+# ============================================================================
+# 테스트 데이터 생성
+# ============================================================================
+
+# 실제 카메라/문서 폴더와 비슷한 확장자 분포 (확장자, 가중치)
+EXTENSION_MIX = [
+    ('.jpg', 40), ('.JPG', 10), ('.png', 8), ('.heic', 5), ('.cr2', 2),
+    ('.mp4', 10), ('.MOV', 5), ('.pdf', 5), ('.txt', 4), ('.docx', 2),
+    ('.xmp', 4), ('.dat', 3), ('', 2),
+]
+
+
+def make_file_names(count: int, seed: int = 0) -> List[str]:
+    """확장자 분포를 반영한 합성 파일명 목록 생성"""
+    rng = random.Random(seed)
+    extensions = [ext for ext, _ in EXTENSION_MIX]
+    weights = [weight for _, weight in EXTENSION_MIX]
+    chosen = rng.choices(extensions, weights=weights, k=count)
+    return [f"IMG_{i:07d}{ext}" for i, ext in enumerate(chosen)]
+
+
+def make_deep_tree(root: str, depth: int, fanout: int, files_per_dir: int) -> Tuple[int, int]:
+    """
+    깊은 합성 폴더 트리 생성
+    
+    Args:
+        root: 최상위 폴더
+        depth: 하위 폴더 깊이
+        fanout: 폴더당 하위 폴더 수
+        files_per_dir: 폴더당 파일 수
+    
+    Returns:
+        (폴더 수, 파일 수) 튜플
+    """
+    dir_count = 0
+    file_count = 0
+    level = [root]
+    for current_depth in range(depth + 1):
+        next_level = []
+        for folder in level:
+            os.makedirs(folder, exist_ok=True)
+            dir_count += 1
+            for i in range(files_per_dir):
+                with open(os.path.join(folder, f"IMG_{i:04d}.jpg"), 'wb'):
+                    pass
+                file_count += 1
+            if current_depth < depth:
+                next_level.extend(os.path.join(folder, f"d{j}") for j in range(fanout))
+        level = next_level
+    return dir_count, file_count
+
+
+# ============================================================================
+# 재귀 스캔
+# ============================================================================
+
+class LatencyRecursiveScanner(RecursiveFolderScanner):
+    """디렉터리마다 네트워크 왕복 지연을 흉내 내는 스캐너"""
+    
+    def __init__(self, folder: str, latency: float, **kwargs):
+        super().__init__(folder, **kwargs)
+        self.latency = latency
+    
+    def _scan_directory(self, path: str, rel_dir: str, depth: int):
+        time.sleep(self.latency)
+        return super()._scan_directory(path, rel_dir, depth)
+
+
+def bench_recursive_scan(
+    root: str,
+    workers_list: List[int],
+    latency: float = 0.0,
+    repeat: int = 3
+) -> List[Tuple[int, float, int]]:
+    """
+    작업자 수별 재귀 스캔 처리량 측정
+    
+    Returns:
+        [(작업자 수, 최소 소요 시간, 파일 수), ...] 리스트
+    """
+    results = []
+    for workers in workers_list:
+        best = float('inf')
+        files = 0
+        for _ in range(repeat):
+            scanner = LatencyRecursiveScanner(root, latency, max_workers=workers)
+            started = time.perf_counter()
+            files = sum(len(chunk) for chunk in scanner.iter_chunks())
+            best = min(best, time.perf_counter() - started)
+        results.append((workers, best, files))
+    return results
+
+
+def run_recursive_scan(args):
+    workdir = tempfile.mkdtemp(prefix='sfr_bench_')
+    try:
+        dirs, files = make_deep_tree(workdir, args.depth, args.fanout, args.files)
+        print(f"tree: {dirs} dirs, {files} files, latency {args.latency_ms} ms/dir")
+        workers_list = [int(w) for w in args.workers.split(',')]
+        results = bench_recursive_scan(workdir, workers_list, args.latency_ms / 1000.0, args.repeat)
+        base: Optional[float] = None
+        for workers, elapsed, count in results:
+            base = base or elapsed
+            print(f"workers={workers:3d}  {elapsed * 1000:9.1f} ms  "
+                  f"{count / elapsed:12.0f} files/s  x{base / elapsed:.2f}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+# ============================================================================
+# 파일 타입 분류
+# ============================================================================
+
+def legacy_get_file_type(filename: str) -> str:
+    """v0.4 초기 구현 (pathlib.Path 기반) - 비교 기준"""
+    ext = Path(filename).suffix.lower()
+    if ext in FileTypeClassifier.IMAGE_EXTENSIONS:
+        return 'image'
+    elif ext in FileTypeClassifier.VIDEO_EXTENSIONS:
+        return 'video'
+    elif ext in FileTypeClassifier.DOCUMENT_EXTENSIONS:
+        return 'document'
+    return 'other'
+
+
+def time_best(func: Callable[[], object], repeat: int) -> float:
+    """repeat회 실행 중 최소 소요 시간 (초)"""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def run_classify(args):
+    names = make_file_names(args.count)
+    
+    expected = [legacy_get_file_type(name) for name in names]
+    codes = FileTypeClassifier.classify_many(names)
+    assert [FileTypeClassifier.FILE_TYPES[code] for code in codes] == expected
+    
+    get_file_type = FileTypeClassifier.get_file_type
+    cases = [
+        ('legacy Path-based get_file_type', lambda: [legacy_get_file_type(n) for n in names]),
+        ('get_file_type', lambda: [get_file_type(n) for n in names]),
+        ('classify_many', lambda: FileTypeClassifier.classify_many(names)),
+    ]
+    print(f"classify {len(names)} names")
+    base: Optional[float] = None
+    for label, func in cases:
+        elapsed = time_best(func, args.repeat)
+        base = base or elapsed
+        print(f"{label:34s} {elapsed * 1000:9.1f} ms  "
+              f"{len(names) / elapsed / 1e6:7.2f} M names/s  x{base / elapsed:.1f}")
+
+
+# ============================================================================
+# 파일명 충돌 해결
+# ============================================================================
+
+def legacy_resolve_collision(base_name: str, used_names: set) -> str:
+    """v0.4 초기 구현 (매번 (1)부터 선형 탐색) - 비교 기준"""
+    if base_name not in used_names:
+        return base_name
+    path = Path(base_name)
+    counter = 1
+    while True:
+        new_name = f"{path.stem}({counter}){path.suffix}"
+        if new_name not in used_names:
+            return new_name
+        counter += 1
+
+
+def resolve_all_legacy(names: List[str]) -> List[str]:
+    used_names = set()
+    result = []
+    for name in names:
+        new_name = legacy_resolve_collision(name, used_names)
+        used_names.add(new_name)
+        result.append(new_name)
+    return result
+
+
+def resolve_all_indexed(names: List[str]) -> List[str]:
+    collisions = CollisionIndex()
+    return [collisions.claim(name) for name in names]
+
+
+def run_collision(args):
+    # 결과 동일성 확인: 이미 번호가 붙은 이름이 섞여 있어도 같은 결과여야 함
+    mixed = ['a.jpg', 'a(2).jpg', 'a.jpg', 'a.jpg', 'a(1).jpg', 'a.jpg', '.jpg', '.jpg', 'b', 'b']
+    assert resolve_all_indexed(mixed) == resolve_all_legacy(mixed)
+    
+    print("all names collide on 'IMG.jpg'")
+    for count in (1000, 5000, 10000, args.count):
+        names = ['IMG.jpg'] * count
+        indexed = time_best(lambda: resolve_all_indexed(names), args.repeat)
+        line = f"n={count:8d}  CollisionIndex {indexed * 1000:9.1f} ms"
+        if count <= args.legacy_max:
+            assert resolve_all_indexed(names) == resolve_all_legacy(names)
+            legacy = time_best(lambda: resolve_all_legacy(names), 1)
+            line += f"  legacy {legacy * 1000:10.1f} ms  x{legacy / indexed:.0f}"
+        else:
+            line += "  legacy skipped (quadratic)"
+        print(line)
+
+
+# ============================================================================
+# 병렬 이름 변경
+# ============================================================================
+
+class LatencyRenameBackend(PathRenameBackend):
+    """파일시스템 호출마다 네트워크 왕복 지연을 흉내 내는 백엔드"""
+    
+    latency = 0.0
+    
+    def exists(self, name: str) -> bool:
+        time.sleep(self.latency)
+        return super().exists(name)
+    
+    def lexists(self, name: str) -> bool:
+        time.sleep(self.latency)
+        return super().lexists(name)
+    
+    def rename(self, old_name: str, new_name: str):
+        time.sleep(self.latency)
+        super().rename(old_name, new_name)
+
+
+def make_flat_folder(root: str, count: int) -> List[str]:
+    """빈 파일 count개가 있는 폴더 생성"""
+    names = [f"IMG_{i:07d}.jpg" for i in range(count)]
+    for name in names:
+        with open(os.path.join(root, name), 'wb'):
+            pass
+    return names
+
+
+def bench_parallel_rename(count: int, workers: int, latency: float) -> Tuple[float, float]:
+    """
+    이름 변경과 Undo를 한 번씩 실행해 소요 시간 측정
+    
+    일부는 순환(a→b, b→a)으로 구성해 계획기/임시 이름 경로도 함께 측정한다.
+    
+    Returns:
+        (이름 변경 소요 시간, Undo 소요 시간) 튜플
+    """
+    workdir = tempfile.mkdtemp(prefix='sfr_bench_')
+    try:
+        names = make_flat_folder(workdir, count)
+        mode = RenameMode()
+        mode.selected_folder = workdir
+        mode.rename_workers = workers
+        mode.backend_factory = type('Backend', (LatencyRenameBackend,), {'latency': latency})
+        mode._scan_files()
+        
+        swaps = count // 10 * 2
+        rename_list = [(names[i], names[i + 1]) if i % 2 == 0 else (names[i], names[i - 1])
+                       for i in range(swaps)]
+        rename_list += [(name, f"renamed_{i:07d}.jpg") for i, name in enumerate(names[swaps:])]
+        
+        started = time.perf_counter()
+        success, errors, undo_stack = mode.rename_files(rename_list)
+        rename_elapsed = time.perf_counter() - started
+        assert (success, errors) == (count, 0), (success, errors)
+        mode.refresh_after_batch()
+        
+        started = time.perf_counter()
+        success, errors = mode.perform_undo(undo_stack)
+        undo_elapsed = time.perf_counter() - started
+        assert (success, errors) == (count, 0), (success, errors)
+        assert sorted(os.listdir(workdir)) == names
+        return rename_elapsed, undo_elapsed
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def run_parallel_rename(args):
+    latency = args.latency_ms / 1000.0
+    print(f"rename {args.count} files (20% in swap cycles), latency {args.latency_ms} ms/call")
+    base: Optional[float] = None
+    for workers in [int(w) for w in args.workers.split(',')]:
+        rename_elapsed, undo_elapsed = bench_parallel_rename(args.count, workers, latency)
+        base = base or rename_elapsed
+        print(f"workers={workers:3d}  rename {rename_elapsed * 1000:9.1f} ms  "
+              f"{args.count / rename_elapsed:9.0f} files/s  x{base / rename_elapsed:.2f}  "
+              f"undo {undo_elapsed * 1000:9.1f} ms")
+
+
+# ============================================================================
+# dir_fd 기준 이름 변경
+# ============================================================================
+
+def bench_backend_renames(backend: PathRenameBackend, names: List[str], repeat: int) -> float:
+    """
+    실행기와 같은 호출 패턴(대상 확인 → 이름 변경)으로 왕복 이름 변경 시간 측정
+    
+    Returns:
+        파일당 한 번의 (확인 + 이름 변경)에 걸린 최소 평균 시간 (초)
+    """
+    renamed = [f"new_{name}" for name in names]
+    best = float('inf')
+    with backend:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            for pairs in (zip(names, renamed), zip(renamed, names)):
+                for old_name, new_name in pairs:
+                    if backend.lexists(new_name):
+                        raise RuntimeError(f"{new_name} already exists")
+                    backend.rename(old_name, new_name)
+            best = min(best, (time.perf_counter() - started) / (2 * len(names)))
+    return best
+
+
+def run_dir_fd(args):
+    if not DirFdRenameBackend.is_supported():
+        print("dir_fd rename/stat is not supported on this platform")
+        return
+    workdir = tempfile.mkdtemp(prefix='sfr_bench_')
+    try:
+        folder = os.path.join(workdir, *[f"level_{i:02d}_directory" for i in range(args.nesting)])
+        os.makedirs(folder)
+        names = make_flat_folder(folder, args.count)
+        print(f"{args.count} files, folder nested {args.nesting} levels ({len(folder)} chars)")
+        
+        base: Optional[float] = None
+        for label, backend_class in (('path-based', PathRenameBackend), ('dir_fd', DirFdRenameBackend)):
+            elapsed = bench_backend_renames(backend_class(folder), names, args.repeat)
+            base = base or elapsed
+            print(f"{label:12s} {elapsed * 1e6:8.2f} us/file  x{base / elapsed:.2f}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+# ============================================================================
+# 저널 기록 비용
+# ============================================================================
+
+class CountingJournal(RenameJournal):
+    """fsync 호출 수를 벤치마크 결과에 남기기 위한 저널"""
+    
+    instances: List[RenameJournal] = []
+    
+    @classmethod
+    def create(cls, *args, **kwargs):
+        journal = super().create(*args, **kwargs)
+        cls.instances.append(journal)
+        return journal
+
+
+def bench_journal(count: int, journal_dir: Optional[str]) -> Tuple[float, int]:
+    """
+    이름 변경 1회의 소요 시간과 fsync 횟수 측정
+    
+    Returns:
+        (소요 시간, fsync 횟수) 튜플
+    """
+    workdir = tempfile.mkdtemp(prefix='sfr_bench_')
+    try:
+        names = make_flat_folder(workdir, count)
+        mode = RenameMode()
+        mode.selected_folder = workdir
+        mode.journal_dir = journal_dir
+        mode._scan_files()
+        
+        CountingJournal.instances = []
+        started = time.perf_counter()
+        success, errors, _ = mode.rename_files([(name, f"renamed_{name}") for name in names])
+        elapsed = time.perf_counter() - started
+        assert (success, errors) == (count, 0), (success, errors)
+        return elapsed, sum(journal.fsync_count for journal in CountingJournal.instances)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def run_journal(args):
+    import rename_engine
+    rename_engine.RenameJournal = CountingJournal
+    CountingJournal.GROUP_SIZE = args.group_size
+    
+    journal_dir = tempfile.mkdtemp(prefix='sfr_journal_')
+    try:
+        print(f"rename {args.count} files, {args.group_size} chains per fsync")
+        base: Optional[float] = None
+        for label, directory in (('journal off', None), ('journal on', journal_dir)):
+            runs = [bench_journal(args.count, directory) for _ in range(args.repeat)]
+            elapsed = min(elapsed for elapsed, _ in runs)
+            fsyncs = runs[-1][1]
+            base = base or elapsed
+            print(f"{label:12s} {elapsed * 1000:9.1f} ms  {args.count / elapsed:9.0f} files/s  "
+                  f"x{base / elapsed:.2f}  fsync {fsyncs}")
+        assert not os.listdir(journal_dir), "finished batches must not leave a journal"
+    finally:
+        shutil.rmtree(journal_dir, ignore_errors=True)
+
+
+# ============================================================================
+# Undo 기록
+# ============================================================================
+
+def run_history(args):
+    workdir = tempfile.mkdtemp(prefix='sfr_bench_')
+    try:
+        history = UndoHistory(os.path.join(workdir, 'history.sqlite3'))
+        folder = '/data/photos'
+        rows = ((f"{folder}/renamed_{i:07d}.jpg", f"{folder}/IMG_{i:07d}.jpg") for i in range(args.count))
+        
+        started = time.perf_counter()
+        batch_id = history.record_batch(folder, rows)
+        elapsed = time.perf_counter() - started
+        print(f"record {args.count} rows          {elapsed * 1000:9.1f} ms  {args.count / elapsed:10.0f} rows/s")
+        
+        tracemalloc.start()
+        started = time.perf_counter()
+        streamed = 0
+        last = None
+        for chunk in history.iter_ops(batch_id, reverse=True):
+            streamed += len(chunk)
+            last = chunk[-1]
+        elapsed = time.perf_counter() - started
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        assert streamed == args.count and last[1].endswith("IMG_0000000.jpg")
+        print(f"stream reverse (chunks)    {elapsed * 1000:9.1f} ms  peak {peak / 1e6:8.1f} MB")
+        
+        tracemalloc.start()
+        started = time.perf_counter()
+        undo_stack = [op for chunk in history.iter_ops(batch_id) for op in chunk][::-1]
+        elapsed = time.perf_counter() - started
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        assert len(undo_stack) == args.count
+        print(f"load as list               {elapsed * 1000:9.1f} ms  peak {peak / 1e6:8.1f} MB")
+        history.close()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+# ============================================================================
+# 실시간 미리보기
+# ============================================================================
+
+def run_live_preview(args):
+    # 이미지만 이름을 바꾸고 나머지 파일은 배치 밖 기존 이름으로 남김
+    names = make_file_names(args.count)
+    files = sorted(name for name in names if FileTypeClassifier.get_file_type(name) == 'image')
+    reserved = set(names)
+    print(f"{len(files)} of {len(names)} names in the batch, typing one character at a time")
+    
+    for use_sequential in (False, True):
+        plan = NamePlan(files, reserved, '', use_sequential=use_sequential)
+        started = time.perf_counter()
+        for _ in plan.iter_build():
+            pass
+        print(f"sequential={use_sequential}  initial build {(time.perf_counter() - started) * 1000:9.1f} ms")
+        
+        # 'IMG_'는 배치 밖 이름 전부가 충돌 후보가 되는 최악의 경우
+        for text in ('trip_', 'IMG_'):
+            for end in range(1, len(text) + 1):
+                prefix = text[:end]
+                started = time.perf_counter()
+                plan.set_prefix(prefix)
+                incremental = time.perf_counter() - started
+                
+                rebuilt = NamePlan(files, reserved, prefix, use_sequential=use_sequential)
+                started = time.perf_counter()
+                expected = list(rebuilt.iter_build())
+                full = time.perf_counter() - started
+                assert list(plan) == expected
+                print(f"  prefix {prefix!r:8s} set_prefix {incremental * 1000:8.2f} ms  "
+                      f"rebuild {full * 1000:8.1f} ms  x{full / max(incremental, 1e-9):.0f}")
+
+
+# ============================================================================
+# 이름 템플릿
+# ============================================================================
+
+def interpret_template(template: RenameTemplate, prefix: str, stat_result) -> Callable[[str, int], str]:
+    """파일마다 세그먼트 목록을 해석하는 방식 - 컴파일 방식의 비교 기준"""
+    def render(file: str, index: int) -> str:
+        head, _, name = file.rpartition(os.sep)
+        ext = FileTypeClassifier.get_suffix(name)
+        values = {
+            'prefix': prefix, 'name': name, 'ext': ext, 'stem': name[:len(name) - len(ext)],
+            'parent': head.rpartition(os.sep)[2], 'n': 1 + index,
+        }
+        parts = []
+        for token, spec, filters in template.segments:
+            if token is None:
+                parts.append(spec)
+                continue
+            if token == 'date':
+                value = time.strftime(spec, time.localtime(stat_result.st_mtime))
+            else:
+                value = format(values[token], spec)
+            for name_ in filters:
+                value = RenameTemplate.FILTERS[name_](value)
+            parts.append(value)
+        new = ''.join(parts) or name
+        return f"{head}{os.sep}{new}" if head else new
+    return render
+
+
+def run_template(args):
+    files = sorted(make_file_names(args.count))
+    stat_result = os.stat(__file__)
+    
+    def build(plan: NamePlan) -> List[Tuple[str, str]]:
+        return list(plan.iter_build())
+    
+    def templated(text: str, render=None) -> NamePlan:
+        template = RenameTemplate(text)
+        render = render or template.compile('trip_', 1, 'photos', lambda file: stat_result)
+        return NamePlan(files, set(), 'trip_', template=template, render=render)
+    
+    print(f"generate {len(files)} names (collision handling included)")
+    cases = [
+        ("prefix + name (f-string)", lambda: NamePlan(files, set(), 'trip_')),
+        ("template {prefix}{name}", lambda: templated('{prefix}{name}')),
+        ("prefix + number (f-string)", lambda: NamePlan(files, set(), 'trip_', use_sequential=True)),
+        ("template {prefix}{n:03}{ext}", lambda: templated('{prefix}{n:03}{ext}')),
+    ]
+    # 같은 결과인지 확인 후 측정
+    assert build(cases[0][1]()) == build(cases[1][1]())
+    assert build(cases[2][1]()) == build(cases[3][1]())
+    
+    rich = '{prefix}{date:%Y%m%d}_{n:04}_{stem|lower}{ext|lower}'
+    compiled = RenameTemplate(rich).compile('trip_', 1, 'photos', lambda file: stat_result)
+    interpreted = interpret_template(RenameTemplate(rich), 'trip_', stat_result)
+    assert build(templated(rich)) == build(templated(rich, interpreted))
+    cases += [
+        ("template (rich, compiled)", lambda: templated(rich)),
+        ("template (rich, interpreted per file)", lambda: templated(rich, interpreted)),
+    ]
+    
+    for label, make_plan in cases:
+        elapsed = time_best(lambda: build(make_plan()), args.repeat)
+        print(f"{label:38s} {elapsed * 1000:9.1f} ms  {len(files) / elapsed / 1e6:6.2f} M names/s")
+    
+    print(f"render only, rich = {rich}")
+    for label, render in (("compiled", compiled), ("interpreted per file", interpreted)):
+        elapsed = time_best(lambda: [render(file, index) for index, file in enumerate(files)], args.repeat)
+        print(f"{label:38s} {elapsed * 1000:9.1f} ms  {len(files) / elapsed / 1e6:6.2f} M names/s")
+
+
+# ============================================================================
+# 진입점
+# ============================================================================
+
+# ============================================================================
+# 배치 진행 상황
+# ============================================================================
+
+def bench_batch_progress(count: int, controlled: bool) -> Tuple[float, int]:
+    """
+    이름 변경 1회의 소요 시간과 진행 상황 보고 횟수 측정
+    
+    Returns:
+        (소요 시간, 보고 횟수) 튜플
+    """
+    workdir = tempfile.mkdtemp(prefix='sfr_bench_')
+    try:
+        names = make_flat_folder(workdir, count)
+        mode = RenameMode()
+        mode.selected_folder = workdir
+        mode.journal_dir = None
+        mode._scan_files()
+        
+        reports = []
+        rename_list = [(name, f"renamed_{name}") for name in names]
+        started = time.perf_counter()
+        if controlled:
+            with mode.controlled(BatchControl(count, report=reports.append)):
+                success, errors, _ = mode.rename_files(rename_list)
+        else:
+            success, errors, _ = mode.rename_files(rename_list)
+        elapsed = time.perf_counter() - started
+        assert (success, errors) == (count, 0), (success, errors)
+        return elapsed, len(reports)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def bench_abort_latency(count: int, abort_after: float) -> Tuple[float, int]:
+    """
+    작업 스레드에서 이름 변경 중 중단했을 때 반환까지 걸린 시간 측정
+    
+    Returns:
+        (중단 요청부터 반환까지 걸린 시간, 건너뛴 파일 수) 튜플
+    """
+    workdir = tempfile.mkdtemp(prefix='sfr_bench_')
+    try:
+        names = make_flat_folder(workdir, count)
+        mode = RenameMode()
+        mode.selected_folder = workdir
+        mode.journal_dir = None
+        mode._scan_files()
+        
+        control = BatchControl(count)
+        
+        def task():
+            with mode.controlled(control):
+                mode.rename_files([(name, f"renamed_{name}") for name in names])
+        
+        worker = threading.Thread(target=task)
+        worker.start()
+        time.sleep(abort_after)
+        started = time.perf_counter()
+        control.abort()
+        worker.join()
+        return time.perf_counter() - started, mode.skipped_count
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def run_batch_progress(args):
+    print(f"rename {args.count} files")
+    base: Optional[float] = None
+    for label, controlled in (('no control', False), ('progress', True)):
+        runs = [bench_batch_progress(args.count, controlled) for _ in range(args.repeat)]
+        elapsed = min(elapsed for elapsed, _ in runs)
+        reports = runs[-1][1]
+        base = base or elapsed
+        print(f"{label:12s} {elapsed * 1000:9.1f} ms  {args.count / elapsed:9.0f} files/s  "
+              f"x{base / elapsed:.2f}  reports {reports} ({reports / elapsed:.1f}/s)")
+    
+    latency, skipped = bench_abort_latency(args.count, abort_after=0.05)
+    print(f"abort latency {latency * 1000:8.1f} ms  skipped {skipped} files")
+
+
+# ============================================================================
+# 파일 테이블 메모리
+# ============================================================================
+
+def make_mixed_folder(root: str, count: int):
+    """확장자 분포를 반영한 빈 파일 count개가 있는 폴더 생성"""
+    for name in make_file_names(count):
+        with open(os.path.join(root, name), 'wb'):
+            pass
+
+
+def hold_baseline_structures(folder: str) -> list:
+    """v0.4 원본 구조: 파일명 목록, 미리보기 튜플 목록, 행 ID별 체크박스/인덱스 딕셔너리"""
+    all_files = sorted(name for name in os.listdir(folder) if os.path.isfile(os.path.join(folder, name)))
+    filtered_files = FileTypeClassifier.filter_files_by_type(all_files, set(FileTypeClassifier.FILE_TYPES))
+    preview_data = [(name, f"ren_{name}") for name in filtered_files]
+    item_ids = [f"I{index + 1:03X}" for index in range(len(preview_data))]  # Treeview 행 ID
+    file_checkboxes = dict.fromkeys(item_ids, True)  # 원본은 행마다 BooleanVar (더 큼)
+    item_id_to_index = {item_id: index for index, item_id in enumerate(item_ids)}
+    return [all_files, filtered_files, preview_data, file_checkboxes, item_id_to_index]
+
+
+def hold_entry_structures(folder: str) -> list:
+    """파일 테이블 이전 구조: DirEntry 딕셔너리, 타입별 정렬 목록, 병합 목록, 이름 계획, 선택 비트"""
+    from smart_file_renamer import SelectionModel
+    
+    scanner = FolderScanner(folder)
+    file_entries = {}
+    for chunk in scanner.iter_chunks():
+        file_entries.update(chunk)
+    all_files = sorted(file_entries)
+    
+    buckets = [[] for _ in FileTypeClassifier.FILE_TYPES]
+    for name, code in zip(all_files, FileTypeClassifier.classify_many(all_files)):
+        buckets[code].append(name)
+    filtered_files = sorted(name for bucket in buckets for name in bucket)
+    name_index = set(file_entries)
+    name_index.update(scanner.other_names)
+    
+    plan = NamePlan(filtered_files, name_index, 'ren_')
+    for _ in plan.iter_build():
+        pass
+    return [file_entries, all_files, buckets, filtered_files, name_index, plan, SelectionModel(len(plan))]
+
+
+def hold_table_structures(folder: str) -> list:
+    """FileTable 구조: 열 기반 테이블, 필터링된 목록, 이름 계획, 선택 비트"""
+    from smart_file_renamer import SelectionModel
+    
+    mode = RenameMode()
+    mode.journal_dir = None
+    mode.set_folder(folder)
+    mode.apply_file_type_filter(set(FileTypeClassifier.FILE_TYPES))
+    plan = mode.create_name_plan('ren_')
+    for _ in plan.iter_build():
+        pass
+    return [mode, plan, SelectionModel(len(plan))]
+
+
+FILE_TABLE_VARIANTS = {
+    'baseline': hold_baseline_structures,
+    'dir-entries': hold_entry_structures,
+    'file-table': hold_table_structures,
+}
+
+
+def max_rss_bytes() -> int:
+    """현재 프로세스의 최대 RSS (ru_maxrss는 Linux에서 KB, macOS에서 바이트)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def collect_result(process: multiprocessing.Process, results: multiprocessing.Queue, timeout: float) -> Any:
+    """
+    측정 프로세스의 결과를 받고 종료 확인
+    
+    프로세스가 결과 없이 끝나거나(메모리 부족 등으로 강제 종료) timeout 초 안에 결과를 보내지 않으면
+    기다리지 않고 RuntimeError를 발생시킨다.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            result = results.get(timeout=min(1.0, max(0.0, deadline - time.monotonic())))
+            break
+        except queue.Empty:
+            if not process.is_alive():
+                process.join()
+                raise RuntimeError(f"benchmark process exited with code {process.exitcode} before reporting")
+            if time.monotonic() >= deadline:
+                process.terminate()
+                process.join()
+                raise RuntimeError(f"benchmark process timed out after {timeout:g} s")
+    process.join(timeout)
+    if process.exitcode != 0:
+        raise RuntimeError(f"benchmark process exited with code {process.exitcode}")
+    return result
+
+
+def measure_variant(variant: str, folder: str, results: multiprocessing.Queue):
+    """새 프로세스에서 구조를 만들어 최대 RSS 증가량 측정 (ru_maxrss는 줄지 않으므로 변형마다 분리)"""
+    base = max_rss_bytes()
+    started = time.perf_counter()
+    held = FILE_TABLE_VARIANTS[variant](folder)  # 최대 RSS를 읽을 때까지 유지
+    elapsed = time.perf_counter() - started
+    peak = max_rss_bytes() - base
+    del held
+    results.put((peak, elapsed))
+
+
+def run_file_table(args):
+    if resource is None:
+        print("peak RSS needs the resource module (not available on Windows)")
+        return
+    
+    context = multiprocessing.get_context('spawn')
+    for count in (int(value) for value in args.counts.split(',')):
+        workdir = tempfile.mkdtemp(prefix='sfr_bench_')
+        try:
+            make_mixed_folder(workdir, count)
+            print(f"{count} files")
+            base: Optional[int] = None
+            for variant in FILE_TABLE_VARIANTS:
+                results = context.Queue()
+                process = context.Process(target=measure_variant, args=(variant, workdir, results))
+                process.start()
+                try:
+                    peak, elapsed = collect_result(process, results, args.timeout)
+                except RuntimeError as e:
+                    print(f"  {variant:12s} FAILED: {e}", file=sys.stderr)
+                    continue
+                base = base or peak
+                ratio = f"x{base / peak:.2f}" if base and peak else 'x-'  # 작은 폴더는 RSS가 늘지 않을 수 있음
+                print(f"  {variant:12s} peak RSS +{peak / 1e6:8.1f} MB  {peak / count:6.0f} B/file  "
+                      f"{ratio}  build {elapsed * 1000:8.1f} ms")
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+
+# ============================================================================
+# 여러 폴더 일괄 작업
+# ============================================================================
+
+def run_folder_batch(args):
+    workdir = tempfile.mkdtemp(prefix='sfr_bench_')
+    try:
+        folders = []
+        for index in range(args.folders):
+            folder = os.path.join(workdir, f"cam{index:04d}")
+            os.mkdir(folder)
+            make_mixed_folder(folder, args.files)
+            folders.append(folder)
+        total = args.folders * args.files
+        print(f"{args.folders} folders x {args.files} files (cpu {os.cpu_count()})")
+        
+        base: Optional[float] = None
+        for workers in (int(value) for value in args.workers.split(',')):
+            # 폴더마다 접두사를 붙였다가 되돌리는 대신 매번 다른 접두사로 이어서 변경
+            runner = FolderBatchRunner({'prefix': f"w{workers}_"}, workers=workers)
+            started = time.perf_counter()
+            reports = []
+            summary = runner.run(folders, on_report=reports.append)
+            elapsed = time.perf_counter() - started
+            assert summary['renamed'] == total and not summary['failed_folders']
+            base = base or elapsed
+            busy = sum(report['scan'] + report['plan'] + report['rename'] for report in reports)
+            print(f"workers {workers:3d} {elapsed * 1000:9.1f} ms  {total / elapsed:9.0f} files/s  "
+                  f"x{base / elapsed:.2f}  folder time {busy * 1000:9.1f} ms")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+# ============================================================================
+# 전체 단계 벤치마크 - 스캔 → 필터 → 계획 → 이름 변경 → Undo
+# ============================================================================
+
+SUITE_PREFIX = 'ren_'
+SUITE_TYPES = {'image', 'video', 'document'}  # 'other'(사이드카, 확장자 없음 등)는 제외
+SUITE_COLLIDE_TEMPLATE = '{date}{ext}'  # 같은 날짜의 파일이 폴더마다 모두 충돌
+SUITE_STAGES = ('scan', 'filter', 'plan', 'plan_collide', 'rename', 'undo')
+
+
+def make_synthetic_tree(
+    root: str,
+    count: int,
+    flat_share: float = 0.5,
+    depth: int = 3,
+    fanout: int = 4,
+    prefixed_every: int = 50,
+    seed: int = 0
+) -> Dict[str, int]:
+    """
+    확장자 분포, 이름 충돌, 중첩 폴더를 반영한 합성 폴더 생성
+    
+    파일의 flat_share는 최상위 폴더 하나(큰 단일 폴더)에, 나머지는 depth 단계, fanout 갈래의
+    하위 폴더에 고르게 나눈다. prefixed_every개마다 하나는 바로 앞 파일에 접두사를 붙인 이름이라
+    (이미 한 번 변경된 파일) 이름 변경이 연쇄가 되며, 파일 생성 시각이 같으므로
+    SUITE_COLLIDE_TEMPLATE로 계획하면 폴더마다 모든 파일이 충돌한다.
+    
+    Returns:
+        {'files', 'dirs', 'prefixed'}
+    """
+    dirs = ['']
+    level = ['']
+    for _ in range(depth):
+        level = [os.path.join(parent, f"d{index}") for parent in level for index in range(fanout)]
+        dirs.extend(level)
+    for rel_dir in dirs:
+        os.makedirs(os.path.join(root, rel_dir), exist_ok=True)
+    
+    names = make_file_names(count, seed)
+    flat_count = int(count * flat_share) if len(dirs) > 1 else count
+    per_dir = -(-(count - flat_count) // max(1, len(dirs) - 1))
+    prefixed = 0
+    for index, name in enumerate(names):
+        rel_dir = '' if index < flat_count else dirs[1 + (index - flat_count) // per_dir]
+        if prefixed_every and index % prefixed_every == 1:
+            # 바로 앞 파일이 받을 새 이름과 같은 이름 (폴더 경계에 걸린 경우만 다른 폴더)
+            name = SUITE_PREFIX + names[index - 1]
+            prefixed += 1
+        with open(os.path.join(root, rel_dir, name), 'wb'):
+            pass
+    return {'files': count, 'dirs': len(dirs), 'prefixed': prefixed}
+
+
+def run_suite_stages(folder: str, journal_dir: str, repeat: int, trace: bool, results: multiprocessing.Queue):
+    """
+    새 프로세스에서 단계별 소요 시간과 메모리 측정
+    
+    단계마다 repeat번 중 가장 짧은 시간을 쓴다. 이름 변경과 Undo는 한 쌍으로 반복하므로 매번
+    같은 폴더 상태에서 시작한다. trace이면 마지막에 한 번 더 실행하며 단계별 tracemalloc 최대
+    할당량을 잰다 (추적 중에는 느려지므로 시간 측정과 분리).
+    """
+    mode = RenameMode()
+    mode.journal_dir = journal_dir
+    mode.set_recursive(True)
+    mode.selected_folder = folder
+    best = dict.fromkeys(SUITE_STAGES, float('inf'))
+    peaks: Dict[str, int] = {}
+    max_rss: Dict[str, int] = {}
+    counts: Dict[str, int] = {}
+    collisions: Dict[str, int] = {}  # 계획 단계별 증분 번호가 붙은 새 이름 수
+    
+    def count_collisions(plan: List[Tuple[str, str]]) -> int:
+        # 합성 파일명에는 괄호가 없으므로 '(n).ext'로 끝나면 충돌로 바뀐 이름
+        return sum(new_name.endswith(')' + FileTypeClassifier.get_suffix(new_name)) for _, new_name in plan)
+    
+    def run_stages(measure: Callable[[str, Callable[[], Any]], Any]):
+        measure('scan', mode._scan_files)
+        counts['scan'] = len(mode.all_files)
+        counts['filter'] = len(measure(
+            'filter', lambda: FileTypeClassifier.filter_files_by_type(mode.all_files, SUITE_TYPES)
+        ))
+        # 엔진의 필터링된 목록은 여기서 만들어 계획 단계 시간에 포함하지 않음
+        mode.apply_file_type_filter(SUITE_TYPES)
+        assert len(mode.filtered_files) == counts['filter']
+        plan = measure('plan', lambda: mode.generate_new_names(SUITE_PREFIX))
+        counts['plan'] = len(plan)
+        collisions['plan'] = count_collisions(plan)
+        collide = measure('plan_collide', lambda: mode.generate_new_names('', template=SUITE_COLLIDE_TEMPLATE))
+        counts['plan_collide'] = len(collide)
+        collisions['plan_collide'] = count_collisions(collide)
+        del collide
+        success_count, error_count, undo_stack = measure('rename', lambda: mode.rename_files(plan))
+        assert success_count == len(plan) and not error_count, (success_count, error_count)
+        counts['rename'] = success_count
+        success_count, error_count = measure('undo', lambda: mode.perform_undo(undo_stack))
+        assert success_count == counts['rename'] and not error_count, (success_count, error_count)
+        counts['undo'] = success_count
+    
+    def timed(stage: str, func: Callable[[], Any]) -> Any:
+        started = time.perf_counter()
+        value = func()
+        best[stage] = min(best[stage], time.perf_counter() - started)
+        max_rss[stage] = max_rss_bytes()
+        return value
+    
+    def traced(stage: str, func: Callable[[], Any]) -> Any:
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        value = func()
+        peaks[stage] = tracemalloc.get_traced_memory()[1] - base
+        return value
+    
+    for _ in range(repeat):
+        run_stages(timed)
+    if trace:
+        tracemalloc.start()
+        run_stages(traced)
+        tracemalloc.stop()
+    
+    results.put({
+        stage: {
+            'seconds': best[stage],
+            'items': counts[stage],
+            'items_per_s': counts[stage] / best[stage] if best[stage] else None,
+            'peak_alloc_bytes': peaks.get(stage),
+            'max_rss_bytes': max_rss[stage],
+            'collisions': collisions.get(stage),
+        }
+        for stage in SUITE_STAGES
+    })
+
+
+def suite_metadata(args) -> Dict[str, Any]:
+    """비교할 때 필요한 실행 환경"""
+    return {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'dir': args.dir or tempfile.gettempdir(),
+        'repeat': args.repeat,
+        'trace': not args.no_trace,
+    }
+
+
+def print_suite_result(result: Dict[str, Any], baseline: Optional[Dict[str, Any]]):
+    print(f"{result['files']} files  ({result['tree']['dirs']} dirs, {result['tree']['prefixed']} prefixed, "
+          f"created in {result['create_seconds']:.1f} s)")
+    for stage, row in result['stages'].items():
+        peak = row['peak_alloc_bytes']
+        line = (f"  {stage:13s} {row['seconds'] * 1000:10.1f} ms  {row['items']:8d} items  "
+                f"{(row['items_per_s'] or 0):10.0f}/s  peak alloc "
+                f"{'-' if peak is None else f'{peak / 1e6:8.1f} MB':>11s}  max RSS {row['max_rss_bytes'] / 1e6:8.1f} MB")
+        if row['collisions'] is not None:
+            line += f"  collisions {row['collisions']}"
+        if baseline is not None and stage in baseline['stages']:
+            line += f"  x{baseline['stages'][stage]['seconds'] / row['seconds']:.2f} vs baseline"
+        print(line)
+    sys.stdout.flush()  # 큰 크기는 오래 걸리므로 파일로 받을 때도 크기마다 바로 출력
+
+
+def run_suite(args):
+    if resource is None:
+        print("max RSS needs the resource module (not available on Windows)")
+        return
+    
+    baselines: Dict[int, Dict[str, Any]] = {}
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baselines = {result['files']: result for result in json.load(f)['results'] if 'stages' in result}
+    
+    context = multiprocessing.get_context('spawn')
+    report: Dict[str, Any] = {'meta': suite_metadata(args), 'results': []}
+    failed = False
+    for count in (int(value) for value in args.sizes.split(',')):
+        workdir = tempfile.mkdtemp(prefix='sfr_bench_', dir=args.dir)
+        try:
+            folder = os.path.join(workdir, 'tree')
+            started = time.perf_counter()
+            tree = make_synthetic_tree(folder, count)
+            create_seconds = time.perf_counter() - started
+            
+            results = context.Queue()
+            process = context.Process(
+                target=run_suite_stages,
+                args=(folder, os.path.join(workdir, 'journal'), args.repeat, not args.no_trace, results)
+            )
+            process.start()
+            stages = collect_result(process, results, args.timeout)
+        except RuntimeError as e:
+            # 더 큰 크기도 같은 이유(메모리 부족 등)로 실패할 가능성이 높으므로 여기서 멈춤
+            print(f"{count} files  FAILED: {e}", file=sys.stderr)
+            report['results'].append({'files': count, 'error': str(e)})
+            failed = True
+            break
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+        
+        result = {'files': count, 'tree': tree, 'create_seconds': create_seconds, 'stages': stages}
+        report['results'].append(result)
+        print_suite_result(result, baselines.get(count))
+    
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"wrote {args.json}")
+    if failed:
+        sys.exit(1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Smart File Renamer benchmarks')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    
+    p = subparsers.add_parser('recursive-scan', help='recursive scan throughput by worker count')
+    p.add_argument('--depth', type=int, default=4)
+    p.add_argument('--fanout', type=int, default=5)
+    p.add_argument('--files', type=int, default=20, help='files per directory')
+    p.add_argument('--workers', default='1,2,4,8,16')
+    p.add_argument('--latency-ms', type=float, default=2.0, help='simulated per-directory latency')
+    p.add_argument('--repeat', type=int, default=3)
+    p.set_defaults(func=run_recursive_scan)
+    
+    p = subparsers.add_parser('classify', help='file type classification throughput')
+    p.add_argument('--count', type=int, default=500000)
+    p.add_argument('--repeat', type=int, default=3)
+    p.set_defaults(func=run_classify)
+    
+    p = subparsers.add_parser('collision', help='collision resolution when every name collides')
+    p.add_argument('--count', type=int, default=100000)
+    p.add_argument('--legacy-max', type=int, default=5000, help='largest n to run the quadratic baseline on')
+    p.add_argument('--repeat', type=int, default=3)
+    p.set_defaults(func=run_collision)
+    
+    p = subparsers.add_parser('parallel-rename', help='rename/undo throughput by worker count on a slow filesystem')
+    p.add_argument('--count', type=int, default=2000)
+    p.add_argument('--workers', default='1,4,16')
+    p.add_argument('--latency-ms', type=float, default=2.0, help='simulated per-call latency')
+    p.set_defaults(func=run_parallel_rename)
+    
+    p = subparsers.add_parser('dir-fd', help='path-based vs dir_fd-relative renames in a deep folder')
+    p.add_argument('--count', type=int, default=20000)
+    p.add_argument('--nesting', type=int, default=40, help='depth of the folder holding the files')
+    p.add_argument('--repeat', type=int, default=3)
+    p.set_defaults(func=run_dir_fd)
+    
+    p = subparsers.add_parser('journal', help='rename throughput with the write-ahead journal on and off')
+    p.add_argument('--count', type=int, default=50000)
+    p.add_argument('--group-size', type=int, default=RenameJournal.GROUP_SIZE, help='chains per fsync')
+    p.add_argument('--repeat', type=int, default=3)
+    p.set_defaults(func=run_journal)
+    
+    p = subparsers.add_parser('history', help='undo history write and reverse-streaming cost')
+    p.add_argument('--count', type=int, default=1000000)
+    p.set_defaults(func=run_history)
+    
+    p = subparsers.add_parser('live-preview', help='prefix-only preview update vs full regeneration')
+    p.add_argument('--count', type=int, default=100000)
+    p.set_defaults(func=run_live_preview)
+    
+    p = subparsers.add_parser('template', help='compiled rename templates vs the built-in name formats')
+    p.add_argument('--count', type=int, default=1000000)
+    p.add_argument('--repeat', type=int, default=3)
+    p.set_defaults(func=run_template)
+    
+    p = subparsers.add_parser('batch-progress', help='progress reporting overhead and abort latency of a rename batch')
+    p.add_argument('--count', type=int, default=20000)
+    p.add_argument('--repeat', type=int, default=3)
+    p.set_defaults(func=run_batch_progress)
+    
+    p = subparsers.add_parser('file-table', help='peak RSS of the file table vs the earlier per-file structures')
+    p.add_argument('--counts', default='100000,1000000')
+    p.add_argument('--timeout', type=float, default=600, help='seconds to wait for each measurement')
+    p.set_defaults(func=run_file_table)
+    
+    p = subparsers.add_parser('folder-batch', help='multi-folder batch throughput by process pool size')
+    p.add_argument('--folders', type=int, default=200)
+    p.add_argument('--files', type=int, default=500, help='files per folder')
+    p.add_argument('--workers', default='1,2,4,8')
+    p.set_defaults(func=run_folder_batch)
+    
+    p = subparsers.add_parser('suite', help='scan/filter/plan/rename/undo timings and memory on synthetic trees')
+    p.add_argument('--sizes', default='10000,100000,1000000')
+    p.add_argument('--dir', default=None, help='where to create the trees, e.g. /dev/shm for tmpfs (default: temp dir)')
+    p.add_argument('--repeat', type=int, default=1)
+    p.add_argument('--no-trace', action='store_true', help='skip the tracemalloc pass (per-stage peak allocation)')
+    p.add_argument('--json', default=None, help='write the results as JSON')
+    p.add_argument('--baseline', default=None, help='JSON from an earlier run to compare stage times with')
+    p.add_argument('--timeout', type=float, default=3600, help='seconds to wait for each size before giving up')
+    p.set_defaults(func=run_suite)
+    
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
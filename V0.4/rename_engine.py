@@ -0,0 +1,3335 @@
+"""
+Smart File Renamer 이름 변경 엔진 (GUI 없음)
+
+스캔, 타입 필터, 새 이름 계획, 실행, Undo/Redo 기록을 담당한다. tkinter에 의존하지 않으므로
+서비스나 명령줄에서 바로 가져와 쓸 수 있다. GUI(smart_file_renamer.py)도 이 모듈을 사용한다.
+
+계획은 한 번에 만들거나(generate_new_names) 하나씩 생성할 수 있고(iter_new_names),
+chunked()로 청크 단위로 나눠 rename_stream()으로 청크마다 실행할 수 있다.
+여러 폴더에 같은 설정을 적용할 때는 FolderBatchRunner가 폴더마다 프로세스를 나눠 실행한다.
+"""
+import bisect
+import contextlib
+import errno
+import glob
+import heapq
+import json
+import os
+import queue
+import threading
+import time
+from array import array
+from collections import deque
+from itertools import compress, islice
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, as_completed, wait
+from typing import List, Tuple, Optional, Set, Dict, Iterator, Iterable, Callable, Sequence, Any
+
+
+# ============================================================================
+# 파일 타입 분류 유틸리티
+# ============================================================================
+
+class FileTypeClassifier:
+    """파일 타입 분류기"""
+    
+    # 분류 결과 타입 (순서 고정)
+    FILE_TYPES = ('image', 'video', 'document', 'other')
+    
+    # 이미지 확장자
+    IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.tif', 
+                        '.webp', '.svg', '.ico', '.heic', '.heif', '.raw', '.cr2', 
+                        '.nef', '.orf', '.sr2', '.psd', '.ai', '.eps'}
+    
+    # 비디오 확장자
+    VIDEO_EXTENSIONS = {'.mp4', '.avi', '.mkv', '.mov', '.wmv', '.flv', '.webm',
+                        '.m4v', '.mpg', '.mpeg', '.3gp', '.ogv', '.ts', '.mts',
+                        '.m2ts', '.vob', '.asf', '.rm', '.rmvb', '.divx', '.xvid'}
+    
+    # 문서 확장자
+    DOCUMENT_EXTENSIONS = {'.pdf', '.doc', '.docx', '.xls', '.xlsx', '.ppt', '.pptx',
+                           '.txt', '.rtf', '.odt', '.ods', '.odp', '.csv', '.md',
+                           '.html', '.htm', '.xml', '.json', '.yaml', '.yml', '.ini',
+                           '.cfg', '.conf', '.log', '.tex', '.latex'}
+    
+    # 타입 코드 (FILE_TYPES의 인덱스)
+    TYPE_IMAGE = 0
+    TYPE_VIDEO = 1
+    TYPE_DOCUMENT = 2
+    TYPE_OTHER = 3
+    
+    # 확장자 → 타입 코드 (중복 시 이미지 > 비디오 > 문서 순으로 우선)
+    EXTENSION_CODES = {
+        **dict.fromkeys(DOCUMENT_EXTENSIONS, TYPE_DOCUMENT),
+        **dict.fromkeys(VIDEO_EXTENSIONS, TYPE_VIDEO),
+        **dict.fromkeys(IMAGE_EXTENSIONS, TYPE_IMAGE),
+    }
+    
+    # 대소문자 그대로의 확장자 → 타입 코드 캐시
+    _suffix_cache: Dict[str, int] = {'': TYPE_OTHER}
+    _SUFFIX_CACHE_LIMIT = 4096
+    _PATH_SEPARATORS = os.sep + (os.altsep or '')
+    
+    @classmethod
+    def get_suffix(cls, filename: str) -> str:
+        """
+        확장자 반환 - pathlib.Path(filename).suffix와 같은 결과를 문자열 연산으로 계산
+        
+        Args:
+            filename: 파일명 (하위 폴더 상대 경로 가능)
+        
+        Returns:
+            '.jpg' 형식의 확장자, 없으면 빈 문자열
+        """
+        dot = filename.rfind('.')
+        if dot <= 0 or dot == len(filename) - 1:
+            return ''
+        
+        # 숨김 파일('.bashrc')이거나 점 뒤에 경로 구분자가 있으면 확장자 없음
+        separators = cls._PATH_SEPARATORS
+        if filename[dot - 1] in separators:
+            return ''
+        suffix = filename[dot:]
+        for sep in separators:
+            if sep in suffix:
+                return ''
+        return suffix
+    
+    @classmethod
+    def _code_for_suffix(cls, suffix: str) -> int:
+        """확장자의 타입 코드 계산 및 캐시"""
+        cache = cls._suffix_cache
+        if len(cache) >= cls._SUFFIX_CACHE_LIMIT:
+            cache.clear()
+            cache[''] = cls.TYPE_OTHER
+        code = cls.EXTENSION_CODES.get(suffix.lower(), cls.TYPE_OTHER)
+        cache[suffix] = code
+        return code
+    
+    @classmethod
+    def get_type_code(cls, filename: str) -> int:
+        """
+        파일의 타입 코드 반환
+        
+        Args:
+            filename: 파일명
+        
+        Returns:
+            TYPE_IMAGE, TYPE_VIDEO, TYPE_DOCUMENT, TYPE_OTHER 중 하나
+        """
+        suffix = cls.get_suffix(filename)
+        code = cls._suffix_cache.get(suffix)
+        if code is None:
+            code = cls._code_for_suffix(suffix)
+        return code
+    
+    @classmethod
+    def get_file_type(cls, filename: str) -> str:
+        """
+        파일의 타입을 반환
+        
+        Args:
+            filename: 파일명
+            
+        Returns:
+            'image', 'video', 'document', 'other' 중 하나
+        """
+        return cls.FILE_TYPES[cls.get_type_code(filename)]
+    
+    @classmethod
+    def classify_many(cls, filenames: List[str]) -> array:
+        """
+        파일 목록 전체의 타입 코드 반환
+        
+        get_type_code()와 같은 결과이며, 반복 호출 비용을 줄이기 위해
+        확장자 분리를 루프 안에서 직접 처리한다.
+        
+        Args:
+            filenames: 파일명 리스트
+        
+        Returns:
+            파일 순서대로의 타입 코드 배열 (array('b'))
+        """
+        cache = cls._suffix_cache
+        get_suffix = cls.get_suffix
+        code_for_suffix = cls._code_for_suffix
+        separators = cls._PATH_SEPARATORS
+        other = cls.TYPE_OTHER
+        codes = array('b', bytes(len(filenames)))
+        
+        for idx, name in enumerate(filenames):
+            dot = name.rfind('.')
+            if 0 < dot < len(name) - 1:
+                suffix = name[dot:]
+                code = cache.get(suffix)
+                if code is None or name[dot - 1] in separators:
+                    # 드문 경우(처음 보는 확장자, 숨김 파일 등)는 정확한 경로로 처리
+                    suffix = get_suffix(name)
+                    code = cache.get(suffix)
+                    if code is None:
+                        code = code_for_suffix(suffix)
+            else:
+                code = other
+            codes[idx] = code
+        
+        return codes
+    
+    @classmethod
+    def filter_files_by_type(cls, files: List[str], selected_types: Set[str]) -> List[str]:
+        """
+        선택된 타입의 파일만 필터링
+        
+        Args:
+            files: 파일 리스트
+            selected_types: 선택된 타입 집합 {'image', 'video', 'document', 'other'}
+            
+        Returns:
+            필터링된 파일 리스트
+        """
+        if not selected_types:
+            return []
+        
+        selected_codes = {
+            code for code, file_type in enumerate(cls.FILE_TYPES)
+            if file_type in selected_types
+        }
+        codes = cls.classify_many(files)
+        return [file for file, code in zip(files, codes) if code in selected_codes]
+
+
+# ============================================================================
+# 폴더 스캐너 - os.scandir 기반 단일 패스 수집
+# ============================================================================
+
+class FolderScanner:
+    """
+    os.scandir 기반 단일 패스 폴더 스캐너
+    
+    DirEntry.is_file()은 디렉터리 항목의 d_type 정보를 사용하므로 파일마다
+    stat을 호출하지 않는다. 심볼릭 링크처럼 d_type만으로 판단할 수 없는 항목만
+    stat이 발생한다. 파일별 stat 값은 FileTable이 필요할 때 읽어 열에 보관한다.
+    """
+    
+    def __init__(self, folder: str):
+        self.folder = folder
+        self.entry_count = 0  # 검사한 디렉터리 항목 수
+        self.file_count = 0  # 수집된 파일 수
+        self.stat_calls = 0  # stat이 필요했던 항목 수 (심볼릭 링크)
+        self.dir_mtimes: Dict[str, int] = {}  # {상대 폴더 경로: st_mtime_ns} - 외부 변경 감지용
+        self.other_names: List[str] = []  # 파일이 아닌 항목 (폴더 등) - 이름 충돌 검사용
+    
+    @property
+    def stat_calls_saved(self) -> int:
+        """os.listdir + os.path.isfile 방식 대비 절약한 stat 호출 수"""
+        return self.entry_count - self.stat_calls
+    
+    def iter_chunks(self, chunk_size: int = 1000) -> Iterator[List[Tuple[str, os.DirEntry]]]:
+        """
+        파일 항목을 청크 단위로 반환
+        
+        Args:
+            chunk_size: 청크당 최대 항목 수
+        
+        Yields:
+            [(파일명, DirEntry), ...] 리스트
+        """
+        chunk = []
+        # 목록을 읽기 전의 수정 시각을 기록 (읽는 도중의 변경도 감지되도록)
+        self.dir_mtimes[''] = os.stat(self.folder).st_mtime_ns
+        with os.scandir(self.folder) as it:
+            for entry in it:
+                self.entry_count += 1
+                
+                # 링크 대상 확인을 위해 is_file()이 stat을 호출함
+                if entry.is_symlink():
+                    self.stat_calls += 1
+                
+                try:
+                    if not entry.is_file():
+                        self.other_names.append(entry.name)
+                        continue
+                except OSError:
+                    self.other_names.append(entry.name)
+                    continue
+                
+                chunk.append((entry.name, entry))
+                self.file_count += 1
+                if len(chunk) >= chunk_size:
+                    yield chunk
+                    chunk = []
+        
+        if chunk:
+            yield chunk
+    
+    def get_stats(self) -> Dict[str, int]:
+        """스캔 통계 반환"""
+        return {
+            'entries': self.entry_count,
+            'files': self.file_count,
+            'stat_calls': self.stat_calls,
+            'stat_calls_saved': self.stat_calls_saved,
+        }
+
+
+class RecursiveFolderScanner(FolderScanner):
+    """
+    하위 폴더까지 탐색하는 병렬 재귀 스캐너
+    
+    디렉터리 하나를 읽는 작업을 제한된 크기의 스레드 풀에 분배한다.
+    네트워크 파일시스템에서는 디렉터리마다 왕복 지연이 있으므로 여러 디렉터리를
+    동시에 읽어 지연을 숨긴다. 결과 파일명은 폴더 기준 상대 경로이다.
+    """
+    
+    def __init__(
+        self,
+        folder: str,
+        max_workers: int = 8,
+        max_depth: Optional[int] = None,
+        follow_symlinks: bool = False
+    ):
+        """
+        Args:
+            folder: 최상위 폴더
+            max_workers: 동시에 읽을 최대 디렉터리 수
+            max_depth: 최대 탐색 깊이 (0이면 최상위 폴더만, None이면 무제한)
+            follow_symlinks: 심볼릭 링크 디렉터리 탐색 여부
+        """
+        super().__init__(folder)
+        self.max_workers = max(1, max_workers)
+        self.max_depth = max_depth
+        self.follow_symlinks = follow_symlinks
+        self.dir_count = 0  # 읽은 디렉터리 수
+        self.skipped_loops = 0  # 순환 링크로 건너뛴 디렉터리 수
+        self._lock = threading.Lock()
+    
+    def _scan_directory(self, path: str, rel_dir: str, depth: int):
+        """
+        디렉터리 하나 읽기 (작업 스레드에서 실행)
+        
+        Returns:
+            (파일 목록 [(상대경로, DirEntry), ...],
+             하위 디렉터리 목록 [(절대경로, 상대경로, 깊이, 식별키), ...])
+        """
+        files = []
+        subdirs = []
+        others = []
+        entry_count = 0
+        stat_calls = 0
+        descend = self.max_depth is None or depth < self.max_depth
+        
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+            with self._lock:
+                self.dir_mtimes[rel_dir] = mtime_ns
+            
+            with os.scandir(path) as it:
+                for entry in it:
+                    entry_count += 1
+                    rel_path = os.path.join(rel_dir, entry.name) if rel_dir else entry.name
+                    try:
+                        is_link = entry.is_symlink()
+                        if is_link:
+                            stat_calls += 1
+                        
+                        if entry.is_file():
+                            files.append((rel_path, entry))
+                            continue
+                        
+                        others.append(rel_path)
+                        if descend and entry.is_dir(follow_symlinks=self.follow_symlinks):
+                            key = None
+                            if self.follow_symlinks:
+                                # 순환 링크 감지를 위한 (장치, inode) 키
+                                st = entry.stat()
+                                stat_calls += 1
+                                key = (st.st_dev, st.st_ino)
+                            subdirs.append((entry.path, rel_path, depth + 1, key))
+                    except OSError:
+                        others.append(rel_path)
+                        continue
+        except OSError:
+            # 권한 없는 하위 폴더 등은 건너뜀
+            pass
+        
+        with self._lock:
+            self.entry_count += entry_count
+            self.stat_calls += stat_calls
+            self.file_count += len(files)
+            self.other_names.extend(others)
+            self.dir_count += 1
+        
+        return files, subdirs
+    
+    def iter_chunks(self, chunk_size: int = 1000) -> Iterator[List[Tuple[str, os.DirEntry]]]:
+        """
+        하위 폴더의 파일까지 청크 단위로 반환 (완료된 디렉터리 순서)
+        
+        Args:
+            chunk_size: 청크당 최대 항목 수
+        
+        Yields:
+            [(상대경로, DirEntry), ...] 리스트
+        """
+        visited = set()
+        if self.follow_symlinks:
+            st = os.stat(self.folder)
+            visited.add((st.st_dev, st.st_ino))
+        
+        pending_dirs = deque([(self.folder, '', 0)])
+        running = set()
+        chunk = []
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            while pending_dirs or running:
+                # 작업 큐가 무한히 커지지 않도록 동시 작업 수 제한
+                while pending_dirs and len(running) < self.max_workers * 2:
+                    running.add(executor.submit(self._scan_directory, *pending_dirs.popleft()))
+                
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    files, subdirs = future.result()
+                    for path, rel_path, depth, key in subdirs:
+                        if key is not None:
+                            if key in visited:
+                                self.skipped_loops += 1
+                                continue
+                            visited.add(key)
+                        pending_dirs.append((path, rel_path, depth))
+                    
+                    chunk.extend(files)
+                    while len(chunk) >= chunk_size:
+                        yield chunk[:chunk_size]
+                        chunk = chunk[chunk_size:]
+            
+            if chunk:
+                yield chunk
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def get_stats(self) -> Dict[str, int]:
+        """스캔 통계 반환"""
+        stats = super().get_stats()
+        stats['directories'] = self.dir_count
+        stats['skipped_loops'] = self.skipped_loops
+        stats['workers'] = self.max_workers
+        return stats
+
+
+class ScanWorker(threading.Thread):
+    """
+    백그라운드 폴더 스캔 작업자
+    
+    스캐너가 찾은 파일을 청크 단위로 큐에 전달한다. UI 스레드는 root.after로
+    큐를 폴링하며 결과를 반영한다. 큐 메시지는 (종류, 데이터) 튜플이다.
+        ('chunk', [(파일명, DirEntry), ...])
+        ('done', 스캔 통계)
+        ('cancelled', None)
+        ('error', 오류 메시지)
+    """
+    
+    def __init__(self, scanner: FolderScanner, result_queue: queue.Queue, chunk_size: int = 2000):
+        super().__init__(daemon=True)
+        self.scanner = scanner
+        self.result_queue = result_queue
+        self.chunk_size = chunk_size
+        self._cancel_event = threading.Event()
+    
+    def cancel(self):
+        """스캔 중단 요청 (다음 청크 경계에서 중단)"""
+        self._cancel_event.set()
+    
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+    
+    def run(self):
+        started = time.perf_counter()
+        chunks = self.scanner.iter_chunks(self.chunk_size)
+        try:
+            for chunk in chunks:
+                if self._cancel_event.is_set():
+                    self.result_queue.put(('cancelled', None))
+                    return
+                self.result_queue.put(('chunk', chunk))
+            
+            stats = self.scanner.get_stats()
+            stats['elapsed'] = time.perf_counter() - started
+            self.result_queue.put(('done', stats))
+        except Exception as e:
+            self.result_queue.put(('error', str(e)))
+        finally:
+            # 재귀 스캐너의 스레드 풀 정리
+            chunks.close()
+
+
+# ============================================================================
+# 파일 테이블 - 열 기반 파일 목록
+# ============================================================================
+
+class FileStat:
+    """FileTable에 보관한 stat 값 (os.stat_result 중 크기와 수정 시각만 제공)"""
+    
+    __slots__ = ('st_size', 'st_mtime_ns')
+    
+    def __init__(self, size: int, mtime_ns: int):
+        self.st_size = size
+        self.st_mtime_ns = mtime_ns
+    
+    @property
+    def st_mtime(self) -> float:
+        # os.stat_result와 같은 값이 되도록 초와 나노초를 따로 변환
+        seconds, nanoseconds = divmod(self.st_mtime_ns, 1000000000)
+        return seconds + nanoseconds * 1e-9
+
+
+class FileTable:
+    """
+    스캔한 파일의 열 기반 테이블
+    
+    파일마다 DirEntry나 튜플을 보관하지 않고 열마다 컨테이너 하나만 둔다. 행 번호는
+    이름 정렬 순서이며, 타입 필터는 타입 코드 열에서 바이트 마스크를 만들어 이름 열을
+    한 번에 걸러낸다. 이름 문자열은 이름 열, 필터링된 목록, 이름 인덱스가 공유한다.
+    
+    - names: 정렬된 상대 경로
+    - type_codes: FileTypeClassifier 타입 코드 (array('b'))
+    - sizes, mtimes: 크기와 수정 시각(ns) (array('q'), 아직 읽지 않았으면 UNKNOWN)
+    """
+    
+    UNKNOWN = -1
+    STAT_FROM_SCAN = os.name == 'nt'  # Windows는 디렉터리 목록에 stat 정보가 있어 스캔 때 채움
+    
+    def __init__(self):
+        self.names: List[str] = []
+        self.type_codes = array('b')
+        self.sizes = array('q')
+        self.mtimes = array('q')
+        self.type_counts = [0] * len(FileTypeClassifier.FILE_TYPES)  # 타입 코드별 행 수
+    
+    def __len__(self) -> int:
+        return len(self.names)
+    
+    @classmethod
+    def build(
+        cls,
+        names: List[str],
+        sizes: Optional[array] = None,
+        mtimes: Optional[array] = None
+    ) -> 'FileTable':
+        """
+        스캔 순서의 이름 목록으로 정렬된 테이블 생성
+        
+        Args:
+            names: 파일 상대 경로 리스트 (stat 값이 없으면 이 리스트를 제자리 정렬해 그대로 사용)
+            sizes: names 순서의 크기 (None이면 UNKNOWN)
+            mtimes: names 순서의 수정 시각(ns)
+        """
+        table = cls()
+        if sizes is None or mtimes is None:
+            names.sort()
+            table.sizes = array('q', [cls.UNKNOWN]) * len(names)
+            table.mtimes = array('q', [cls.UNKNOWN]) * len(names)
+        else:
+            order = sorted(range(len(names)), key=names.__getitem__)
+            table.sizes = array('q', map(sizes.__getitem__, order))
+            table.mtimes = array('q', map(mtimes.__getitem__, order))
+            names = list(map(names.__getitem__, order))
+        table.names = names
+        table.type_codes = FileTypeClassifier.classify_many(names)
+        table._count_types()
+        return table
+    
+    def _count_types(self):
+        codes = self.type_codes.tobytes()
+        self.type_counts = [codes.count(code) for code in range(len(FileTypeClassifier.FILE_TYPES))]
+    
+    def row_of(self, name: str) -> Optional[int]:
+        """이름의 행 번호 (없으면 None)"""
+        row = bisect.bisect_left(self.names, name)
+        if row < len(self.names) and self.names[row] == name:
+            return row
+        return None
+    
+    def type_mask(self, selected_types: Set[str]) -> bytes:
+        """행마다 선택된 타입이면 1, 아니면 0인 바이트 마스크 (itertools.compress용)"""
+        flags = bytes(
+            file_type in selected_types for file_type in FileTypeClassifier.FILE_TYPES
+        ).ljust(256, b'\0')
+        return self.type_codes.tobytes().translate(flags)
+    
+    def select_types(self, selected_types: Set[str]) -> List[str]:
+        """선택된 타입의 이름 목록 (정렬 순서 유지)"""
+        if not selected_types:
+            return []
+        if all(file_type in selected_types for file_type in FileTypeClassifier.FILE_TYPES):
+            return list(self.names)
+        return list(compress(self.names, self.type_mask(selected_types)))
+    
+    def count_types(self, selected_types: Set[str]) -> int:
+        """선택된 타입의 행 수"""
+        return sum(
+            count for file_type, count in zip(FileTypeClassifier.FILE_TYPES, self.type_counts)
+            if file_type in selected_types
+        )
+    
+    def stat(self, row: int, folder: str) -> Optional[FileStat]:
+        """
+        행의 크기와 수정 시각 (처음 요청할 때 1회만 stat을 호출해 열에 보관)
+        
+        Args:
+            row: 행 번호
+            folder: 상대 경로의 기준 폴더
+        
+        Returns:
+            FileStat, 파일이 없으면 None
+        """
+        mtime_ns = self.mtimes[row]
+        if mtime_ns == self.UNKNOWN:
+            try:
+                st = os.stat(os.path.join(folder, self.names[row]))
+            except OSError:
+                return None
+            self.sizes[row] = st.st_size
+            self.mtimes[row] = mtime_ns = st.st_mtime_ns
+        return FileStat(self.sizes[row], mtime_ns)
+    
+    def patch(self, removed: List[str], added: List[str]):
+        """
+        행 제거/추가 (모든 열을 함께 수정하며 정렬 순서 유지)
+        
+        추가된 행의 stat 값은 UNKNOWN으로 두고 필요할 때 다시 읽는다.
+        변경이 적으면 bisect로 제자리 수정하고, 많으면 열마다 한 번씩 다시 만든다.
+        
+        Args:
+            removed: 제거할 이름 (테이블에 없으면 무시)
+            added: 추가할 이름 (정렬됨, 이미 있으면 무시)
+        """
+        columns = (self.type_codes, self.sizes, self.mtimes)
+        get_type_code = FileTypeClassifier.get_type_code
+        
+        if len(removed) + len(added) <= max(64, len(self.names) // 64):
+            for name in removed:
+                row = self.row_of(name)
+                if row is not None:
+                    del self.names[row]
+                    for column in columns:
+                        del column[row]
+            for name in added:
+                row = bisect.bisect_left(self.names, name)
+                if row < len(self.names) and self.names[row] == name:
+                    continue
+                self.names.insert(row, name)
+                self.type_codes.insert(row, get_type_code(name))
+                self.sizes.insert(row, self.UNKNOWN)
+                self.mtimes.insert(row, self.UNKNOWN)
+            self._count_types()
+            return
+        
+        # 남는 행 뒤에 추가 행을 붙이고 정렬 순서(두 구간의 병합)대로 열을 다시 만듦
+        dropped = set(removed)
+        dropped.update(added)
+        keep = bytes(name not in dropped for name in self.names)
+        names = list(compress(self.names, keep))
+        names.extend(added)
+        order = sorted(range(len(names)), key=names.__getitem__)
+        
+        added_codes = FileTypeClassifier.classify_many(added)
+        unknown = array('q', [self.UNKNOWN]) * len(added)
+        codes = array('b', compress(self.type_codes, keep)) + added_codes
+        sizes = array('q', compress(self.sizes, keep)) + unknown
+        mtimes = array('q', compress(self.mtimes, keep)) + unknown
+        
+        self.names = list(map(names.__getitem__, order))
+        self.type_codes = array('b', map(codes.__getitem__, order))
+        self.sizes = array('q', map(sizes.__getitem__, order))
+        self.mtimes = array('q', map(mtimes.__getitem__, order))
+        self._count_types()
+
+
+# ============================================================================
+# 파일명 충돌 인덱스
+# ============================================================================
+
+class CollisionIndex:
+    """
+    파일명 충돌 해결 인덱스
+    
+    (stem, suffix)별로 다음에 시도할 증분 번호를 기억한다. 같은 이름에 많은 파일이
+    몰려도 매번 (1)부터 다시 탐색하지 않으므로 파일당 O(1)이다. 인덱스에서 이름이
+    제거되지 않으므로 기억한 번호보다 작은 번호는 모두 사용 중이며, 이미 사용된
+    번호는 건너뛰므로 결과는 선형 탐색과 같다.
+    
+    reserved로 폴더의 이름 인덱스를 넘기면 배치 밖의 기존 이름(필터에서 제외된
+    파일, 폴더 등)도 사용 중으로 취급한다. 인덱스를 복사하지 않고 직접 조회하므로
+    폴더 크기와 관계없이 파일당 O(1)이다. released는 새 이름이 reserved와 겹칠 때
+    처음 필요하므로 그때 집합으로 만든다.
+    """
+    
+    def __init__(self, reserved: Optional[Set[str]] = None, released: Optional[Iterable[str]] = None):
+        """
+        Args:
+            reserved: 디스크에 이미 존재하는 이름 집합
+            released: reserved 중 이번 배치에서 다른 이름으로 바뀌어 비워질 이름들
+        """
+        self.used_names: Set[str] = set()
+        self.reserved: Set[str] = reserved if reserved is not None else set()
+        self._released_source: Iterable[str] = released if released is not None else ()
+        self._released: Optional[Set[str]] = released if isinstance(released, (set, frozenset)) else None
+        self._next_counter: Dict[Tuple[str, str], int] = {}
+    
+    @property
+    def released(self) -> Set[str]:
+        """비워질 이름 집합 (처음 조회할 때 생성)"""
+        if self._released is None:
+            self._released = set(self._released_source)
+        return self._released
+    
+    def __contains__(self, name: str) -> bool:
+        return self._is_taken(name)
+    
+    def _is_taken(self, name: str) -> bool:
+        return name in self.used_names or (name in self.reserved and name not in self.released)
+    
+    def __len__(self) -> int:
+        return len(self.used_names)
+    
+    def add(self, name: str):
+        """사용된 이름 등록"""
+        self.used_names.add(name)
+    
+    def resolve(self, base_name: str) -> str:
+        """
+        충돌하지 않는 이름 반환 (등록하지 않음)
+        file.txt → file(1).txt → file(2).txt 형식으로 자동 증분
+        """
+        is_taken = self._is_taken
+        if not is_taken(base_name):
+            return base_name
+        
+        # 하위 폴더 경로를 포함한 stem과 확장자 분리
+        suffix = FileTypeClassifier.get_suffix(base_name)
+        stem = base_name[:len(base_name) - len(suffix)]
+        key = (stem, suffix)
+        
+        counter = self._next_counter.get(key, 1)
+        new_name = f"{stem}({counter}){suffix}"
+        while is_taken(new_name):
+            counter += 1
+            new_name = f"{stem}({counter}){suffix}"
+        
+        self._next_counter[key] = counter + 1
+        return new_name
+    
+    def claim(self, base_name: str) -> str:
+        """충돌하지 않는 이름을 찾아 등록 후 반환"""
+        name = self.resolve(base_name)
+        self.used_names.add(name)
+        return name
+
+
+# ============================================================================
+# 파일명 템플릿
+# ============================================================================
+
+class RenameTemplate:
+    """
+    새 파일명 템플릿
+    
+    리터럴과 {토큰[:형식][|필터...]}로 이루어지며 '{{', '}}'는 중괄호 문자다.
+    예: {prefix}{date:%Y%m%d}_{n:04}{ext}, {stem|lower}, {parent}_{name}
+    
+    한 번 파싱한 뒤 파이썬 함수 하나로 컴파일하므로 토큰 수와 관계없이 파일당 함수 호출
+    1회로 새 이름을 만든다. 쓰이지 않는 토큰(확장자 분리, stat 등)은 계산하지 않는다.
+    
+    토큰:
+        prefix  접두사
+        name    원래 파일명 (확장자 포함)
+        stem    확장자를 뺀 파일명
+        ext     확장자 ('.' 포함, 없으면 빈 문자열)
+        parent  파일이 있는 폴더 이름
+        n       순번 (시작 번호부터, 형식 예: {n:04})
+        date    수정 시각 (strftime 형식, 기본 %Y%m%d)
+    필터: lower, upper, title, strip
+    """
+    
+    TOKENS = ('prefix', 'name', 'stem', 'ext', 'parent', 'n', 'date')
+    FILTERS = {'lower': str.lower, 'upper': str.upper, 'title': str.title, 'strip': str.strip}
+    DEFAULT_DATE_FORMAT = '%Y%m%d'
+    
+    def __init__(self, template: str):
+        """
+        Args:
+            template: 템플릿 문자열
+        
+        Raises:
+            ValueError: 문법 오류, 알 수 없는 토큰/필터, 잘못된 형식, 경로 구분자 포함
+        """
+        self.template = template
+        # [(토큰, 형식, 필터들), ...] - 리터럴은 토큰이 None이고 형식 자리에 문자열
+        self.segments: List[Tuple[Optional[str], str, Tuple[str, ...]]] = self._parse(template)
+        self.tokens: Set[str] = {token for token, _, _ in self.segments if token is not None}
+    
+    @classmethod
+    def _parse(cls, template: str) -> List[Tuple[Optional[str], str, Tuple[str, ...]]]:
+        segments = []
+        literal = []
+        position = 0
+        while position < len(template):
+            char = template[position]
+            if template.startswith('{{', position) or template.startswith('}}', position):
+                literal.append(char)
+                position += 2
+                continue
+            if char == '}':
+                raise ValueError(f"unmatched '}}' at {position}")
+            if char != '{':
+                literal.append(char)
+                position += 1
+                continue
+            
+            end = template.find('}', position)
+            if end < 0:
+                raise ValueError(f"unclosed '{{' at {position}")
+            if literal:
+                segments.append((None, ''.join(literal), ()))
+                literal = []
+            segments.append(cls._parse_field(template[position + 1:end]))
+            position = end + 1
+        
+        if literal:
+            segments.append((None, ''.join(literal), ()))
+        
+        for token, text, _ in segments:
+            if token is None and (os.sep in text or (os.altsep and os.altsep in text)):
+                raise ValueError(f"path separator in template: {text!r}")
+        return segments
+    
+    @classmethod
+    def _parse_field(cls, field: str) -> Tuple[str, str, Tuple[str, ...]]:
+        """'토큰[:형식][|필터...]' 파싱 및 검증"""
+        body, *filters = field.split('|')
+        token, _, spec = body.partition(':')
+        token = token.strip()
+        filters = tuple(name.strip() for name in filters)
+        
+        if token not in cls.TOKENS:
+            raise ValueError(f"unknown token: {{{token}}}")
+        if os.sep in spec or (os.altsep and os.altsep in spec):
+            raise ValueError(f"path separator in format: {spec!r}")
+        for name in filters:
+            if name not in cls.FILTERS:
+                raise ValueError(f"unknown filter: {name}")
+        
+        if token == 'date':
+            spec = spec or cls.DEFAULT_DATE_FORMAT
+        elif spec:
+            try:
+                format(0 if token == 'n' else '', spec)
+            except ValueError:
+                raise ValueError(f"invalid format for {{{token}}}: {spec}") from None
+        return (token, spec, filters)
+    
+    def compile(
+        self,
+        prefix: str = '',
+        start_number: int = 1,
+        folder_name: str = '',
+        stat: Optional[Callable[[str], Optional[os.stat_result]]] = None
+    ) -> Callable[[str, int], str]:
+        """
+        템플릿을 render(파일, 위치) -> 새 상대 경로 함수로 컴파일
+        
+        하위 폴더 경로는 유지하고 파일명 부분만 템플릿으로 만든다. 결과가 빈 이름이면
+        원래 파일명을 쓰고, 수정 시각을 알 수 없는 파일의 {date}는 빈 문자열이 된다.
+        
+        Args:
+            prefix: {prefix} 값
+            start_number: 첫 번째 파일의 {n} 값
+            folder_name: 선택한 폴더 바로 아래 파일의 {parent} 값
+            stat: 상대 경로의 stat 결과를 돌려주는 함수 ({date}에 필요)
+        """
+        if 'date' in self.tokens and stat is None:
+            raise ValueError("{date} needs a stat function")
+        
+        # 생성 코드에는 식별자만 넣고 리터럴, 형식, 필터는 모두 이름공간으로 전달
+        namespace: Dict[str, Any] = {
+            'sep': os.sep,
+            'get_suffix': FileTypeClassifier.get_suffix,
+            'prefix': prefix,
+            'start_number': start_number,
+            'folder_name': folder_name,
+            'stat': stat,
+            'strftime': time.strftime,
+            'localtime': time.localtime,
+        }
+        lines = ['def render(file, index):', '    head, _, name = file.rpartition(sep)']
+        if self.tokens & {'stem', 'ext'}:
+            lines.append('    ext = get_suffix(name)')
+            lines.append('    stem = name[:len(name) - len(ext)]')
+        if 'parent' in self.tokens:
+            lines.append('    parent = head.rpartition(sep)[2] or folder_name')
+        if 'n' in self.tokens:
+            lines.append('    n = start_number + index')
+        if 'date' in self.tokens:
+            lines.append('    st = stat(file)')
+            lines.append('    mtime = None if st is None else localtime(st.st_mtime)')
+        
+        parts = []
+        for index, (token, spec, filters) in enumerate(self.segments):
+            if token is None:
+                namespace[f'text{index}'] = spec
+                parts.append(f'text{index}')
+                continue
+            
+            expression = token
+            if token == 'date':
+                namespace[f'spec{index}'] = spec
+                expression = f"('' if mtime is None else strftime(spec{index}, mtime))"
+            elif spec:
+                namespace[f'spec{index}'] = spec
+                expression = f'format({token}, spec{index})'
+            elif token == 'n':
+                expression = 'str(n)'
+            for filter_index, name in enumerate(filters):
+                namespace[f'filter{index}_{filter_index}'] = self.FILTERS[name]
+                expression = f'filter{index}_{filter_index}({expression})'
+            parts.append(expression)
+        
+        body = ''.join(f'{{{part}}}' for part in parts)
+        lines.append(f'    new = f"{body}" or name')
+        lines.append('    return f"{head}{sep}{new}" if head else new')
+        
+        exec(compile('\n'.join(lines), f'<template {self.template!r}>', 'exec'), namespace)
+        return namespace['render']
+
+
+# ============================================================================
+# 새 이름 계획 - 접두사 변경 시 충돌만 다시 계산
+# ============================================================================
+
+class NamePlan:
+    """
+    새 이름 계획 - (현재이름, 새이름) 행의 시퀀스
+    
+    새 이름을 모두 저장하지 않고 파일 목록, 이름 규칙(접두사 + 원래 이름/순번 또는
+    컴파일된 템플릿), 충돌로 바뀐 이름(overrides)만 보관하다가 행을 읽을 때 만든다. 접두사가 같으면 파일끼리는 새 이름이 겹치지 않으므로
+    충돌은 배치 밖의 기존 이름과 겹치는 행에서 시작해, 그 행이 받은 증분 이름과 겹치는
+    뒤쪽 행으로만 번진다. 그래서 접두사만 바뀌면 접두사로 시작하는 기존 이름에서 출발해
+    해당 행들만 다시 처리하며, 결과는 처음부터 다시 생성한 것과 같다.
+    """
+    
+    def __init__(
+        self,
+        files: List[str],
+        reserved: Set[str],
+        prefix: str,
+        use_sequential: bool = False,
+        start_number: int = 1,
+        digit_padding: int = 3,
+        template: Optional[RenameTemplate] = None,
+        render: Optional[Callable[[str, int], str]] = None
+    ):
+        """
+        Args:
+            files: 이름을 바꿀 파일 목록 (정렬된 상대 경로)
+            reserved: 디스크에 이미 존재하는 이름 집합
+            prefix: 접두사
+            use_sequential: 순차 번호 사용 여부
+            start_number: 시작 번호
+            digit_padding: 자릿수 패딩
+            template: 이름 템플릿 (None이면 접두사 + 원래 이름/순번)
+            render: template을 컴파일한 함수 (RenameTemplate.compile)
+        """
+        self.files = files
+        self.reserved = reserved
+        self.prefix = prefix
+        self.use_sequential = use_sequential
+        self.start_number = start_number
+        self.digit_padding = digit_padding
+        self.template = template
+        self._render = render
+        self.overrides: Dict[int, str] = {}  # {행 위치: 충돌로 바뀐 새 이름}
+        self._built = 0  # 생성된 행 수
+        self._collisions = CollisionIndex(reserved=reserved, released=files)
+        self._blocked: Optional[Dict[str, List[str]]] = None  # {부모 경로: 배치 밖 기존 이름 (정렬)}
+    
+    def __len__(self) -> int:
+        return self._built
+    
+    def __getitem__(self, index: int) -> Tuple[str, str]:
+        if index < 0:
+            index += self._built
+        if not 0 <= index < self._built:
+            raise IndexError(index)
+        new_name = self.overrides.get(index)
+        if new_name is None:
+            new_name = self.base_name(index)
+        return (self.files[index], new_name)
+    
+    def __iter__(self) -> Iterator[Tuple[str, str]]:
+        for index in range(self._built):
+            yield self[index]
+    
+    @property
+    def complete(self) -> bool:
+        """모든 파일의 새 이름이 생성되었는지 여부"""
+        return self._built == len(self.files)
+    
+    def matches(
+        self,
+        files: List[str],
+        use_sequential: bool,
+        start_number: int,
+        digit_padding: int,
+        template: Optional[str] = None
+    ) -> bool:
+        """접두사 외의 조건(파일 목록, 순차 번호 설정, 템플릿)이 같은지 여부"""
+        if files is not self.files or use_sequential != self.use_sequential:
+            return False
+        if template != (self.template.template if self.template is not None else None):
+            return False
+        return not use_sequential or (start_number, digit_padding) == (self.start_number, self.digit_padding)
+    
+    def can_update_prefix(self, prefix: str) -> bool:
+        """set_prefix로 갱신할 수 있는지 여부 (템플릿이나 경로 구분자가 들어간 접두사는 다시 생성)"""
+        if self._render is not None:
+            return False
+        return self.complete and os.sep not in prefix and not (os.altsep and os.altsep in prefix)
+    
+    def _split(self, index: int) -> Tuple[str, str]:
+        """행의 (부모 경로, 접두사 뒤에 붙는 이름)"""
+        parent, _, name = self.files[index].rpartition(os.sep)
+        if self.use_sequential:
+            suffix = FileTypeClassifier.get_suffix(name)
+            return (parent, str(self.start_number + index).zfill(self.digit_padding) + suffix)
+        return (parent, name)
+    
+    def base_name(self, index: int) -> str:
+        """충돌 처리 전의 새 이름"""
+        if self._render is not None:
+            return self._render(self.files[index], index)
+        parent, tail = self._split(index)
+        name = self.prefix + tail
+        return f"{parent}{os.sep}{name}" if parent else name
+    
+    def iter_build(self) -> Iterator[Tuple[str, str]]:
+        """
+        처음부터 행을 생성하며 (현재이름, 새이름)을 하나씩 반환
+        
+        생성된 행은 바로 시퀀스로 읽을 수 있으며, 충돌 처리 결과는 전체를 한 번에 만든 것과 같다.
+        """
+        self.overrides = {}
+        self._built = 0
+        collisions = self._collisions = CollisionIndex(reserved=self.reserved, released=self.files)
+        overrides = self.overrides
+        prefix = self.prefix
+        use_sequential = self.use_sequential
+        start_number = self.start_number
+        digit_padding = self.digit_padding
+        render = self._render
+        
+        # 파일마다 Path 객체를 만들지 않도록 문자열 연산으로 분리 (Path.stem/suffix와 같은 결과)
+        get_suffix = FileTypeClassifier.get_suffix
+        sep = os.sep
+        
+        for index, file in enumerate(self.files):
+            if render is not None:
+                # 템플릿은 컴파일된 함수 1회 호출로 하위 폴더 경로까지 포함한 새 이름 생성
+                base_name = render(file, index)
+            else:
+                # 재귀 스캔 시 하위 폴더 경로는 유지
+                parent, _, name = file.rpartition(sep)
+                
+                # 기본 새 이름 생성
+                if use_sequential:
+                    padded_number = str(start_number + index).zfill(digit_padding)
+                    base_name = f"{prefix}{padded_number}{get_suffix(name)}"
+                else:
+                    base_name = f"{prefix}{name}"
+                
+                if parent:
+                    base_name = f"{parent}{sep}{base_name}"
+            
+            # 충돌 처리: 이미 사용된 이름이면 증분 번호 추가
+            new_name = collisions.resolve(base_name)
+            collisions.add(new_name)
+            if new_name != base_name:
+                overrides[index] = new_name
+            
+            self._built = index + 1
+            yield (file, new_name)
+        
+        # 새 이름은 규칙과 overrides로 다시 만들 수 있으므로 생성이 끝나면 사용한 이름 집합은 버림
+        # (set_prefix는 released만 사용)
+        collisions.used_names = set()
+    
+    def set_prefix(self, prefix: str):
+        """
+        접두사만 바꿔 새 이름 갱신 (can_update_prefix가 참일 때 사용)
+        
+        접두사로 시작하는 배치 밖 기존 이름과 겹치는 행을 찾아 앞에서부터 증분 이름을
+        정하고, 그 이름과 겹치는 뒤쪽 행을 이어서 처리한다. 시간은 파일 수가 아니라
+        충돌 후보 수에 비례한다.
+        """
+        if not self.can_update_prefix(prefix):
+            raise ValueError(prefix)
+        self.prefix = prefix
+        
+        pending = self._blocked_rows(prefix)
+        heapq.heapify(pending)
+        queued = set(pending)
+        used: Set[str] = set()  # 앞선 행이 받은 증분 이름
+        overrides: Dict[int, str] = {}
+        
+        while pending:
+            index = heapq.heappop(pending)
+            base_name = self.base_name(index)
+            suffix = FileTypeClassifier.get_suffix(base_name)
+            stem = base_name[:len(base_name) - len(suffix)]
+            
+            # CollisionIndex.resolve와 같은 규칙: 배치 밖 기존 이름과 앞선 행의 새 이름은 사용 중
+            counter = 1
+            new_name = f"{stem}({counter}){suffix}"
+            while self._is_taken(new_name, index, used):
+                counter += 1
+                new_name = f"{stem}({counter}){suffix}"
+            
+            used.add(new_name)
+            overrides[index] = new_name
+            
+            # 증분 이름이 뒤쪽 행의 기본 새 이름과 같으면 그 행도 충돌
+            later = self._row_of(new_name)
+            if later is not None and later > index and later not in queued:
+                queued.add(later)
+                heapq.heappush(pending, later)
+        
+        self.overrides = overrides
+    
+    def _is_taken(self, name: str, index: int, used: Set[str]) -> bool:
+        """index 행을 처리하는 시점에 name이 사용 중인지 여부"""
+        if name in used:
+            return True
+        if name in self.reserved and name not in self._collisions.released:
+            return True
+        row = self._row_of(name)
+        return row is not None and row < index
+    
+    def _row_of(self, name: str) -> Optional[int]:
+        """기본 새 이름이 name인 행 위치 (없으면 None)"""
+        parent, _, basename = name.rpartition(os.sep)
+        if not basename.startswith(self.prefix):
+            return None
+        tail = basename[len(self.prefix):]
+        
+        if self.use_sequential:
+            # 번호 뒤에는 '.'으로 시작하는 확장자만 오므로 앞쪽 숫자가 번호
+            digits = tail[:len(tail) - len(tail.lstrip('0123456789'))]
+            if not digits or digits != str(int(digits)).zfill(self.digit_padding):
+                return None
+            index = int(digits) - self.start_number
+        else:
+            # 순차 번호가 없으면 접두사 뒤의 이름이 원래 파일명이므로 정렬 목록에서 이진 탐색
+            file = f"{parent}{os.sep}{tail}" if parent else tail
+            index = bisect.bisect_left(self.files, file)
+        
+        if 0 <= index < len(self.files) and self._split(index) == (parent, tail):
+            return index
+        return None
+    
+    def _blocked_rows(self, prefix: str) -> List[int]:
+        """기본 새 이름이 배치 밖 기존 이름과 겹치는 행 위치들"""
+        if self._blocked is None:
+            blocked: Dict[str, List[str]] = {}
+            for name in self.reserved.difference(self._collisions.released):
+                parent, _, basename = name.rpartition(os.sep)
+                blocked.setdefault(parent, []).append(basename)
+            for names in blocked.values():
+                names.sort()
+            self._blocked = blocked
+        
+        released = self._collisions.released
+        cut = len(prefix)
+        rows = []
+        for parent, names in self._blocked.items():
+            # 접두사로 시작하는 이름의 구간 (정렬 목록이므로 이진 탐색 두 번)
+            start = bisect.bisect_left(names, prefix)
+            stop = bisect.bisect_left(names, prefix + '\U0010ffff', start)
+            if start == stop:
+                continue
+            head = f"{parent}{os.sep}" if parent else ""
+            
+            if self.use_sequential:
+                for name in names[start:stop]:
+                    row = self._row_of(head + name)
+                    if row is not None:
+                        rows.append(row)
+            else:
+                # 순차 번호가 없으면 접두사 뒤의 이름이 원래 파일명이므로 배치 파일 집합과의 교집합만 확인
+                matched = released.intersection([head + name[cut:] for name in names[start:stop]])
+                rows.extend(bisect.bisect_left(self.files, file) for file in matched)
+        return rows
+
+
+# ============================================================================
+# 이름 변경 순서 계획 - 연쇄/순환 변경 처리
+# ============================================================================
+
+class RenamePlanner:
+    """
+    이름 변경 순서 계획기
+    
+    (이전 → 새 이름) 쌍은 원본과 대상이 각각 중복되지 않으므로 의존 관계 그래프는
+    경로(연쇄)와 순환으로만 이루어진다. 연쇄 a→b, b→c, c→d는 끝에서부터
+    (c→d, b→c, a→b) 실행하고, 순환 a→b, b→a는 임시 이름 하나로 끊는다
+    (a→tmp, b→a, tmp→b). 임시 이름은 순환마다 1개로 최소이며 전체 O(n)이다.
+    
+    각 연쇄는 서로 독립적이므로 연쇄 단위로 실행/중단할 수 있다.
+    """
+    
+    TEMP_PREFIX = '.sfr_tmp_'
+    
+    def __init__(self, occupied: Optional[Set[str]] = None):
+        """
+        Args:
+            occupied: 폴더에 존재하는 이름 집합 (임시 이름 충돌 방지용)
+        """
+        self.occupied: Set[str] = occupied if occupied is not None else set()
+        self.temp_names: Set[str] = set()  # 계획에 사용된 임시 이름
+        self.conflicts: List[Tuple[str, str]] = []  # 원본/대상이 중복되어 제외된 쌍
+        self._token = f"{os.getpid()}_{int(time.time())}"
+    
+    def is_temp(self, name: str) -> bool:
+        """
+        임시 이름인지 확인
+        
+        이 계획기가 만든 이름 외에 이전 실행(청크로 나뉜 Undo, 저널 복구)이 남긴 임시 이름도 포함한다.
+        """
+        return name in self.temp_names or (
+            self.TEMP_PREFIX in name and os.path.basename(name).startswith(self.TEMP_PREFIX)
+        )
+    
+    def is_cycle(self, chain: Tuple[Tuple[str, str], ...]) -> bool:
+        """이 계획기가 임시 이름으로 끊은 순환인지 확인"""
+        return chain[0][1] in self.temp_names
+    
+    def plan(self, rename_list: List[Tuple[str, str]]) -> List[Tuple[Tuple[str, str], ...]]:
+        """
+        실행 순서가 정해진 연쇄 목록 생성
+        
+        Args:
+            rename_list: [(현재이름, 새이름), ...] 리스트
+        
+        Returns:
+            [((이전, 이후), ...), ...] - 연쇄 안에서는 순서대로, 연쇄끼리는 독립적으로 실행
+        """
+        target_of: Dict[str, str] = {}
+        source_of: Dict[str, str] = {}
+        for current_name, new_name in rename_list:
+            if current_name == new_name:
+                continue
+            if current_name in target_of or new_name in source_of:
+                self.conflicts.append((current_name, new_name))
+                continue
+            target_of[current_name] = new_name
+            source_of[new_name] = current_name
+        
+        chains: List[Tuple[Tuple[str, str], ...]] = []
+        
+        # 1) 연쇄: 다른 파일이 들어오지 않는 원본에서 시작해 대상 방향으로 따라감
+        #    연쇄 중간의 이름(원본이면서 대상)만 방문 표시하면 나머지는 순환에 속함
+        visited: Set[str] = set()
+        for current_name in target_of:
+            if current_name in source_of:
+                continue
+            new_name = target_of[current_name]
+            if new_name not in target_of:
+                # 대부분의 경우: 독립적인 단일 변경
+                chains.append(((current_name, new_name),))
+                continue
+            
+            ops = [(current_name, new_name)]
+            while new_name in target_of:
+                visited.add(new_name)
+                current_name = new_name
+                new_name = target_of[current_name]
+                ops.append((current_name, new_name))
+            ops.reverse()
+            chains.append(tuple(ops))
+        
+        # 2) 남은 원본은 모두 순환에 속함: 임시 이름 하나로 끊음
+        for start in target_of:
+            if start not in source_of or start in visited:
+                continue
+            cycle = []
+            current_name = start
+            while current_name not in visited:
+                visited.add(current_name)
+                new_name = target_of[current_name]
+                cycle.append((current_name, new_name))
+                current_name = new_name
+            
+            temp_name = self._make_temp_name(start)
+            first_target = cycle[0][1]
+            ops = [(start, temp_name)]
+            ops.extend(reversed(cycle[1:]))
+            ops.append((temp_name, first_target))
+            chains.append(tuple(ops))
+        
+        return chains
+    
+    def order(self, rename_list: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+        """plan() 결과를 하나의 실행 순서로 평탄화"""
+        return [op for chain in self.plan(rename_list) for op in chain]
+    
+    def _make_temp_name(self, name: str) -> str:
+        """원본과 같은 폴더에 기존 이름과 겹치지 않는 임시 이름 생성"""
+        parent = os.path.dirname(name)
+        while True:
+            temp_name = f"{self.TEMP_PREFIX}{self._token}_{len(self.temp_names)}"
+            if parent:
+                temp_name = os.path.join(parent, temp_name)
+            if temp_name not in self.occupied and temp_name not in self.temp_names:
+                self.temp_names.add(temp_name)
+                return temp_name
+            self._token += '_'
+
+
+# ============================================================================
+# 이름 변경 실행 - 파일시스템 백엔드 및 병렬 실행기
+# ============================================================================
+
+RENAME_NOREPLACE = 1  # <linux/fs.h>: 대상이 이미 있으면 EEXIST로 실패
+
+_renameat2_func = None
+_renameat2_loaded = False
+
+
+def load_renameat2() -> Optional[Callable[..., int]]:
+    """
+    libc의 renameat2 함수 로드 (Linux glibc 2.28 이상)
+    
+    Returns:
+        ctypes 함수 또는 사용할 수 없으면 None
+    """
+    global _renameat2_func, _renameat2_loaded
+    if not _renameat2_loaded:
+        _renameat2_loaded = True
+        import ctypes  # 지연 로드: 실제로 dir_fd 백엔드를 쓸 때만 필요
+        try:
+            func = ctypes.CDLL(None, use_errno=True).renameat2
+        except (OSError, AttributeError, TypeError):
+            func = None
+        if func is not None:
+            func.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_int, ctypes.c_char_p, ctypes.c_uint]
+            func.restype = ctypes.c_int
+        _renameat2_func = func
+    return _renameat2_func
+
+
+def error_code(error: BaseException) -> str:
+    """예외를 파일별 오류 코드로 분류 (ENOENT, EEXIST, EACCES 등 errno 이름)"""
+    if isinstance(error, OSError) and error.errno:
+        return errno.errorcode.get(error.errno, f"errno {error.errno}")
+    return type(error).__name__
+
+
+class PathRenameBackend:
+    """
+    폴더 기준 상대 경로로 파일시스템 작업을 수행하는 기본 백엔드
+    
+    실행기는 이 인터페이스(open/close, exists, lexists, rename)만 사용하므로
+    다른 실행 방식이나 테스트용 파일시스템으로 교체할 수 있다.
+    """
+    
+    def __init__(self, folder: str):
+        self.folder = folder
+    
+    def __enter__(self):
+        self.open()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
+    def open(self):
+        """작업 시작 전 준비"""
+    
+    def close(self):
+        """작업 완료 후 정리"""
+    
+    def path(self, name: str) -> str:
+        """상대 경로를 전체 경로로 변환"""
+        return os.path.join(self.folder, name)
+    
+    def exists(self, name: str) -> bool:
+        return os.path.exists(self.path(name))
+    
+    def lexists(self, name: str) -> bool:
+        return os.path.lexists(self.path(name))
+    
+    def rename(self, old_name: str, new_name: str):
+        os.rename(self.path(old_name), self.path(new_name))
+    
+    def rename_noreplace(self, old_name: str, new_name: str):
+        """
+        대상이 없을 때만 이름 변경 (있으면 FileExistsError)
+        
+        기본 구현은 확인 후 변경하므로 그 사이에 생긴 파일은 막지 못한다.
+        """
+        if self.lexists(new_name):
+            raise FileExistsError(errno.EEXIST, os.strerror(errno.EEXIST), new_name)
+        self.rename(old_name, new_name)
+
+
+class DirFdRenameBackend(PathRenameBackend):
+    """
+    폴더를 한 번 열어 두고 디렉터리 fd 기준으로 작업하는 백엔드 (renameat/fstatat)
+    
+    매 호출마다 전체 경로를 다시 해석하지 않으므로 깊은 폴더나 네트워크 마운트에서
+    경로 탐색 비용이 줄어든다. 배치 도중 폴더가 이동되더라도 열어 둔 폴더 안에서만 작업한다.
+    """
+    
+    def __init__(self, folder: str):
+        super().__init__(folder)
+        self.dir_fd: Optional[int] = None
+        self.renameat2 = None  # 커널/파일시스템이 지원하지 않으면 None으로 전환
+    
+    @staticmethod
+    def is_supported() -> bool:
+        """현재 플랫폼에서 dir_fd 기반 rename/stat 지원 여부"""
+        return (
+            os.rename in os.supports_dir_fd
+            and os.stat in os.supports_dir_fd
+            and os.stat in os.supports_follow_symlinks
+            and hasattr(os, 'O_DIRECTORY')
+        )
+    
+    def open(self):
+        self.dir_fd = os.open(self.folder, os.O_RDONLY | os.O_DIRECTORY)
+        self.renameat2 = load_renameat2()
+    
+    def close(self):
+        if self.dir_fd is not None:
+            os.close(self.dir_fd)
+            self.dir_fd = None
+    
+    def exists(self, name: str) -> bool:
+        try:
+            os.stat(name, dir_fd=self.dir_fd)
+        except (OSError, ValueError):
+            return False
+        return True
+    
+    def lexists(self, name: str) -> bool:
+        try:
+            os.stat(name, dir_fd=self.dir_fd, follow_symlinks=False)
+        except (OSError, ValueError):
+            return False
+        return True
+    
+    def rename(self, old_name: str, new_name: str):
+        os.rename(old_name, new_name, src_dir_fd=self.dir_fd, dst_dir_fd=self.dir_fd)
+    
+    def rename_noreplace(self, old_name: str, new_name: str):
+        """
+        renameat2(RENAME_NOREPLACE)로 확인과 변경을 시스템 호출 하나로 원자적으로 수행
+        
+        커널이나 파일시스템이 플래그를 지원하지 않으면(ENOSYS/EINVAL/EOPNOTSUPP)
+        기본 구현(확인 후 변경)으로 전환한다.
+        """
+        renameat2 = self.renameat2
+        if renameat2 is not None:
+            if renameat2(self.dir_fd, os.fsencode(old_name), self.dir_fd, os.fsencode(new_name), RENAME_NOREPLACE) == 0:
+                return
+            import ctypes  # load_renameat2에서 이미 로드됨
+            err = ctypes.get_errno()
+            if err not in (errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP):
+                raise OSError(err, os.strerror(err), old_name, None, new_name)
+            self.renameat2 = None
+        super().rename_noreplace(old_name, new_name)
+
+
+def create_rename_backend(folder: str) -> PathRenameBackend:
+    """플랫폼에서 지원하면 dir_fd 백엔드, 아니면 경로 기반 백엔드 생성"""
+    if DirFdRenameBackend.is_supported():
+        return DirFdRenameBackend(folder)
+    return PathRenameBackend(folder)
+
+
+class RenameExecutor:
+    """
+    독립적인 변경 연쇄를 스레드 풀에서 동시에 실행하는 실행기
+    
+    네트워크 파일시스템(NFS/SMB)에서는 이름 변경마다 왕복 지연이 있으므로
+    서로 의존하지 않는 연쇄를 동시에 보내 지연을 숨긴다. 동시에 진행 중인 작업 수는
+    max_in_flight로 제한하며, 결과는 입력 연쇄 순서대로 반환한다.
+    스레드 풀은 첫 병렬 실행 때 만들어 close()까지 재사용한다.
+    """
+    
+    def __init__(self, max_workers: int = 4, max_in_flight: Optional[int] = None):
+        """
+        Args:
+            max_workers: 스레드 수 (1이면 호출한 스레드에서 순서대로 실행)
+            max_in_flight: 동시에 제출된 연쇄의 최대 수 (기본: max_workers * 4)
+        """
+        self.max_workers = max(1, max_workers)
+        self.max_in_flight = max(self.max_workers, max_in_flight or self.max_workers * 4)
+        self._pool: Optional[ThreadPoolExecutor] = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
+    def close(self):
+        """스레드 풀 종료"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+    
+    def run(self, chains: Sequence[Any], run_chain: Callable[[Any], Any]) -> List[Any]:
+        """
+        모든 연쇄 실행
+        
+        Args:
+            chains: 연쇄 목록
+            run_chain: 연쇄 하나를 순서대로 실행하는 함수
+        
+        Returns:
+            연쇄 순서대로의 run_chain 결과 리스트
+        """
+        results: List[Any] = [None] * len(chains)
+        if self.max_workers == 1 or len(chains) <= 1:
+            for idx, chain in enumerate(chains):
+                results[idx] = run_chain(chain)
+            return results
+        
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers)
+        
+        in_flight = {}
+        for idx, chain in enumerate(chains):
+            if len(in_flight) >= self.max_in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    results[in_flight.pop(future)] = future.result()
+            in_flight[self._pool.submit(run_chain, chain)] = idx
+        
+        for future in list(in_flight):
+            results[in_flight.pop(future)] = future.result()
+        
+        return results
+
+
+# ============================================================================
+# 배치 진행 상황 - 백그라운드 실행, 일시정지/중단
+# ============================================================================
+
+class BatchControl:
+    """
+    이름 변경 배치의 진행 상황 집계와 일시정지/중단 제어
+    
+    실행 스레드(병렬 실행기의 작업 스레드 포함)는 연쇄를 시작하기 전에 wait_turn()으로
+    일시정지/중단을 확인하고, 끝나면 advance()로 처리 수를 더한다. 연쇄 단위로만 멈추므로
+    중단해도 순환 변경의 임시 이름이 남지 않는다. 진행 상황은 report 콜백으로
+    REPORT_INTERVAL마다 최대 한 번 전달한다 (콜백은 실행 스레드에서 호출됨).
+    """
+    
+    REPORT_INTERVAL = 0.1  # 진행 상황 보고 최소 간격 (초) - 초당 최대 10회
+    
+    def __init__(self, total: int = 0, report: Optional[Callable[[Dict[str, Any]], None]] = None):
+        """
+        Args:
+            total: 처리할 전체 수 (이름 변경은 파일 수, Undo/Redo는 기록 행 수)
+            report: 진행 상황 dict를 받는 콜백
+        """
+        self.total = total
+        self.done = 0
+        self.failed = 0
+        self.current: Optional[str] = None  # 마지막으로 처리한 파일
+        self._report = report
+        self._lock = threading.Lock()
+        self._resume_event = threading.Event()
+        self._resume_event.set()
+        self._abort_event = threading.Event()
+        self._started = time.perf_counter()
+        self._paused_at: Optional[float] = None
+        self._paused_total = 0.0  # 일시정지한 시간 합계 (처리 속도 계산에서 제외)
+        self._last_report = 0.0
+    
+    @property
+    def paused(self) -> bool:
+        return not self._resume_event.is_set()
+    
+    @property
+    def aborted(self) -> bool:
+        return self._abort_event.is_set()
+    
+    def pause(self):
+        """다음 연쇄부터 일시정지 (실행 중인 연쇄는 끝까지 실행)"""
+        with self._lock:
+            if self._paused_at is None and not self.aborted:
+                self._paused_at = time.perf_counter()
+                self._resume_event.clear()
+    
+    def resume(self):
+        """일시정지 해제"""
+        with self._lock:
+            if self._paused_at is not None:
+                self._paused_total += time.perf_counter() - self._paused_at
+                self._paused_at = None
+            self._resume_event.set()
+    
+    def abort(self):
+        """남은 연쇄를 실행하지 않고 중단 (일시정지 중이면 깨움)"""
+        self._abort_event.set()
+        self.resume()
+    
+    def wait_turn(self) -> bool:
+        """다음 작업 전에 호출 - 일시정지 중이면 기다리고, 계속 진행해도 되면 True"""
+        self._resume_event.wait()
+        return not self._abort_event.is_set()
+    
+    def advance(self, done: int = 0, failed: int = 0, current: Optional[str] = None):
+        """처리 수 추가 (보고 간격이 지났으면 진행 상황 보고)"""
+        with self._lock:
+            self.done += done
+            self.failed += failed
+            if current is not None:
+                self.current = current
+            now = time.perf_counter()
+            if self._report is None or now - self._last_report < self.REPORT_INTERVAL:
+                return
+            self._last_report = now
+            progress = self._snapshot(now)
+        self._report(progress)
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        현재 진행 상황
+        
+        Returns:
+            {'done', 'failed', 'total', 'current', 'rate'(초당 처리 수), 'eta'(남은 초, 모르면 None),
+             'elapsed', 'paused', 'aborted'}
+        """
+        with self._lock:
+            return self._snapshot(time.perf_counter())
+    
+    def _snapshot(self, now: float) -> Dict[str, Any]:
+        paused_total = self._paused_total
+        if self._paused_at is not None:
+            paused_total += now - self._paused_at
+        elapsed = max(now - self._started - paused_total, 1e-9)
+        processed = self.done + self.failed
+        rate = processed / elapsed
+        remaining = max(self.total - processed, 0)
+        return {
+            'done': self.done,
+            'failed': self.failed,
+            'total': self.total,
+            'current': self.current,
+            'rate': rate,
+            'eta': remaining / rate if rate > 0 else None,
+            'elapsed': elapsed,
+            'paused': self._paused_at is not None,
+            'aborted': self.aborted,
+        }
+
+
+class BatchWorker(threading.Thread):
+    """
+    백그라운드 이름 변경/Undo/Redo 작업자
+    
+    task(BatchControl)를 실행하고 결과를 큐로 전달한다. UI 스레드는 root.after로
+    큐를 폴링하며 결과를 반영한다. 큐 메시지는 (종류, 데이터) 튜플이다.
+        ('progress', 진행 상황 dict) - BatchControl.REPORT_INTERVAL마다 최대 1회
+        ('done', task 반환값)
+        ('error', 예외)
+    """
+    
+    def __init__(self, task: Callable[[BatchControl], Any], result_queue: queue.Queue, total: int = 0):
+        super().__init__(daemon=True)
+        self.task = task
+        self.result_queue = result_queue
+        self.control = BatchControl(total, report=lambda progress: result_queue.put(('progress', progress)))
+    
+    def run(self):
+        try:
+            result = self.task(self.control)
+        except Exception as e:
+            self.result_queue.put(('error', e))
+            return
+        self.result_queue.put(('progress', self.control.snapshot()))
+        self.result_queue.put(('done', result))
+
+
+# ============================================================================
+# 이름 변경 저널 - 중단된 배치 복구
+# ============================================================================
+
+APP_DATA_DIR = os.path.join(os.path.expanduser('~'), '.smart_file_renamer')  # 앱 데이터 폴더
+
+
+class RenameJournal:
+    """
+    이름 변경 배치의 선행 기록(write-ahead) 저널
+    
+    실행 전에 전체 계획(연쇄 목록)을 기록하고, 연쇄 그룹이 끝날 때마다 성공한 작업을
+    한 줄로 추가한다. fsync는 그룹당 한 번만 호출한다. 배치가 정상 종료되면 파일을
+    삭제하므로 남아 있는 저널은 중단된 배치를 뜻한다.
+    
+    형식 (JSON Lines):
+        ["begin", 폴더, 하위폴더 포함 여부, [[[이전, 이후], ...], ...]]
+        ["done", 완료된 연쇄 수, [[이전, 이후], ...]]
+    """
+    
+    SUFFIX = '.journal'
+    GROUP_SIZE = 2000  # fsync 1회당 연쇄 수
+    
+    def __init__(self, path: str, folder: str, recursive: bool = False):
+        self.path = path
+        self.folder = folder
+        self.recursive = recursive
+        self.chains: List[List[List[str]]] = []  # 계획된 연쇄 목록
+        self.done_ops: List[Tuple[str, str]] = []  # 기록된 완료 작업 (실행 순서)
+        self.done_chains = 0  # 완료가 기록된 연쇄 수
+        self.fsync_count = 0
+        self._file = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        # 예외로 중단되면 복구할 수 있도록 저널을 남겨 둠
+        if exc_type is None:
+            self.finish()
+        else:
+            self.close()
+    
+    @staticmethod
+    def default_dir() -> str:
+        """기본 저널 폴더"""
+        return os.path.join(APP_DATA_DIR, 'journal')
+    
+    @classmethod
+    def create(
+        cls,
+        journal_dir: str,
+        folder: str,
+        chains: List[Tuple[Tuple[str, str], ...]],
+        recursive: bool = False
+    ) -> 'RenameJournal':
+        """
+        새 저널을 만들고 전체 계획을 기록
+        
+        Args:
+            journal_dir: 저널 폴더
+            folder: 작업 대상 폴더
+            chains: 실행할 연쇄 목록
+            recursive: 하위 폴더 포함 스캔 여부
+        """
+        os.makedirs(journal_dir, exist_ok=True)
+        name = f"batch_{os.getpid()}_{time.time_ns()}{cls.SUFFIX}"
+        journal = cls(os.path.join(journal_dir, name), folder, recursive)
+        journal._file = open(journal.path, 'w', encoding='utf-8')
+        journal._append(['begin', folder, recursive, chains])
+        journal._fsync_dir(journal_dir)
+        return journal
+    
+    def log_done(self, done_chains: int, ops: List[Tuple[str, str]]):
+        """연쇄 그룹 완료 기록 (그룹당 fsync 1회)"""
+        self._append(['done', done_chains, ops])
+    
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+    
+    def finish(self):
+        """정상 종료: 저널 삭제"""
+        self.close()
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+    
+    def _append(self, record: list):
+        self._file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.fsync_count += 1
+    
+    @staticmethod
+    def _fsync_dir(path: str):
+        """새 파일의 디렉터리 항목까지 디스크에 기록 (지원하지 않는 플랫폼은 무시)"""
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+    
+    @classmethod
+    def find_unfinished(cls, journal_dir: str) -> List[str]:
+        """
+        중단된 배치의 저널 경로 목록 (실행 중인 다른 프로세스의 저널 제외)
+        """
+        try:
+            names = sorted(name for name in os.listdir(journal_dir) if name.endswith(cls.SUFFIX))
+        except OSError:
+            return []
+        return [
+            os.path.join(journal_dir, name) for name in names
+            if not cls._owner_alive(name)
+        ]
+    
+    @staticmethod
+    def _owner_alive(name: str) -> bool:
+        """저널을 만든 프로세스가 아직 실행 중인지 확인 (POSIX만 확인 가능)"""
+        try:
+            pid = int(name.split('_')[1])
+        except (IndexError, ValueError):
+            return False
+        if pid == os.getpid() or os.name != 'posix':
+            return False
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except OSError:
+            return True
+        return True
+    
+    @classmethod
+    def load(cls, path: str) -> 'RenameJournal':
+        """
+        저널 파일 읽기 (기록 도중 중단되어 잘린 마지막 줄은 무시)
+        
+        Raises:
+            ValueError: 시작 기록이 없는 경우
+        """
+        journal = None
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                if record[0] == 'begin':
+                    journal = cls(path, record[1], record[2])
+                    journal.chains = record[3]
+                elif record[0] == 'done' and journal is not None:
+                    journal.done_chains = record[1]
+                    journal.done_ops.extend((old_name, new_name) for old_name, new_name in record[2])
+        if journal is None:
+            raise ValueError(f"invalid journal: {path}")
+        return journal
+    
+    def recover_state(
+        self,
+        backend: PathRenameBackend
+    ) -> Tuple[List[Tuple[str, str]], List[Tuple[Tuple[str, str], ...]]]:
+        """
+        디스크 상태로 중단 시점의 진행 상황 복원
+        
+        완료가 기록되지 않은 연쇄는 연쇄 안에서 앞에서부터 순서대로 실행되고,
+        k번째 작업의 대상은 (k-1)번째 작업이 비운 이름이므로
+        대상이 존재하는 가장 긴 앞부분이 실행된 작업이다.
+        
+        Returns:
+            (적용된 작업 목록 (실행 순서), 남은 연쇄 목록) 튜플
+        """
+        applied = list(self.done_ops)
+        remaining = []
+        for chain in self.chains[self.done_chains:]:
+            ops = [(old_name, new_name) for old_name, new_name in chain]
+            count = 0
+            while count < len(ops) and backend.lexists(ops[count][1]):
+                count += 1
+            if count == 1 and len(ops) == 1 and backend.lexists(ops[0][0]):
+                # 단일 변경인데 원본도 남아 있으면 대상은 원래 있던 다른 파일
+                count = 0
+            applied.extend(ops[:count])
+            if count < len(ops):
+                remaining.append(tuple(ops[count:]))
+        return (applied, remaining)
+
+
+# ============================================================================
+# 작업 기록 - SQLite 기반 Undo/Redo 기록
+# ============================================================================
+
+class UndoHistory:
+    """
+    이름 변경 배치의 영구 Undo/Redo 기록 (SQLite)
+    
+    배치마다 (batch_id, seq, new_path, original_path) 행을 저장한다. 행은 (batch_id, seq)
+    순서로 읽으므로 Undo할 때 배치 전체를 메모리에 올리지 않고 청크 단위로 역순 스트리밍한다.
+    오래된 기록은 보관 기간과 전체 행 수 기준으로 삭제한다.
+    """
+    
+    STATE_DONE = 'done'  # 적용된 배치 (Undo 가능)
+    STATE_UNDONE = 'undone'  # 되돌린 배치 (Redo 가능)
+    
+    CHUNK_SIZE = 10000  # 스트리밍 1회당 행 수
+    MAX_AGE_DAYS = 90  # 보관 기간
+    MAX_ROWS = 5000000  # 전체 보관 행 수
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS batches (
+            batch_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            created REAL NOT NULL,
+            folder TEXT NOT NULL,
+            recursive INTEGER NOT NULL DEFAULT 0,
+            row_count INTEGER NOT NULL DEFAULT 0,
+            state TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS ops (
+            batch_id INTEGER NOT NULL,
+            seq INTEGER NOT NULL,
+            new_path TEXT NOT NULL,
+            original_path TEXT NOT NULL,
+            PRIMARY KEY (batch_id, seq)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS ops_batch_new_path ON ops (batch_id, new_path);
+        CREATE INDEX IF NOT EXISTS batches_state ON batches (state, batch_id);
+    """
+    
+    def __init__(self, path: str = ':memory:'):
+        """
+        Args:
+            path: 데이터베이스 파일 경로 (':memory:'이면 프로그램 종료 시 사라짐)
+        """
+        import sqlite3  # 지연 로드: 기록을 열 때만 필요
+        # 파일 이름만 주면 현재 폴더에 만듦 (dirname이 빈 문자열)
+        if path != ':memory:' and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        # Undo/Redo는 백그라운드 작업자에서 실행되지만 한 번에 한 스레드만 사용함
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.executescript(self.SCHEMA)
+    
+    @classmethod
+    def open_default(cls) -> 'UndoHistory':
+        """앱 데이터 폴더의 기록 열기 (열 수 없으면 메모리 기록)"""
+        import sqlite3
+        try:
+            return cls(os.path.join(APP_DATA_DIR, 'history.sqlite3'))
+        except (OSError, sqlite3.Error):
+            return cls()
+    
+    def close(self):
+        self.conn.close()
+    
+    def record_batch(self, folder: str, undo_stack: Iterable[Tuple[str, str]], recursive: bool = False) -> int:
+        """
+        이름 변경 배치 기록
+        
+        새 배치가 기록되면 되돌린 배치(Redo 대상)는 더 이상 유효하지 않으므로 삭제한다.
+        
+        Args:
+            folder: 작업 폴더
+            undo_stack: [(new_full_path, original_full_path), ...] - 실행 순서
+            recursive: 하위 폴더 포함 스캔 여부
+        
+        Returns:
+            batch_id
+        """
+        row_count = 0
+        
+        with self.conn:
+            self._delete_batches(
+                [row[0] for row in self.conn.execute(
+                    "SELECT batch_id FROM batches WHERE state = ?", (self.STATE_UNDONE,)
+                )]
+            )
+            cursor = self.conn.execute(
+                "INSERT INTO batches (created, folder, recursive, state) VALUES (?, ?, ?, ?)",
+                (time.time(), folder, int(recursive), self.STATE_DONE)
+            )
+            batch_id = cursor.lastrowid
+            
+            def rows():
+                nonlocal row_count
+                for seq, (new_path, original_path) in enumerate(undo_stack):
+                    row_count = seq + 1
+                    yield (batch_id, seq, new_path, original_path)
+            
+            self.conn.executemany(
+                "INSERT INTO ops (batch_id, seq, new_path, original_path) VALUES (?, ?, ?, ?)", rows()
+            )
+            self.conn.execute("UPDATE batches SET row_count = ? WHERE batch_id = ?", (row_count, batch_id))
+        
+        self.evict()
+        return batch_id
+    
+    def begin_batch(self, folder: str, recursive: bool = False) -> int:
+        """
+        행을 나눠 기록할 배치 생성 (RenameMode.rename_stream처럼 청크마다 실행하는 경우)
+        
+        청크마다 append_rows로 실행 순서대로 행을 추가하며, 추가할 때마다 커밋되므로 중간에
+        프로그램이 종료되어도 이미 기록된 청크는 Undo할 수 있다.
+        
+        Returns:
+            batch_id
+        """
+        with self.conn:
+            self._delete_batches(
+                [row[0] for row in self.conn.execute(
+                    "SELECT batch_id FROM batches WHERE state = ?", (self.STATE_UNDONE,)
+                )]
+            )
+            batch_id = self.conn.execute(
+                "INSERT INTO batches (created, folder, recursive, state) VALUES (?, ?, ?, ?)",
+                (time.time(), folder, int(recursive), self.STATE_DONE)
+            ).lastrowid
+        
+        self.evict()
+        return batch_id
+    
+    def append_rows(self, batch_id: int, undo_rows: Iterable[Tuple[str, str]]) -> int:
+        """
+        begin_batch로 만든 배치에 행 추가
+        
+        Args:
+            batch_id: 배치 ID
+            undo_rows: [(new_full_path, original_full_path), ...] - 실행 순서
+        
+        Returns:
+            배치의 전체 행 수
+        """
+        with self.conn:
+            row_count = self.conn.execute(
+                "SELECT row_count FROM batches WHERE batch_id = ?", (batch_id,)
+            ).fetchone()[0]
+            start = row_count
+            
+            def rows():
+                nonlocal row_count
+                for seq, (new_path, original_path) in enumerate(undo_rows, start):
+                    row_count = seq + 1
+                    yield (batch_id, seq, new_path, original_path)
+            
+            self.conn.executemany(
+                "INSERT INTO ops (batch_id, seq, new_path, original_path) VALUES (?, ?, ?, ?)", rows()
+            )
+            self.conn.execute("UPDATE batches SET row_count = ? WHERE batch_id = ?", (row_count, batch_id))
+        return row_count
+    
+    def latest(self, state: str) -> Optional[Tuple[int, str, bool, int]]:
+        """
+        해당 상태의 가장 최근 배치
+        
+        Returns:
+            (batch_id, folder, recursive, row_count) 튜플 또는 None
+        """
+        row = self.conn.execute(
+            "SELECT batch_id, folder, recursive, row_count FROM batches "
+            "WHERE state = ? ORDER BY batch_id DESC LIMIT 1",
+            (state,)
+        ).fetchone()
+        if row is None:
+            return None
+        return (row[0], row[1], bool(row[2]), row[3])
+    
+    def next_redo(self) -> Optional[Tuple[int, str, bool, int]]:
+        """
+        다음에 Redo할 배치 (가장 최근에 되돌린 배치)
+        
+        Undo는 최근 배치부터 되돌리므로 되돌린 배치 중 ID가 가장 작은 배치가 마지막으로 되돌린 배치다.
+        
+        Returns:
+            (batch_id, folder, recursive, row_count) 튜플 또는 None
+        """
+        row = self.conn.execute(
+            "SELECT batch_id, folder, recursive, row_count FROM batches "
+            "WHERE state = ? ORDER BY batch_id LIMIT 1",
+            (self.STATE_UNDONE,)
+        ).fetchone()
+        if row is None:
+            return None
+        return (row[0], row[1], bool(row[2]), row[3])
+    
+    def get_batch(self, batch_id: int) -> Optional[Tuple[int, str, bool, int]]:
+        """배치 정보 (batch_id, folder, recursive, row_count) 또는 None"""
+        row = self.conn.execute(
+            "SELECT batch_id, folder, recursive, row_count FROM batches WHERE batch_id = ?", (batch_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        return (row[0], row[1], bool(row[2]), row[3])
+    
+    def set_state(self, batch_id: int, state: str):
+        with self.conn:
+            self.conn.execute("UPDATE batches SET state = ? WHERE batch_id = ?", (state, batch_id))
+    
+    def iter_ops(
+        self,
+        batch_id: int,
+        reverse: bool = False,
+        chunk_size: Optional[int] = None
+    ) -> Iterator[List[Tuple[str, str]]]:
+        """
+        배치의 (new_path, original_path) 행을 청크 단위로 읽기
+        
+        Args:
+            batch_id: 배치 ID
+            reverse: True면 실행 역순 (Undo 순서)
+            chunk_size: 청크당 행 수
+        """
+        for rows in self.iter_rows(batch_id, reverse, chunk_size):
+            yield [(new_path, original_path) for _, new_path, original_path in rows]
+    
+    def iter_rows(
+        self,
+        batch_id: int,
+        reverse: bool = False,
+        chunk_size: Optional[int] = None
+    ) -> Iterator[List[Tuple[int, str, str]]]:
+        """
+        배치의 (seq, new_path, original_path) 행을 청크 단위로 읽기
+        
+        seq 키셋 페이지네이션이므로 청크마다 기본 키 인덱스 범위만 읽는다.
+        """
+        chunk_size = chunk_size or self.CHUNK_SIZE
+        if reverse:
+            query = ("SELECT seq, new_path, original_path FROM ops "
+                     "WHERE batch_id = ? AND seq < ? ORDER BY seq DESC LIMIT ?")
+            bound = 1 << 62
+        else:
+            query = ("SELECT seq, new_path, original_path FROM ops "
+                     "WHERE batch_id = ? AND seq > ? ORDER BY seq LIMIT ?")
+            bound = -1
+        
+        while True:
+            rows = self.conn.execute(query, (batch_id, bound, chunk_size)).fetchall()
+            if not rows:
+                return
+            bound = rows[-1][0]
+            yield rows
+    
+    def trim_batch(self, batch_id: int, keep_below: int, rows: List[Tuple[str, str]]) -> int:
+        """
+        중단된 Undo/Redo 후 배치를 실제로 적용된 상태에 맞게 줄임
+        
+        seq가 keep_below 이상인 행을 지우고 rows를 그 자리에 이어 붙인다.
+        
+        Args:
+            batch_id: 배치 ID
+            keep_below: 남길 행의 seq 상한 (미포함)
+            rows: 이어 붙일 [(new_path, original_path), ...] - 실행 순서
+        
+        Returns:
+            남은 행 수 (0이면 배치를 삭제함)
+        """
+        with self.conn:
+            self.conn.execute("DELETE FROM ops WHERE batch_id = ? AND seq >= ?", (batch_id, keep_below))
+            self.conn.executemany(
+                "INSERT INTO ops (batch_id, seq, new_path, original_path) VALUES (?, ?, ?, ?)",
+                ((batch_id, keep_below + offset, new_path, original_path)
+                 for offset, (new_path, original_path) in enumerate(rows))
+            )
+            row_count = keep_below + len(rows)
+            if row_count == 0:
+                self._delete_batches([batch_id])
+            else:
+                self.conn.execute("UPDATE batches SET row_count = ? WHERE batch_id = ?", (row_count, batch_id))
+        return row_count
+    
+    def evict(self, max_age_days: Optional[float] = None, max_rows: Optional[int] = None) -> int:
+        """
+        오래된 배치 삭제
+        
+        보관 기간이 지난 배치를 지우고, 전체 행 수가 max_rows를 넘으면 오래된 배치부터 지운다.
+        가장 최근 배치는 크기와 관계없이 남긴다.
+        
+        Returns:
+            삭제한 배치 수
+        """
+        max_age_days = self.MAX_AGE_DAYS if max_age_days is None else max_age_days
+        max_rows = self.MAX_ROWS if max_rows is None else max_rows
+        cutoff = time.time() - max_age_days * 86400
+        
+        expired = []
+        total_rows = 0
+        rows = self.conn.execute("SELECT batch_id, created, row_count FROM batches ORDER BY batch_id DESC")
+        for index, (batch_id, created, row_count) in enumerate(rows):
+            total_rows += row_count
+            if index > 0 and (created < cutoff or total_rows > max_rows):
+                expired.append(batch_id)
+        
+        if expired:
+            with self.conn:
+                self._delete_batches(expired)
+        return len(expired)
+    
+    def _delete_batches(self, batch_ids: List[int]):
+        """배치와 행 삭제 (트랜잭션 안에서 호출)"""
+        for batch_id in batch_ids:
+            self.conn.execute("DELETE FROM ops WHERE batch_id = ?", (batch_id,))
+            self.conn.execute("DELETE FROM batches WHERE batch_id = ?", (batch_id,))
+
+
+# ============================================================================
+# Rename Mode - 파일 이름 변경 로직
+# ============================================================================
+
+def chunked(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """반복자를 size개씩 리스트로 나눔 (마지막 청크는 더 짧을 수 있음)"""
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class RenameMode:
+    """파일 이름 변경 모드 핵심 로직"""
+    
+    STREAM_CHUNK_SIZE = 10000  # rename_stream 1회 실행당 작업 수
+    
+    # 시스템 오류(errno 이름) 외의 파일별 오류 코드
+    ERROR_BLOCKED = 'BLOCKED'  # 같은 연쇄의 앞선 변경이 실패해 실행하지 않음
+    ERROR_CONFLICT = 'CONFLICT'  # 원본 또는 새 이름이 다른 요청과 중복됨
+    ERROR_ABORTED = 'ABORTED'  # 작업이 중단되어 실행하지 않음 (오류로 집계하지 않음)
+    
+    def __init__(self):
+        self.selected_folder: Optional[str] = None
+        self.recursive: bool = False  # 하위 폴더 포함 여부
+        self.max_depth: Optional[int] = None  # 재귀 스캔 최대 깊이 (None: 무제한)
+        self.scan_workers: int = 8  # 재귀 스캔 스레드 수
+        self.table = FileTable()  # 모든 파일 (필터 전) - 이름/타입/stat 열
+        self.filtered_files: List[str] = []  # 필터링된 파일
+        self.name_index: Set[str] = set()  # 폴더의 모든 이름 (필터 제외 파일, 폴더 포함) - 충돌 검사용
+        self.scanned_names: List[str] = []  # 스캔 중 수집한 파일 (finish_scan에서 테이블로 정렬)
+        self._scanned_sizes: Optional[array] = None  # 스캔 때 읽은 크기 (FileTable.STAT_FROM_SCAN)
+        self._scanned_mtimes: Optional[array] = None
+        self.scan_stats: Dict[str, float] = {}  # 마지막 스캔 통계
+        self.selected_types: Set[str] = set()  # 마지막으로 적용한 파일 타입 필터
+        self.folder_mtimes: Dict[str, int] = {}  # 스캔 시점의 폴더 수정 시각
+        self.last_renamed_pairs: List[Tuple[str, str]] = []  # 마지막 작업에서 성공한 (이전, 이후) 상대 경로
+        self._scanner: Optional[FolderScanner] = None
+        self._snapshot_valid = False  # 작업 시작 시점에 스캔 결과가 최신이었는지 여부
+        self.undo_stack: List[Tuple[str, str]] = []  # [(new_full_path, original_full_path), ...]
+        self.rename_workers: int = 4  # 동시에 실행할 이름 변경 수
+        self.last_rename_errors: List[Tuple[str, str, str]] = []  # [(현재이름, 새이름, 오류 코드), ...]
+        self.journal_dir: Optional[str] = RenameJournal.default_dir()  # None이면 저널 기록 안 함
+        self.backend_factory: Callable[[str], PathRenameBackend] = create_rename_backend
+        self.batch_control: Optional[BatchControl] = None  # 진행 상황 보고/일시정지/중단
+        self.interrupted = False  # 마지막 작업이 중단되어 일부만 실행됨
+        self.skipped_count = 0  # 중단되어 실행하지 않은 파일 수
+        self.unapplied_ops: List[Tuple[str, str]] = []  # 중단되어 실행하지 않은 (현재, 새) 작업 (실행 순서)
+        self.interrupted_chunk_ops: List[Tuple[str, str]] = []  # 중단된 Undo/Redo 청크에서 실행된 전체 경로 작업
+    
+    @property
+    def all_files(self) -> List[str]:
+        """모든 파일 (필터 전, 정렬됨) - 테이블의 이름 열"""
+        return self.table.names
+    
+    @property
+    def filtered_files(self) -> List[str]:
+        """필터링된 파일 목록 (필터 변경 후 처음 접근할 때 타입 코드 열로 걸러냄)"""
+        if self._filtered_files is None:
+            self._filtered_files = self.table.select_types(self.selected_types)
+        return self._filtered_files
+    
+    @filtered_files.setter
+    def filtered_files(self, files: List[str]):
+        self._filtered_files = files
+    
+    def set_folder(self, folder_path: str):
+        """작업할 폴더 설정"""
+        self.selected_folder = folder_path
+        self._scan_files()
+    
+    def set_recursive(self, recursive: bool, max_depth: Optional[int] = None, workers: Optional[int] = None):
+        """
+        재귀 스캔 모드 설정 (다음 스캔부터 적용)
+        
+        Args:
+            recursive: 하위 폴더 포함 여부
+            max_depth: 최대 탐색 깊이 (None이면 무제한)
+            workers: 병렬로 읽을 디렉터리 수
+        """
+        self.recursive = recursive
+        self.max_depth = max_depth
+        if workers is not None:
+            self.scan_workers = max(1, workers)
+    
+    def create_scanner(self, folder_path: str) -> FolderScanner:
+        """현재 스캔 모드에 맞는 스캐너 생성"""
+        if self.recursive:
+            return RecursiveFolderScanner(
+                folder_path,
+                max_workers=self.scan_workers,
+                max_depth=self.max_depth
+            )
+        return FolderScanner(folder_path)
+    
+    def start_scan(self, folder_path: str) -> FolderScanner:
+        """
+        점진적 스캔 시작: 폴더를 설정하고 기존 파일 목록을 비운 뒤 스캐너 반환
+        
+        반환된 스캐너의 결과는 add_scanned_chunk()로 추가하고,
+        완료되면 finish_scan()을 호출한다.
+        """
+        self.selected_folder = folder_path
+        self.clear_files()
+        self._scanner = self.create_scanner(folder_path)
+        return self._scanner
+    
+    def add_scanned_chunk(self, chunk: List[Tuple[str, os.DirEntry]]):
+        """스캔된 파일 청크 추가 (DirEntry는 보관하지 않음)"""
+        if self._scanned_sizes is None:
+            self.scanned_names.extend([name for name, _ in chunk])
+            return
+        
+        for name, entry in chunk:
+            try:
+                st = entry.stat()
+                size, mtime_ns = st.st_size, st.st_mtime_ns
+            except OSError:
+                size = mtime_ns = FileTable.UNKNOWN
+            self.scanned_names.append(name)
+            self._scanned_sizes.append(size)
+            self._scanned_mtimes.append(mtime_ns)
+    
+    def finish_scan(self, stats: Optional[Dict[str, float]] = None):
+        """스캔 완료 처리: 파일 테이블 정렬 및 타입 분류"""
+        self.table = FileTable.build(self.scanned_names, self._scanned_sizes, self._scanned_mtimes)
+        self._reset_scanned()
+        self.filtered_files = []
+        self.selected_types = set()  # 새 스캔 결과에는 아직 필터가 적용되지 않음
+        self.scan_stats = stats or {}
+        self.name_index = set(self.table.names)
+        if self._scanner is not None:
+            self.name_index.update(self._scanner.other_names)
+            self.folder_mtimes = dict(self._scanner.dir_mtimes)
+            self._scanner = None
+    
+    def clear_files(self):
+        """파일 목록 초기화"""
+        self.table = FileTable()
+        self.filtered_files = []
+        self.selected_types = set()
+        self.name_index = set()
+        self._reset_scanned()
+        self.scan_stats = {}
+        self.folder_mtimes = {}
+    
+    def _reset_scanned(self):
+        self.scanned_names = []
+        if FileTable.STAT_FROM_SCAN:
+            self._scanned_sizes = array('q')
+            self._scanned_mtimes = array('q')
+        else:
+            self._scanned_sizes = self._scanned_mtimes = None
+    
+    def _scan_files(self):
+        """Step 1: 폴더 내 모든 파일 수집 (os.scandir 단일 패스)"""
+        if not self.selected_folder:
+            self.clear_files()
+            return
+        
+        try:
+            started = time.perf_counter()
+            scanner = self.start_scan(self.selected_folder)
+            for chunk in scanner.iter_chunks():
+                self.add_scanned_chunk(chunk)
+            
+            stats = scanner.get_stats()
+            stats['elapsed'] = time.perf_counter() - started
+            self.finish_scan(stats)
+        except Exception:
+            self.clear_files()
+    
+    def get_file_stat(self, filename: str) -> Optional[FileStat]:
+        """
+        파일의 크기와 수정 시각 반환
+        
+        테이블의 크기/수정 시각 열에 보관하므로 파일당 최초 1회만 시스템 호출이
+        발생한다. 크기/수정 시각 필터, 정렬, 템플릿의 {date} 등에서 사용한다.
+        
+        Args:
+            filename: 파일명
+        
+        Returns:
+            FileStat (st_size, st_mtime, st_mtime_ns), 파일이 없으면 None
+        """
+        if not self.selected_folder:
+            return None
+        row = self.table.row_of(filename)
+        if row is not None:
+            return self.table.stat(row, self.selected_folder)
+        try:
+            st = os.stat(os.path.join(self.selected_folder, filename))
+        except OSError:
+            return None
+        return FileStat(st.st_size, st.st_mtime_ns)
+    
+    def apply_file_type_filter(self, selected_types: Set[str]):
+        """
+        Step 2: 파일 타입 필터 적용
+        
+        스캔 시 만든 타입 코드 열을 사용하므로 파일을 다시 분류하지 않는다.
+        필터링된 목록은 실제로 필요할 때 만들며, 타입이 그대로면 이전 목록을 재사용한다.
+        """
+        if set(selected_types) == self.selected_types and self._filtered_files is not None:
+            return
+        
+        self.selected_types = set(selected_types)
+        if not selected_types:
+            self.filtered_files = []
+            return
+        
+        self._filtered_files = None
+    
+    def get_file_count(self) -> int:
+        """필터링된 파일 수 반환 (타입별 파일 수의 합)"""
+        if self._filtered_files is not None:
+            return len(self._filtered_files)
+        return self.table.count_types(self.selected_types)
+    
+    def has_external_changes(self) -> bool:
+        """
+        스캔 이후 외부에서 폴더가 변경되었는지 확인
+        
+        스캔 시 기록한 폴더 수정 시각과 현재 값을 비교한다.
+        파일마다가 아니라 폴더마다 stat 1회만 발생한다.
+        """
+        if not self.selected_folder or not self.folder_mtimes:
+            return True
+        
+        try:
+            for rel_dir, mtime_ns in self.folder_mtimes.items():
+                path = os.path.join(self.selected_folder, rel_dir) if rel_dir else self.selected_folder
+                if os.stat(path).st_mtime_ns != mtime_ns:
+                    return True
+        except OSError:
+            return True
+        return False
+    
+    @contextlib.contextmanager
+    def controlled(self, control: BatchControl):
+        """블록 안의 이름 변경/Undo/Redo에 진행 상황 보고와 일시정지/중단 적용"""
+        self.batch_control = control
+        try:
+            yield control
+        finally:
+            self.batch_control = None
+    
+    def _begin_batch(self):
+        """이름 변경/복원 작업 시작 전 스캔 결과가 최신인지 기록"""
+        self._snapshot_valid = not self.has_external_changes()
+        self.last_renamed_pairs = []
+        self.last_rename_errors = []
+        self.interrupted = False
+        self.skipped_count = 0
+        self.unapplied_ops = []
+        self.interrupted_chunk_ops = []
+    
+    def _to_relative(self, full_path: str) -> Optional[str]:
+        """폴더 기준 상대 경로로 변환 (선택된 폴더 밖의 경로이면 None)"""
+        if not self.selected_folder:
+            return None
+        base = os.path.join(self.selected_folder, '')
+        if full_path.startswith(base):
+            return full_path[len(base):]
+        return None
+    
+    def _record_rename(self, old_rel: Optional[str], new_rel: Optional[str]):
+        """성공한 이름 변경을 이름 인덱스와 결과 목록에 반영"""
+        if old_rel is None or new_rel is None:
+            return
+        self.name_index.discard(old_rel)
+        self.name_index.add(new_rel)
+        self.last_renamed_pairs.append((old_rel, new_rel))
+    
+    def refresh_after_batch(self) -> bool:
+        """
+        이름 변경/복원 작업 후 파일 목록 갱신
+        
+        작업 시작 시점에 외부 변경이 없었다면 성공한 (이전, 이후) 쌍으로 파일 목록을 직접 수정한다.
+        외부 변경이 있었다면 목록을 그대로 두고 재스캔이 필요하다고 알리므로, 호출자가 스캔해야 한다
+        (GUI는 백그라운드 스캔, 그 밖에는 set_folder). 작업 도중에 발생한 외부 변경은 감지하지 못한다.
+        
+        Returns:
+            다시 스캔해야 하면 True
+        """
+        if not self._snapshot_valid:
+            return True
+        
+        self.apply_renamed_pairs(self.last_renamed_pairs)
+        return False
+    
+    def apply_renamed_pairs(self, renamed_pairs: List[Tuple[str, str]]):
+        """
+        성공한 이름 변경 결과로 파일 테이블 / filtered_files를 정렬 순서를 유지하며 수정
+        
+        Args:
+            renamed_pairs: 실행 순서대로의 [(이전 상대 경로, 새 상대 경로), ...] 리스트
+        """
+        if not renamed_pairs:
+            return
+        
+        # 실행 순서대로 반영했을 때의 최종 상태 (같은 이름이 여러 번 나오면 마지막 작업이 유효)
+        final_state: Dict[str, bool] = {}
+        for old_name, new_name in renamed_pairs:
+            final_state[old_name] = False
+            final_state[new_name] = True
+        
+        removed = [name for name, exists in final_state.items() if not exists]
+        added = sorted(name for name, exists in final_state.items() if exists)
+        
+        self.table.patch(removed, added)
+        if self._filtered_files is not None:
+            # 변경된 이름만 분류하여 필터링된 목록 수정
+            get_file_type = FileTypeClassifier.get_file_type
+            added_filtered = [name for name in added if get_file_type(name) in self.selected_types]
+            self._patch_sorted(self._filtered_files, removed, added_filtered)
+        self.name_index.difference_update(removed)
+        self.name_index.update(added)
+        
+        # 직접 변경한 폴더의 수정 시각 갱신
+        for rel_dir in {os.path.dirname(name) for name in final_state}:
+            path = os.path.join(self.selected_folder, rel_dir) if rel_dir else self.selected_folder
+            try:
+                self.folder_mtimes[rel_dir] = os.stat(path).st_mtime_ns
+            except OSError:
+                self.folder_mtimes.pop(rel_dir, None)
+    
+    @staticmethod
+    def _patch_sorted(files: List[str], removed: List[str], added: List[str]) -> List[str]:
+        """
+        정렬된 리스트에서 항목 제거/추가
+        
+        변경이 적으면 bisect로 제자리 수정하고, 많으면 한 번의 병합으로 다시 만든다.
+        """
+        if len(removed) + len(added) <= max(64, len(files) // 64):
+            for name in removed:
+                idx = bisect.bisect_left(files, name)
+                if idx < len(files) and files[idx] == name:
+                    del files[idx]
+            for name in added:
+                idx = bisect.bisect_left(files, name)
+                if idx == len(files) or files[idx] != name:
+                    files.insert(idx, name)
+            return files
+        
+        removed_set = set(removed)
+        added_set = set(added)
+        kept = [name for name in files if name not in removed_set and name not in added_set]
+        files[:] = heapq.merge(kept, added)
+        return files
+    
+    def generate_new_names(
+        self,
+        prefix: str,
+        use_sequential: bool = False,
+        start_number: int = 1,
+        digit_padding: int = 3,
+        template: Optional[str] = None
+    ) -> List[Tuple[str, str]]:
+        """
+        Step 3: 새로운 파일명 생성
+        Step 4: 충돌 방지 처리
+        
+        Args:
+            prefix: 접두사
+            use_sequential: 순차 번호 사용 여부
+            start_number: 시작 번호
+            digit_padding: 자릿수 패딩
+            template: 이름 템플릿 (RenameTemplate 문법, 지정하면 use_sequential과 digit_padding 대신 사용)
+        
+        Returns:
+            [(현재이름, 새이름), ...] 리스트
+        """
+        return list(self.iter_new_names(prefix, use_sequential, start_number, digit_padding, template))
+    
+    def iter_new_names(
+        self,
+        prefix: str,
+        use_sequential: bool = False,
+        start_number: int = 1,
+        digit_padding: int = 3,
+        template: Optional[str] = None
+    ) -> Iterator[Tuple[str, str]]:
+        """
+        generate_new_names의 지연 버전 - (현재이름, 새이름)을 하나씩 생성
+        
+        미리보기를 여러 번에 나눠 채울 때 사용하며, 충돌 처리 결과는 전체를 한 번에 만든 것과 같다.
+        """
+        return self.create_name_plan(prefix, use_sequential, start_number, digit_padding, template).iter_build()
+    
+    def create_name_plan(
+        self,
+        prefix: str,
+        use_sequential: bool = False,
+        start_number: int = 1,
+        digit_padding: int = 3,
+        template: Optional[str] = None
+    ) -> NamePlan:
+        """
+        필터링된 파일의 새 이름 계획 생성 (행은 iter_build로 채움)
+        
+        배치 밖의 기존 이름(필터 제외 파일, 폴더 등)은 모두 사용 중으로 취급하고, 필터링된 파일은
+        모두 이름을 비우는 것으로 본다. 일부 행만 실행할 때는 replan_subset으로 다시 확인해야 한다.
+        템플릿은 여기서 한 번만 파싱/컴파일하며, {date}는 스캔 때 보관한 stat 캐시를 사용한다.
+        
+        Raises:
+            ValueError: 템플릿 오류
+        """
+        compiled = None
+        render = None
+        if template:
+            compiled = RenameTemplate(template)
+            folder_name = os.path.basename(os.path.normpath(self.selected_folder or ''))
+            render = compiled.compile(prefix, start_number, folder_name, self.get_file_stat)
+        return NamePlan(
+            self.filtered_files,
+            self.name_index,
+            prefix,
+            use_sequential=use_sequential,
+            start_number=start_number,
+            digit_padding=digit_padding,
+            template=compiled,
+            render=render
+        )
+    
+    def replan_subset(self, rename_list: List[Tuple[str, str]]) -> Tuple[List[Tuple[str, str]], int]:
+        """
+        계획의 일부 행만 실행할 때 새 이름 다시 확인 (미리보기에서 선택 해제한 행이 있는 경우)
+        
+        계획은 필터링된 파일이 모두 이름을 비운다고 보고 만들어지므로, 실행하지 않는 행의 현재
+        이름이 다른 행의 새 이름이 될 수 있다. 실행할 행의 현재 이름만 비워지는 것으로 보고
+        같은 순서로 충돌을 다시 처리하므로, 그런 행은 증분 이름(file(1).txt)을 받는다.
+        
+        Args:
+            rename_list: 실행할 [(현재이름, 새이름), ...] 리스트 (계획 순서)
+        
+        Returns:
+            ([(현재이름, 새이름), ...], 새 이름이 바뀐 행 수) 튜플
+        """
+        collisions = CollisionIndex(
+            reserved=self.name_index, released={current_name for current_name, _ in rename_list}
+        )
+        resolved = []
+        changed = 0
+        for current_name, new_name in rename_list:
+            name = collisions.claim(new_name)
+            if name != new_name:
+                changed += 1
+            resolved.append((current_name, name))
+        return (resolved, changed)
+    
+    def _resolve_collision(self, base_name: str, collisions: CollisionIndex) -> str:
+        """
+        파일명 충돌 해결
+        file.txt → file(1).txt → file(2).txt 형식으로 자동 증분
+        """
+        return collisions.resolve(base_name)
+    
+    def rename_files(self, rename_list: List[Tuple[str, str]]) -> Tuple[int, int, List[Tuple[str, str]]]:
+        """
+        Step 6: 파일 이름 변경 실행
+        
+        Args:
+            rename_list: [(현재이름, 새이름), ...] 리스트
+        
+        Returns:
+            (성공 수, 실패 수, undo_stack) 튜플
+            undo_stack: [(new_full_path, original_full_path), ...] - 성공적으로 변경된 파일만 포함
+        """
+        if not self.selected_folder:
+            return (0, 0, [])
+        
+        self._begin_batch()
+        
+        # 연쇄/순환 변경이 서로 덮어쓰지 않도록 실행 순서 계획
+        planner = RenamePlanner(self.name_index)
+        chains = planner.plan(rename_list)
+        success_count, error_count, done_ops = self._execute_chains(chains, planner)
+        
+        # 성공한 경우에만 undo_stack에 추가 (임시 이름 단계 포함, 실행 순서 유지)
+        folder = self.selected_folder
+        undo_stack = [
+            (os.path.join(folder, new_name), os.path.join(folder, current_name))
+            for current_name, new_name in done_ops
+        ]
+        return (success_count, error_count, undo_stack)
+    
+    def rename_stream(
+        self,
+        rename_ops: Iterable[Tuple[str, str]],
+        chunk_size: Optional[int] = None
+    ) -> Iterator[Tuple[int, int, List[Tuple[str, str]]]]:
+        """
+        (현재이름, 새이름) 스트림을 청크 단위로 계획/실행 (전체 목록을 메모리에 올리지 않음)
+        
+        iter_new_names()의 반복자를 그대로 넘기면 계획 생성과 실행이 청크마다 번갈아 진행된다.
+        새 이름이 아직 이동하지 않은 파일(뒤 청크의 원본일 수 있음)을 가리키는 연쇄는 다음
+        청크로 미루고, 스트림이 끝나면 남은 연쇄를 한 번에 실행한다 (배치 밖 파일과 겹치면 EEXIST).
+        미룬 연쇄만 메모리에 남으므로 청크 경계를 넘는 긴 연쇄(이미 순번이 붙은 파일의 순번
+        밀기 등)가 없으면 메모리 사용량은 청크 크기에 비례한다.
+        
+        성공한 쌍은 last_renamed_pairs에 모으지 않으므로 작업 후 refresh_after_batch()는 재스캔이 필요하다고 알린다.
+        
+        Args:
+            rename_ops: [(현재이름, 새이름), ...] 반복자 - 원본과 새 이름은 각각 중복되지 않아야 함
+            chunk_size: 청크당 작업 수 (None이면 STREAM_CHUNK_SIZE)
+        
+        Yields:
+            청크마다 (성공 수, 실패 수, undo 행) 튜플
+            undo 행: [(new_full_path, original_full_path), ...] - 실행 순서이며 청크 순서대로 이어 붙이면
+            배치 전체의 undo_stack이 된다 (UndoHistory.append_rows로 청크마다 기록 가능).
+        """
+        if not self.selected_folder:
+            return
+        
+        self._begin_batch()
+        control = self.batch_control
+        folder = self.selected_folder
+        deferred: List[Tuple[str, str]] = []
+        
+        try:
+            for chunk in chunked(rename_ops, chunk_size or self.STREAM_CHUNK_SIZE):
+                if control is not None and control.aborted:
+                    self.interrupted = True
+                    break
+                
+                planner = RenamePlanner(self.name_index)
+                ready = []
+                held = []
+                for chain in planner.plan(deferred + chunk):
+                    # 연쇄의 첫 대상이 아직 다른 파일 이름이면 그 파일이 뒤 청크에서 이동할 수 있으므로 보류
+                    if not planner.is_cycle(chain) and chain[0][1] in self.name_index:
+                        held.extend(chain)
+                    else:
+                        ready.append(chain)
+                deferred = held
+                
+                yield self._execute_stream_chunk(ready, planner, folder)
+            
+            if deferred and not self.interrupted:
+                planner = RenamePlanner(self.name_index)
+                yield self._execute_stream_chunk(planner.plan(deferred), planner, folder)
+                deferred = []
+        finally:
+            self.skipped_count += len(deferred)
+            # 파일 목록은 작업 후 다시 스캔해야 함 (성공한 쌍을 보관하지 않음)
+            self._snapshot_valid = False
+    
+    def _execute_stream_chunk(
+        self,
+        chains: List[Tuple[Tuple[str, str], ...]],
+        planner: RenamePlanner,
+        folder: str
+    ) -> Tuple[int, int, List[Tuple[str, str]]]:
+        """rename_stream의 청크 하나 실행 (undo 행은 전체 경로)"""
+        success_count, error_count, done_ops = self._execute_chains(chains, planner)
+        self.last_renamed_pairs = []
+        undo_rows = [
+            (os.path.join(folder, new_name), os.path.join(folder, current_name))
+            for current_name, new_name in done_ops
+        ]
+        return (success_count, error_count, undo_rows)
+    
+    def _execute_chains(
+        self,
+        chains: List[Tuple[Tuple[str, str], ...]],
+        planner: RenamePlanner
+    ) -> Tuple[int, int, List[Tuple[str, str]]]:
+        """
+        계획된 연쇄를 병렬 실행기로 실행
+        
+        실행되지 못한 파일은 last_rename_errors에 오류 코드와 함께 기록된다. batch_control이
+        설정되어 있으면 연쇄마다 진행 상황을 보고하고, 중단된 뒤의 연쇄는 실행하지 않고
+        unapplied_ops에 실행 순서대로 남긴다.
+        
+        Returns:
+            (성공 파일 수, 실패 파일 수, 성공한 작업 목록) 튜플
+            성공한 작업 목록은 연쇄 순서 → 연쇄 내 실행 순서이므로 역순으로 되돌리면 안전하다.
+        """
+        control = self.batch_control
+        if control is not None and planner.conflicts:
+            control.advance(failed=len(planner.conflicts))
+        
+        results = []
+        with RenameExecutor(max_workers=self.rename_workers) as executor, \
+                self.backend_factory(self.selected_folder) as backend, \
+                self._open_journal(chains) as journal:
+            if control is None:
+                run_chain = lambda chain: self._run_chain(chain, planner, backend)
+            else:
+                run_chain = lambda chain: self._run_controlled_chain(chain, planner, backend, control)
+            group_size = RenameJournal.GROUP_SIZE
+            for start in range(0, len(chains), group_size):
+                group = chains[start:start + group_size]
+                if control is not None and control.aborted:
+                    group_results = [([], None, self.ERROR_ABORTED)] * len(group)
+                else:
+                    group_results = executor.run(group, run_chain)
+                results.extend(group_results)
+                if journal is not None:
+                    journal.log_done(start + len(group), [op for done, _, _ in group_results for op in done])
+        
+        errors = [(current_name, new_name, self.ERROR_CONFLICT) for current_name, new_name in planner.conflicts]
+        success_count = 0
+        done_ops: List[Tuple[str, str]] = []
+        for chain, (done, failed_name, code) in zip(chains, results):
+            done_ops.extend(done)
+            success_count += sum(1 for _, name in done if not planner.is_temp(name))
+            if code is None:
+                continue
+            
+            # 파일 단위 (현재 → 새 이름)로 환원: 순환은 임시 이름 단계를 하나로 합침
+            if planner.is_cycle(chain):
+                file_pairs = [(chain[0][0], chain[-1][1])] + list(chain[1:-1])
+                if failed_name is not None and planner.is_temp(failed_name):
+                    failed_name = chain[0][0]
+            else:
+                file_pairs = list(chain)
+            if code == self.ERROR_ABORTED:
+                self.interrupted = True
+                self.skipped_count += len(file_pairs)
+                # 임시 이름 단계를 포함한 연쇄 그대로 남겨야 순서대로 실행할 수 있음
+                self.unapplied_ops.extend(chain)
+                continue
+            renamed = {current_name for current_name, name in done if not planner.is_temp(name)}
+            if done and planner.is_temp(done[-1][0]):
+                renamed.add(chain[0][0])
+            for current_name, new_name in file_pairs:
+                if current_name not in renamed:
+                    reason = code if current_name == failed_name else self.ERROR_BLOCKED
+                    errors.append((current_name, new_name, reason))
+        
+        self.last_rename_errors.extend(errors)
+        return (success_count, len(errors), done_ops)
+    
+    def _open_journal(self, chains: List[Tuple[Tuple[str, str], ...]]):
+        """저널이 설정되어 있으면 새 저널 생성 (없으면 None을 주는 컨텍스트)"""
+        if not self.journal_dir or not chains:
+            return contextlib.nullcontext()
+        return RenameJournal.create(self.journal_dir, self.selected_folder, chains, self.recursive)
+    
+    def recover_journal(self, journal: RenameJournal, resume: bool) -> Tuple[int, int, List[Tuple[str, str]]]:
+        """
+        중단된 배치 복구: 남은 작업을 이어서 실행하거나 적용된 작업을 되돌림
+        
+        복구가 끝나면 원래 저널을 삭제한다. 복구 작업 자체도 새 저널로 기록된다.
+        batch_control이 있으면 일시정지/중단할 수 있으며, 중단되면 실행한 부분까지만 반영한다.
+        
+        Args:
+            journal: RenameJournal.load()로 읽은 저널
+            resume: True면 이어서 실행, False면 원래대로 되돌림
+        
+        Returns:
+            (성공 수, 실패 수, undo_stack) 튜플
+            이어서 실행한 경우 undo_stack은 중단 전 작업을 포함한 배치 전체를 되돌린다.
+            되돌리기가 중단된 경우 undo_stack은 아직 되돌리지 않은 작업만 되돌린다.
+        """
+        self.selected_folder = journal.folder
+        self.recursive = journal.recursive
+        self._scan_files()
+        
+        with PathRenameBackend(journal.folder) as backend:
+            applied, remaining = journal.recover_state(backend)
+        
+        if resume:
+            self._begin_batch()
+            planner = RenamePlanner(self.name_index)
+            success_count, error_count, done_ops = self._execute_chains(remaining, planner)
+            folder = self.selected_folder
+            undo_stack = [
+                (os.path.join(folder, new_name), os.path.join(folder, current_name))
+                for current_name, new_name in applied + done_ops
+            ]
+        else:
+            undo_stack = [
+                (os.path.join(journal.folder, new_name), os.path.join(journal.folder, current_name))
+                for current_name, new_name in applied
+            ]
+            success_count, error_count = self.perform_undo(undo_stack)
+            # 실행 역순으로 되돌리므로 남은 작업을 뒤집으면 실행 순서의 Undo 행이 됨
+            undo_stack = self.unapplied_ops[::-1] if self.interrupted else []
+        
+        journal.finish()
+        return (success_count, error_count, undo_stack)
+    
+    def _run_chain(
+        self,
+        chain: Tuple[Tuple[str, str], ...],
+        planner: RenamePlanner,
+        backend: PathRenameBackend
+    ) -> Tuple[List[Tuple[str, str]], Optional[str], Optional[str]]:
+        """
+        연쇄 하나를 순서대로 실행 (작업 스레드에서 호출될 수 있음)
+        
+        Returns:
+            (성공한 (이전, 이후) 작업 목록, 실패한 작업의 원본 이름, 오류 코드) 튜플
+            모두 성공하면 실패 정보는 (None, None)
+        """
+        done = []
+        for current_name, new_name in chain:
+            code = self._rename_one(current_name, new_name, backend)
+            # 실패하면 남은 작업은 대상이 비워지지 않으므로 중단
+            if code is not None:
+                if done and planner.is_cycle(chain):
+                    # 순환 변경은 전부 성공하거나 전부 되돌림 (임시 이름이 남지 않도록)
+                    done = self._rollback_chain(done, backend)
+                return (done, current_name, code)
+            done.append((current_name, new_name))
+        return (done, None, None)
+    
+    def _run_controlled_chain(
+        self,
+        chain: Tuple[Tuple[str, str], ...],
+        planner: RenamePlanner,
+        backend: PathRenameBackend,
+        control: BatchControl
+    ) -> Tuple[List[Tuple[str, str]], Optional[str], Optional[str]]:
+        """일시정지/중단을 확인한 뒤 연쇄를 실행하고 진행 상황 보고 (연쇄 도중에는 멈추지 않음)"""
+        if not control.wait_turn():
+            return ([], None, self.ERROR_ABORTED)
+        result = self._run_chain(chain, planner, backend)
+        file_count = len(chain) - 1 if planner.is_cycle(chain) else len(chain)
+        renamed = sum(1 for _, name in result[0] if not planner.is_temp(name))
+        control.advance(done=renamed, failed=file_count - renamed, current=chain[0][0])
+        return result
+    
+    def _rename_one(self, current_name: str, new_name: str, backend: PathRenameBackend) -> Optional[str]:
+        """
+        파일 하나의 이름 변경 (상대 경로)
+        
+        스캔 결과가 최신이면 이름 인덱스로 원본/대상을 먼저 확인해 시스템 호출을 아끼고,
+        실제 변경은 대상을 덮어쓰지 않는 rename_noreplace로 수행한다.
+        
+        Returns:
+            성공하면 None, 실패하면 오류 코드 (ENOENT, EEXIST, EACCES 등)
+        """
+        if self._snapshot_valid:
+            if current_name not in self.name_index:
+                return 'ENOENT'
+            # 배치 밖의 파일(필터 제외/선택 해제된 파일 포함)을 덮어쓰지 않도록 확인
+            if new_name in self.name_index:
+                return 'EEXIST'
+        
+        try:
+            backend.rename_noreplace(current_name, new_name)
+        except Exception as e:
+            return error_code(e)
+        
+        self._record_rename(current_name, new_name)
+        return None
+    
+    def _rollback_chain(self, done: List[Tuple[str, str]], backend: PathRenameBackend) -> List[Tuple[str, str]]:
+        """
+        연쇄에서 성공한 작업을 역순으로 되돌림
+        
+        Returns:
+            되돌리지 못하고 적용된 채로 남은 작업 목록 (실행 순서)
+        """
+        applied = list(done)
+        while applied:
+            current_name, new_name = applied[-1]
+            if self._rename_one(new_name, current_name, backend) is not None:
+                break
+            applied.pop()
+        return applied
+    
+    def summarize_errors(self) -> Dict[str, int]:
+        """마지막 작업의 오류 코드별 파일 수 (많은 순)"""
+        counts: Dict[str, int] = {}
+        for _, _, code in self.last_rename_errors:
+            counts[code] = counts.get(code, 0) + 1
+        return dict(sorted(counts.items(), key=lambda item: -item[1]))
+    
+    @staticmethod
+    def _compose_moves(ops: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+        """
+        순서대로 실행할 작업들을 파일별 (시작 이름, 최종 이름) 이동으로 합성
+        
+        임시 이름을 거친 단계는 하나로 합쳐지고, 제자리로 돌아오는 파일은 제외된다.
+        """
+        start_of: Dict[str, str] = {}
+        for old_name, new_name in ops:
+            start_of[new_name] = start_of.pop(old_name, old_name)
+        return [(start, final) for final, start in start_of.items() if start != final]
+    
+    def perform_undo(self, undo_stack: List[Tuple[str, str]]) -> Tuple[int, int]:
+        """
+        Undo 실행: 파일 이름을 원래대로 복원
+        
+        Args:
+            undo_stack: [(new_full_path, original_full_path), ...] 리스트
+        
+        Returns:
+            (성공 수, 실패 수) 튜플
+        """
+        if not undo_stack:
+            return (0, 0)
+        return self.apply_moves_stream([undo_stack[::-1]])
+    
+    def apply_moves_stream(self, chunks: Iterable[List[Tuple[str, str]]]) -> Tuple[int, int]:
+        """
+        전체 경로 (이전, 이후) 작업 스트림을 주어진 순서대로 실행 (Undo/Redo용)
+        
+        청크마다 파일별 이동으로 합성한 뒤 이름 변경과 같은 계획기/병렬 실행기로 실행한다.
+        앞 청크가 모두 끝난 뒤 다음 청크를 실행하므로 청크 경계에서 나뉜 순환도 안전하다.
+        중단되면 그 청크까지만 실행하고 interrupted를 설정한다. 이때 청크에서 실행된 작업은
+        interrupted_chunk_ops에, 실행하지 않은 작업은 unapplied_ops에 전체 경로로 남는다.
+        
+        Args:
+            chunks: [(현재 전체 경로, 새 전체 경로), ...] 청크의 반복자 (실행 순서)
+        
+        Returns:
+            (성공 수, 실패 수) 튜플
+        """
+        self._begin_batch()
+        control = self.batch_control
+        success_count = 0
+        error_count = 0
+        
+        for chunk in chunks:
+            relative_ops = []
+            for old_path, new_path in chunk:
+                old_rel = self._to_relative(old_path)
+                new_rel = self._to_relative(new_path)
+                if old_rel is None or new_rel is None:
+                    relative_ops = None
+                    break
+                relative_ops.append((old_rel, new_rel))
+            
+            if relative_ops is None:
+                # 다른 폴더에서 실행된 작업은 전체 경로로 순서대로 실행
+                done, errors, done_ops = self._apply_moves_by_path(chunk)
+            else:
+                moves = self._compose_moves(relative_ops)
+                if control is not None and len(chunk) > len(moves):
+                    # 합성으로 사라진 행 (임시 이름 단계, 제자리 이동)은 처리한 것으로 집계
+                    control.advance(done=len(chunk) - len(moves))
+                planner = RenamePlanner(self.name_index)
+                chains = planner.plan(moves)
+                done, errors, done_ops = self._execute_chains(chains, planner)
+                if self.interrupted or (control is not None and control.aborted):
+                    folder = self.selected_folder
+                    done_ops = [(os.path.join(folder, old), os.path.join(folder, new)) for old, new in done_ops]
+                    self.unapplied_ops = [
+                        (os.path.join(folder, old), os.path.join(folder, new)) for old, new in self.unapplied_ops
+                    ]
+            success_count += done
+            error_count += errors
+            
+            if control is not None and control.aborted:
+                self.interrupted = True
+                self.interrupted_chunk_ops = done_ops
+                break
+        
+        return (success_count, error_count)
+    
+    def _apply_moves_by_path(self, ops: List[Tuple[str, str]]) -> Tuple[int, int, List[Tuple[str, str]]]:
+        """
+        전체 경로 기준으로 순서대로 실행 (선택된 폴더 밖의 작업용)
+        
+        Returns:
+            (성공 수, 실패 수, 성공한 작업 목록) 튜플
+        """
+        control = self.batch_control
+        success_count = 0
+        error_count = 0
+        done_ops: List[Tuple[str, str]] = []
+        backend = PathRenameBackend('')
+        
+        for index, (old_path, new_path) in enumerate(ops):
+            if control is not None and not control.wait_turn():
+                self.interrupted = True
+                self.skipped_count += len(ops) - index
+                self.unapplied_ops.extend(ops[index:])
+                break
+            try:
+                # 대상 이름을 그 사이에 다른 파일이 차지했으면 덮어쓰지 않음
+                backend.rename_noreplace(old_path, new_path)
+                success_count += 1
+                done_ops.append((old_path, new_path))
+                if control is not None:
+                    control.advance(done=1, current=old_path)
+                
+            except Exception as e:
+                error_count += 1
+                self.last_rename_errors.append((old_path, new_path, error_code(e)))
+                if control is not None:
+                    control.advance(failed=1, current=old_path)
+        
+        return (success_count, error_count, done_ops)
+    
+    def undo_batch(self, history: UndoHistory, batch_id: int) -> Tuple[int, int]:
+        """
+        기록된 배치 되돌리기 (행을 실행 역순으로 청크 단위 스트리밍)
+        
+        Returns:
+            (성공 수, 실패 수) 튜플
+        """
+        row_count = self._select_batch_folder(history, batch_id)
+        bounds: List[int] = []  # 마지막으로 읽은 청크의 seq 범위 [최소, 최대]
+        read_rows = 0
+        
+        def chunks():
+            nonlocal read_rows
+            for rows in history.iter_rows(batch_id, reverse=True):
+                bounds[:] = [rows[-1][0], rows[0][0]]
+                read_rows += len(rows)
+                yield [(new_path, original_path) for _, new_path, original_path in rows]
+        
+        result = self.apply_moves_stream(chunks())
+        self._count_unread_rows(row_count - read_rows)
+        if self.interrupted and bounds and (bounds[0] > 0 or self.unapplied_ops):
+            # 중단: 아직 되돌리지 않은 행만 남겨 적용된 배치로 유지 (되돌린 부분은 Redo 불가)
+            # 행은 Undo할 때 역순으로 읽으므로 실행 순서를 뒤집어 기록
+            history.trim_batch(batch_id, bounds[0], self.unapplied_ops[::-1])
+        else:
+            self.interrupted = False
+            history.set_state(batch_id, UndoHistory.STATE_UNDONE)
+        return result
+    
+    def redo_batch(self, history: UndoHistory, batch_id: int) -> Tuple[int, int]:
+        """
+        되돌린 배치 다시 실행 (행을 실행 순서대로 청크 단위 스트리밍)
+        
+        Returns:
+            (성공 수, 실패 수) 튜플
+        """
+        row_count = self._select_batch_folder(history, batch_id)
+        bounds: List[int] = []  # 마지막으로 읽은 청크의 seq 범위 [최소, 최대]
+        read_rows = 0
+        
+        def chunks():
+            nonlocal read_rows
+            for rows in history.iter_rows(batch_id):
+                bounds[:] = [rows[0][0], rows[-1][0]]
+                read_rows += len(rows)
+                yield [(original_path, new_path) for _, new_path, original_path in rows]
+        
+        result = self.apply_moves_stream(chunks())
+        self._count_unread_rows(row_count - read_rows)
+        if self.interrupted and bounds and (bounds[1] < row_count - 1 or self.unapplied_ops):
+            # 중단: 다시 실행된 행만 남겨 적용된 배치로 전환 (실행하지 않은 부분은 Redo 불가)
+            history.trim_batch(
+                batch_id, bounds[0], [(new_path, old_path) for old_path, new_path in self.interrupted_chunk_ops]
+            )
+        else:
+            self.interrupted = False
+        history.set_state(batch_id, UndoHistory.STATE_DONE)
+        return result
+    
+    def _count_unread_rows(self, unread: int):
+        """
+        중단된 Undo/Redo에서 읽지 않은 청크의 행을 건너뛴 파일 수에 더함
+        
+        apply_moves_stream은 중단된 청크 안에서 실행하지 않은 파일만 집계하므로,
+        그 뒤 청크의 행은 배치 행 수에서 읽은 행 수를 빼서 더한다.
+        """
+        if self.interrupted and unread > 0:
+            self.skipped_count += unread
+    
+    def _select_batch_folder(self, history: UndoHistory, batch_id: int) -> int:
+        """
+        배치가 실행된 폴더/스캔 방식이 현재와 다르면 해당 폴더로 전환
+        
+        Returns:
+            배치의 행 수
+        """
+        batch = history.get_batch(batch_id)
+        if batch is None:
+            raise KeyError(batch_id)
+        _, folder, recursive, row_count = batch
+        if folder != self.selected_folder or recursive != self.recursive:
+            self.selected_folder = folder
+            self.recursive = recursive
+            self._scan_files()
+        return row_count
+
+
+# ============================================================================
+# 여러 폴더 일괄 작업 - 폴더마다 별도 프로세스
+# ============================================================================
+
+def run_folder_job(folder: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    폴더 하나를 스캔 → 계획 → 실행 (FolderBatchRunner의 작업 프로세스에서 실행)
+    
+    Args:
+        folder: 작업 폴더 (절대 경로)
+        options: FolderBatchRunner.DEFAULT_OPTIONS 형식의 이름 변경 설정
+    
+    Returns:
+        폴더 보고서 딕셔너리 (FolderBatchRunner.run 참고)
+        undo_rows: [(new_full_path, original_full_path), ...] - 실행 순서
+    """
+    report: Dict[str, Any] = {
+        'folder': folder, 'files': 0, 'planned': 0, 'renamed': 0, 'failed': 0, 'error': None, 'errors': [],
+        'scan': 0.0, 'plan': 0.0, 'rename': 0.0, 'undo_rows': [],
+    }
+    if not os.path.isdir(folder):
+        report['error'] = 'ENOENT'
+        return report
+    
+    started = time.perf_counter()
+    mode = RenameMode()
+    mode.set_recursive(options['recursive'], options['max_depth'])
+    mode.set_folder(folder)
+    mode.apply_file_type_filter(set(options['types']))
+    report['files'] = mode.get_file_count()
+    report['scan'] = time.perf_counter() - started
+    
+    started = time.perf_counter()
+    rename_list = mode.generate_new_names(
+        options['prefix'], options['sequential'], options['start'], options['padding'], options['template']
+    )
+    report['plan'] = time.perf_counter() - started
+    report['planned'] = len(rename_list)
+    if options['dry_run']:
+        return report
+    
+    started = time.perf_counter()
+    success_count, error_count, undo_stack = mode.rename_files(rename_list)
+    report['rename'] = time.perf_counter() - started
+    
+    report['renamed'] = success_count
+    report['failed'] = error_count
+    report['errors'] = mode.last_rename_errors
+    report['undo_rows'] = undo_stack
+    return report
+
+
+class FolderBatchRunner:
+    """
+    여러 폴더에 같은 이름 변경 설정을 프로세스 풀로 병렬 적용 (야간 일괄 작업 등)
+    
+    폴더마다 스캔 → 계획 → 실행을 작업 프로세스 하나가 맡으므로 GIL에 묶이지 않고
+    작업자 수만큼 폴더가 동시에 처리된다. 폴더 보고서는 끝나는 순서대로 전달하며,
+    성공한 작업의 Undo 행은 폴더마다 별도의 Undo 기록 배치로 남긴다. 배치의 폴더/스캔 방식이
+    작업 폴더와 같으므로 Undo/Redo는 작업한 폴더만 다시 스캔한다 (폴더마다 한 번씩 되돌림).
+    """
+    
+    DEFAULT_OPTIONS: Dict[str, Any] = {
+        'types': FileTypeClassifier.FILE_TYPES,  # 파일 타입 필터
+        'recursive': False,  # 폴더마다 하위 폴더 포함 여부
+        'max_depth': None,
+        'prefix': '',
+        'sequential': False,
+        'start': 1,
+        'padding': 3,
+        'template': None,
+        'dry_run': False,  # 계획만 세우고 실행하지 않음
+    }
+    
+    def __init__(
+        self,
+        options: Optional[Dict[str, Any]] = None,
+        workers: Optional[int] = None,
+        history: Optional[UndoHistory] = None
+    ):
+        """
+        Args:
+            options: 이름 변경 설정 (DEFAULT_OPTIONS의 키, 빠진 키는 기본값)
+            workers: 동시에 처리할 폴더 수 (None이면 CPU 수)
+            history: 폴더별 Undo 기록을 남길 곳 (None이면 기록 안 함)
+        
+        Raises:
+            ValueError: 알 수 없는 설정 키 또는 템플릿 오류 (작업 시작 전에 확인)
+        """
+        unknown = set(options or {}) - set(self.DEFAULT_OPTIONS)
+        if unknown:
+            raise ValueError(f"unknown options: {', '.join(sorted(unknown))}")
+        self.options = {**self.DEFAULT_OPTIONS, **(options or {})}
+        if self.options['template']:
+            RenameTemplate(self.options['template'])
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.history = history
+    
+    @staticmethod
+    def find_folders(root: str, pattern: str = '*') -> List[str]:
+        """
+        root 아래에서 glob 패턴과 일치하는 폴더 목록 ('**'는 모든 깊이)
+        
+        Returns:
+            정렬된 절대 경로 리스트
+        """
+        matches = glob.glob(os.path.join(glob.escape(os.path.abspath(root)), pattern), recursive=True)
+        return sorted(path for path in matches if os.path.isdir(path))
+    
+    def check_folders(self, folders: Iterable[str]) -> List[str]:
+        """
+        폴더 목록 정규화 (절대 경로, 중복 제거, 정렬)
+        
+        Raises:
+            ValueError: 하위 폴더 포함 설정에서 한 폴더가 다른 폴더 안에 있는 경우
+                (두 프로세스가 같은 파일의 이름을 바꾸게 됨)
+        """
+        folders = sorted({os.path.normpath(os.path.abspath(folder)) for folder in folders})
+        if self.options['recursive']:
+            for parent, child in zip(folders, folders[1:]):
+                if child.startswith(os.path.join(parent, '')):
+                    raise ValueError(f"overlapping folders: {parent}, {child}")
+        return folders
+    
+    def run(
+        self,
+        folders: Iterable[str],
+        on_report: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        폴더마다 스캔 → 계획 → 실행을 작업 프로세스에 나눠 실행
+        
+        Args:
+            folders: 작업 폴더 목록
+            on_report: 폴더가 끝날 때마다 폴더 보고서를 받는 콜백 (이 스레드에서 호출)
+                {'folder', 'files', 'planned', 'renamed', 'failed', 'error', 'errors', 'scan', 'plan', 'rename'}
+                error: 폴더 전체가 실패한 경우의 오류 코드, errors: [(현재이름, 새이름, 오류 코드), ...]
+                scan/plan/rename: 단계별 소요 시간(초)
+        
+        Returns:
+            {'folders', 'failed_folders', 'files', 'planned', 'renamed', 'failed', 'batches', 'elapsed', 'workers'}
+            batches: 폴더별 Undo 기록의 batch_id 목록 (기록한 순서)
+        """
+        started = time.perf_counter()
+        folders = self.check_folders(folders)
+        summary: Dict[str, Any] = {
+            'folders': len(folders), 'failed_folders': 0, 'files': 0, 'planned': 0, 'renamed': 0, 'failed': 0,
+            'batches': [], 'elapsed': 0.0, 'workers': self.workers,
+        }
+        if not folders:
+            return summary
+        
+        from concurrent.futures import ProcessPoolExecutor  # 지연 로드: 폴더 일괄 실행 때만 필요
+        with ProcessPoolExecutor(max_workers=min(self.workers, len(folders))) as executor:
+            futures = {executor.submit(run_folder_job, folder, self.options): folder for folder in folders}
+            for future in as_completed(futures):
+                try:
+                    report = future.result()
+                except Exception as e:
+                    report = {
+                        'folder': futures[future], 'files': 0, 'planned': 0, 'renamed': 0, 'failed': 0,
+                        'error': error_code(e), 'errors': [], 'scan': 0.0, 'plan': 0.0, 'rename': 0.0,
+                    }
+                
+                undo_rows = report.pop('undo_rows', None)
+                if undo_rows and self.history is not None:
+                    # 공통 상위 폴더로 묶으면 Undo 때 작업하지 않은 폴더까지 재귀 스캔하게 되므로 폴더마다 기록
+                    summary['batches'].append(
+                        self.history.record_batch(report['folder'], undo_rows, self.options['recursive'])
+                    )
+                
+                summary['failed_folders'] += report['error'] is not None
+                for key in ('files', 'planned', 'renamed', 'failed'):
+                    summary[key] += report[key]
+                if on_report is not None:
+                    on_report(report)
+        
+        summary['elapsed'] = time.perf_counter() - started
+        return summary
@@ -1,8 +1,28 @@
-import tkinter as tk
-from tkinter import ttk, filedialog, messagebox
+import argparse
+import json
 import os
-from pathlib import Path
-from typing import List, Tuple, Optional, Set
+import queue
+import sys
+import threading
+import time
+from itertools import compress
+from typing import List, Tuple, Optional, Set, Dict, Iterator, Callable, Sequence, Any
+
+from rename_engine import (
+    BatchControl, BatchWorker, FileTypeClassifier, FolderBatchRunner, NamePlan, RenameJournal, RenameMode,
+    RenameTemplate, ScanWorker, UndoHistory
+)
+
+# tkinter는 GUI를 띄울 때만 불러옴 (명령줄/라이브러리 사용 시 Tk 로딩 비용 없음)
+tk = ttk = filedialog = messagebox = None
+
+
+def load_tkinter():
+    """tkinter 모듈을 불러와 전역 이름에 연결 (GUI 위젯 생성 전에 호출, 여러 번 호출해도 됨)"""
+    global tk, ttk, filedialog, messagebox
+    if tk is None:
+        import tkinter as tk
+        from tkinter import ttk, filedialog, messagebox
 
 
 # ============================================================================
@@ -58,7 +78,34 @@ LANGUAGES = {
         'undo_error': '파일 이름 복원 중 오류가 발생했습니다.',
         'files_restored': '개 파일이 복원되었습니다.',
         'no_undo_available': '취소할 작업이 없습니다.',
-        'confirm_undo': '마지막 이름 변경 작업을 취소하시겠습니까?'
+        'confirm_undo': '마지막 이름 변경 작업을 취소하시겠습니까?',
+        'cancel_scan': '스캔 취소',
+        'scanning': '폴더 스캔 중...',
+        'scan_cancelled': '폴더 스캔이 취소되었습니다.',
+        'include_subfolders': '하위 폴더 포함',
+        'error_details': '오류 내역',
+        'journal_found': '이전 실행에서 중단된 이름 변경 작업이 있습니다.',
+        'journal_choice': '예: 이어서 실행 / 아니요: 원래대로 되돌리기 / 취소: 나중에',
+        'journal_recovered': '중단된 작업을 복구했습니다.',
+        'redo_last_undo': '취소한 변경 다시 실행',
+        'no_redo_available': '다시 실행할 작업이 없습니다.',
+        'confirm_redo': '마지막으로 취소한 이름 변경 작업을 다시 실행하시겠습니까?',
+        'invert_selection': '선택 반전',
+        'preview_loading': '미리보기 생성 중...',
+        'template': '템플릿',
+        'template_hint': '예: {prefix}{date:%Y%m%d}_{n:04}{ext} (비우면 접두사 + 원래 이름/순번)',
+        'invalid_template': '템플릿 오류',
+        'warning_invalid_template': '경고: 템플릿을 확인해주세요.',
+        'pause': '일시정지',
+        'resume': '계속',
+        'abort': '중단',
+        'batch_progress': '처리 중',
+        'batch_paused': '일시정지됨',
+        'batch_failed': '실패',
+        'batch_eta': '남은 시간',
+        'batch_aborted': '작업이 중단되었습니다. 실행하지 않은 파일은 그대로 남아 있습니다.',
+        'files_skipped': '개 파일 건너뜀',
+        'names_adjusted': '개의 새 이름은 선택 해제한 파일과 겹쳐 번호를 붙여 변경합니다.'
     },
     'EN': {
         'title': 'Smart File Renamer v0.4',
@@ -108,7 +155,34 @@ LANGUAGES = {
         'undo_error': 'An error occurred while restoring files.',
         'files_restored': 'files restored.',
         'no_undo_available': 'No operation to undo.',
-        'confirm_undo': 'Do you want to undo the last rename operation?'
+        'confirm_undo': 'Do you want to undo the last rename operation?',
+        'cancel_scan': 'Cancel Scan',
+        'scanning': 'Scanning folder...',
+        'scan_cancelled': 'Folder scan cancelled.',
+        'include_subfolders': 'Include Subfolders',
+        'error_details': 'Error details',
+        'journal_found': 'An unfinished rename batch from a previous run was found.',
+        'journal_choice': 'Yes: resume / No: roll back / Cancel: decide later',
+        'journal_recovered': 'Recovered the unfinished batch.',
+        'redo_last_undo': 'Redo Last Undo',
+        'no_redo_available': 'No operation to redo.',
+        'confirm_redo': 'Do you want to redo the last undone rename operation?',
+        'invert_selection': 'Invert Selection',
+        'preview_loading': 'Building preview...',
+        'template': 'Template',
+        'template_hint': 'e.g. {prefix}{date:%Y%m%d}_{n:04}{ext} (empty: prefix + name/number)',
+        'invalid_template': 'Invalid template',
+        'warning_invalid_template': 'Warning: Please check the template.',
+        'pause': 'Pause',
+        'resume': 'Resume',
+        'abort': 'Abort',
+        'batch_progress': 'Processing',
+        'batch_paused': 'Paused',
+        'batch_failed': 'failed',
+        'batch_eta': 'ETA',
+        'batch_aborted': 'The operation was aborted. Files that were not processed are unchanged.',
+        'files_skipped': 'files skipped',
+        'names_adjusted': 'new names clash with unchecked files and will get a number suffix.'
     },
     'JP': {
         'title': 'Smart File Renamer v0.4',
@@ -158,275 +232,335 @@ LANGUAGES = {
         'undo_error': 'ファイル名復元中にエラーが発生しました。',
         'files_restored': '個のファイルが復元されました。',
         'no_undo_available': '元に戻す操作がありません。',
-        'confirm_undo': '最後の名前変更操作を元に戻しますか？'
+        'confirm_undo': '最後の名前変更操作を元に戻しますか？',
+        'cancel_scan': 'スキャン中止',
+        'scanning': 'フォルダをスキャン中...',
+        'scan_cancelled': 'フォルダのスキャンがキャンセルされました。',
+        'include_subfolders': 'サブフォルダを含む',
+        'error_details': 'エラー内訳',
+        'journal_found': '前回の実行で中断された名前変更作業があります。',
+        'journal_choice': 'はい: 再開 / いいえ: 元に戻す / キャンセル: 後で',
+        'journal_recovered': '中断された作業を復旧しました。',
+        'redo_last_undo': '取り消した変更をやり直す',
+        'no_redo_available': 'やり直す操作がありません。',
+        'confirm_redo': '最後に取り消した名前変更操作をやり直しますか？',
+        'invert_selection': '選択を反転',
+        'preview_loading': 'プレビュー作成中...',
+        'template': 'テンプレート',
+        'template_hint': '例: {prefix}{date:%Y%m%d}_{n:04}{ext} (空欄: プレフィックス + 元の名前/連番)',
+        'invalid_template': 'テンプレートエラー',
+        'warning_invalid_template': '警告: テンプレートを確認してください。',
+        'pause': '一時停止',
+        'resume': '再開',
+        'abort': '中止',
+        'batch_progress': '処理中',
+        'batch_paused': '一時停止中',
+        'batch_failed': '失敗',
+        'batch_eta': '残り時間',
+        'batch_aborted': '処理が中止されました。未処理のファイルはそのままです。',
+        'files_skipped': '個のファイルをスキップ',
+        'names_adjusted': '件の新しい名前は選択解除したファイルと重なるため番号を付けて変更します。'
     }
 }
 
 
 # ============================================================================
-# 파일 타입 분류 유틸리티
+# 가상 미리보기 테이블 - 보이는 행만 그리기
 # ============================================================================
 
-class FileTypeClassifier:
-    """파일 타입 분류기"""
-    
-    # 이미지 확장자
-    IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.tif', 
-                        '.webp', '.svg', '.ico', '.heic', '.heif', '.raw', '.cr2', 
-                        '.nef', '.orf', '.sr2', '.psd', '.ai', '.eps'}
-    
-    # 비디오 확장자
-    VIDEO_EXTENSIONS = {'.mp4', '.avi', '.mkv', '.mov', '.wmv', '.flv', '.webm',
-                        '.m4v', '.mpg', '.mpeg', '.3gp', '.ogv', '.ts', '.mts',
-                        '.m2ts', '.vob', '.asf', '.rm', '.rmvb', '.divx', '.xvid'}
-    
-    # 문서 확장자
-    DOCUMENT_EXTENSIONS = {'.pdf', '.doc', '.docx', '.xls', '.xlsx', '.ppt', '.pptx',
-                           '.txt', '.rtf', '.odt', '.ods', '.odp', '.csv', '.md',
-                           '.html', '.htm', '.xml', '.json', '.yaml', '.yml', '.ini',
-                           '.cfg', '.conf', '.log', '.tex', '.latex'}
-    
-    @classmethod
-    def get_file_type(cls, filename: str) -> str:
+class SelectionModel:
+    """
+    미리보기 행의 선택 상태를 행 위치 기준 비트 배열(bytearray, 바이트당 8행)로 관리
+    
+    전체 선택/해제/반전과 범위 지정은 바이트 단위 일괄 연산이므로
+    행 수에 비례하는 파이썬 반복 없이 처리된다. 비트 i는 바이트 i >> 3의 (i & 7)번째 비트이다.
+    """
+    
+    _POPCOUNT = bytes(bin(value).count('1') for value in range(256))  # 바이트별 1의 개수
+    _INVERT = bytes(255 - value for value in range(256))
+    _EXPAND = [bytes((value >> bit) & 1 for bit in range(8)) for value in range(256)]  # 바이트 → 행별 0/1
+    
+    def __init__(self, size: int = 0, selected: bool = True):
         """
-        파일의 타입을 반환
-        
         Args:
-            filename: 파일명
-            
-        Returns:
-            'image', 'video', 'document', 'other' 중 하나
+            size: 행 수
+            selected: 처음 선택 상태
         """
-        ext = Path(filename).suffix.lower()
-        
-        if ext in cls.IMAGE_EXTENSIONS:
-            return 'image'
-        elif ext in cls.VIDEO_EXTENSIONS:
-            return 'video'
-        elif ext in cls.DOCUMENT_EXTENSIONS:
-            return 'document'
+        self.size = size
+        self.bits = bytearray((size + 7) >> 3)
+        if selected:
+            self.select_all()
+    
+    def __len__(self) -> int:
+        return self.size
+    
+    def __getitem__(self, index: int) -> bool:
+        return bool(self.bits[index >> 3] & (1 << (index & 7)))
+    
+    def set(self, index: int, value: bool):
+        if value:
+            self.bits[index >> 3] |= 1 << (index & 7)
         else:
-            return 'other'
+            self.bits[index >> 3] &= ~(1 << (index & 7)) & 0xFF
     
-    @classmethod
-    def filter_files_by_type(cls, files: List[str], selected_types: Set[str]) -> List[str]:
-        """
-        선택된 타입의 파일만 필터링
-        
-        Args:
-            files: 파일 리스트
-            selected_types: 선택된 타입 집합 {'image', 'video', 'document', 'other'}
-            
-        Returns:
-            필터링된 파일 리스트
-        """
-        if not selected_types:
-            return []
-        
-        filtered = []
-        for file in files:
-            file_type = cls.get_file_type(file)
-            if file_type in selected_types:
-                filtered.append(file)
-        
-        return filtered
-
-
-# ============================================================================
-# Rename Mode - 파일 이름 변경 로직
-# ============================================================================
-
-class RenameMode:
-    """파일 이름 변경 모드 핵심 로직"""
-    
-    def __init__(self):
-        self.selected_folder: Optional[str] = None
-        self.all_files: List[str] = []  # 모든 파일 (필터 전)
-        self.filtered_files: List[str] = []  # 필터링된 파일
-        self.undo_stack: List[Tuple[str, str]] = []  # [(new_full_path, original_full_path), ...]
-    
-    def set_folder(self, folder_path: str):
-        """작업할 폴더 설정"""
-        self.selected_folder = folder_path
-        self._scan_files()
-    
-    def _scan_files(self):
-        """Step 1: 폴더 내 모든 파일 수집"""
-        if not self.selected_folder:
-            self.all_files = []
-            self.filtered_files = []
+    def toggle(self, index: int) -> bool:
+        """선택 상태를 반전하고 새 상태 반환"""
+        self.bits[index >> 3] ^= 1 << (index & 7)
+        return self[index]
+    
+    def select_all(self):
+        self.bits[:] = b'\xff' * len(self.bits)
+        self._clear_tail()
+    
+    def deselect_all(self):
+        self.bits[:] = bytes(len(self.bits))
+    
+    def invert(self):
+        self.bits[:] = self.bits.translate(self._INVERT)
+        self._clear_tail()
+    
+    def set_range(self, start: int, stop: int, value: bool):
+        """[start, stop) 범위의 선택 상태 지정"""
+        start = max(0, start)
+        stop = min(self.size, stop)
+        if start >= stop:
             return
         
-        try:
-            self.all_files = [
-                f for f in os.listdir(self.selected_folder)
-                if os.path.isfile(os.path.join(self.selected_folder, f))
-            ]
-            self.all_files.sort()
-            self.filtered_files = []
-        except Exception:
-            self.all_files = []
-            self.filtered_files = []
-    
-    def apply_file_type_filter(self, selected_types: Set[str]):
-        """Step 2: 파일 타입 필터 적용"""
-        if not selected_types:
-            self.filtered_files = []
+        # 양 끝의 걸친 바이트는 비트 단위, 가운데는 바이트 단위로 처리
+        first_full = (start + 7) >> 3
+        last_full = stop >> 3
+        if first_full > last_full:
+            for index in range(start, stop):
+                self.set(index, value)
             return
-        
-        self.filtered_files = FileTypeClassifier.filter_files_by_type(
-            self.all_files, selected_types
-        )
+        for index in range(start, first_full << 3):
+            self.set(index, value)
+        self.bits[first_full:last_full] = (b'\xff' if value else b'\x00') * (last_full - first_full)
+        for index in range(last_full << 3, stop):
+            self.set(index, value)
     
-    def get_file_count(self) -> int:
-        """필터링된 파일 수 반환"""
-        return len(self.filtered_files)
+    def extend(self, count: int, selected: bool = True):
+        """끝에 count개 행 추가"""
+        start = self.size
+        self.size += count
+        self.bits.extend(bytes(((self.size + 7) >> 3) - len(self.bits)))
+        if selected:
+            self.set_range(start, self.size, True)
     
-    def generate_new_names(
-        self,
-        prefix: str,
-        use_sequential: bool = False,
-        start_number: int = 1,
-        digit_padding: int = 3
-    ) -> List[Tuple[str, str]]:
-        """
-        Step 3: 새로운 파일명 생성
-        Step 4: 충돌 방지 처리
-        
-        Args:
-            prefix: 접두사
-            use_sequential: 순차 번호 사용 여부
-            start_number: 시작 번호
-            digit_padding: 자릿수 패딩
-        
-        Returns:
-            [(현재이름, 새이름), ...] 리스트
-        """
-        if not self.filtered_files:
-            return []
-        
-        preview_data = []
-        used_names = set()  # 충돌 방지를 위한 사용된 이름 추적
-        
-        for idx, file in enumerate(self.filtered_files):
-            file_path = Path(file)
-            stem = file_path.stem
-            suffix = file_path.suffix
-            
-            # 기본 새 이름 생성
-            if use_sequential:
-                number = start_number + idx
-                padded_number = str(number).zfill(digit_padding)
-                new_name = f"{prefix}{padded_number}{suffix}"
-            else:
-                new_name = f"{prefix}{stem}{suffix}"
-            
-            # 충돌 처리: 이미 사용된 이름이면 증분 번호 추가
-            new_name = self._resolve_collision(new_name, used_names)
-            used_names.add(new_name)
-            
-            preview_data.append((file, new_name))
-        
-        return preview_data
+    def count(self) -> int:
+        """선택된 행 수"""
+        return sum(self.bits.translate(self._POPCOUNT))
     
-    def _resolve_collision(self, base_name: str, used_names: set) -> str:
-        """
-        파일명 충돌 해결
-        file.txt → file(1).txt → file(2).txt 형식으로 자동 증분
-        """
-        if base_name not in used_names:
-            return base_name
-        
-        # 확장자 분리
-        path = Path(base_name)
-        stem = path.stem
-        suffix = path.suffix
-        
-        # 증분 번호 찾기
-        counter = 1
-        while True:
-            new_name = f"{stem}({counter}){suffix}"
-            if new_name not in used_names:
-                return new_name
-            counter += 1
+    def mask(self) -> bytes:
+        """행마다 0/1 한 바이트씩인 마스크 (itertools.compress용)"""
+        return b''.join(map(self._EXPAND.__getitem__, self.bits))[:self.size]
+    
+    def compress(self, rows: Sequence[Any]) -> List[Any]:
+        """선택된 행만 원래 순서대로 반환"""
+        return list(compress(rows, self.mask()))
+    
+    def _clear_tail(self):
+        """행 수를 넘는 마지막 바이트의 남는 비트를 0으로 유지"""
+        tail = self.size & 7
+        if tail:
+            self.bits[-1] &= (1 << tail) - 1
+
+
+class VirtualPreviewTable:
+    """
+    화면에 보이는 행만 Treeview 항목으로 그리는 가상 목록
     
-    def rename_files(self, rename_list: List[Tuple[str, str]]) -> Tuple[int, int, List[Tuple[str, str]]]:
+    미리보기 데이터와 선택 상태(SelectionModel)는 파이썬 쪽에 두고,
+    Treeview에는 화면에 들어가는 수만큼의 항목만 만들어 스크롤할 때 값만 바꿔 쓴다.
+    스크롤바는 Treeview가 아니라 첫 번째로 보이는 행의 위치에 연결된다.
+    """
+    
+    CHECKED = '☑'
+    UNCHECKED = '☐'
+    DEFAULT_ROW_HEIGHT = 20  # 행 높이를 아직 잴 수 없을 때 사용
+    DEFAULT_HEADER_HEIGHT = 24
+    WHEEL_ROWS = 3  # 마우스 휠 한 칸당 스크롤 행 수
+    
+    def __init__(self, parent, columns: Tuple[str, ...], height: int = 12):
         """
-        Step 6: 파일 이름 변경 실행
-        
         Args:
-            rename_list: [(현재이름, 새이름), ...] 리스트
-        
-        Returns:
-            (성공 수, 실패 수, undo_stack) 튜플
-            undo_stack: [(new_full_path, original_full_path), ...] - 성공적으로 변경된 파일만 포함
+            parent: 부모 위젯
+            columns: 컬럼 이름 (첫 번째는 체크박스 컬럼)
+            height: 처음 표시할 행 수
         """
-        if not self.selected_folder:
-            return (0, 0, [])
-        
-        success_count = 0
-        error_count = 0
-        undo_stack = []
-        
-        for current_name, new_name in rename_list:
-            # 이름이 같으면 스킵
-            if current_name == new_name:
-                continue
-            
-            try:
-                old_path = os.path.join(self.selected_folder, current_name)
-                new_path = os.path.join(self.selected_folder, new_name)
-                
-                # 실제 파일 존재 확인
-                if not os.path.exists(old_path):
-                    error_count += 1
-                    continue
-                
-                os.rename(old_path, new_path)
-                success_count += 1
-                
-                # 성공한 경우에만 undo_stack에 추가
-                undo_stack.append((new_path, old_path))
-                
-            except Exception as e:
-                error_count += 1
-                print(f"Error renaming {current_name}: {str(e)}")
-        
-        return (success_count, error_count, undo_stack)
-    
-    def perform_undo(self, undo_stack: List[Tuple[str, str]]) -> Tuple[int, int]:
+        load_tkinter()
+        self.frame = ttk.Frame(parent)
+        self.tree = ttk.Treeview(self.frame, columns=columns, show='headings', height=height, selectmode='none')
+        self.scrollbar = ttk.Scrollbar(self.frame, orient=tk.VERTICAL, command=self._on_scrollbar)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        self.rows: Sequence[Tuple[str, ...]] = ()  # 전체 행 데이터
+        self.selection = SelectionModel()  # 행별 선택 여부
+        self.anchor: Optional[int] = None  # Shift 범위 선택의 기준 행
+        self.first = 0  # 첫 번째로 보이는 행 위치
+        self._blank = ('',) * len(columns)
+        self._items: List[str] = []  # 재사용하는 Treeview 항목 (위에서부터)
+        self._item_offset: Dict[str, int] = {}  # {항목 ID: 화면상 위치}
+        self._resize_items(height)
+        
+        self.tree.bind('<Configure>', self._on_configure)
+        self.tree.bind('<MouseWheel>', self._on_mousewheel)
+        self.tree.bind('<Button-4>', lambda event: self.scroll(-self.WHEEL_ROWS))
+        self.tree.bind('<Button-5>', lambda event: self.scroll(self.WHEEL_ROWS))
+        self.tree.bind('<Prior>', lambda event: self.scroll(-len(self._items)))
+        self.tree.bind('<Next>', lambda event: self.scroll(len(self._items)))
+    
+    def pack(self, **kwargs):
+        self.frame.pack(**kwargs)
+    
+    def set_rows(self, rows: Sequence[Tuple[str, ...]]):
+        """표시할 행 교체 (모든 행 선택 상태로 시작)"""
+        self.rows = rows
+        self.selection = SelectionModel(len(rows))
+        self.anchor = None
+        self.first = 0
+        self.refresh()
+    
+    def clear(self):
+        self.set_rows([])
+    
+    def visible_rows(self) -> int:
+        """화면에 보이는 행 수"""
+        return len(self._items)
+    
+    def rows_added(self, count: int):
         """
-        Undo 실행: 파일 이름을 원래대로 복원
+        set_rows에 준 시퀀스 끝에 count개 행이 추가된 것을 반영 (선택된 상태로 추가)
         
-        Args:
-            undo_stack: [(new_full_path, original_full_path), ...] 리스트
-        
-        Returns:
-            (성공 수, 실패 수) 튜플
+        새 행이 화면에 보이는 범위에 들어올 때만 다시 그리고, 아니면 스크롤바만 갱신한다.
         """
-        if not undo_stack:
-            return (0, 0)
-        
-        success_count = 0
-        error_count = 0
-        
-        # 역순으로 처리 (안전성을 위해)
-        for new_path, original_path in reversed(undo_stack):
-            try:
-                # 파일 존재 확인
-                if not os.path.exists(new_path):
-                    error_count += 1
-                    continue
-                
-                # 원래 이름으로 복원
-                os.rename(new_path, original_path)
-                success_count += 1
-                
-            except Exception as e:
-                error_count += 1
-                print(f"Error undoing {new_path}: {str(e)}")
-        
-        return (success_count, error_count)
+        start = len(self.selection)
+        self.selection.extend(count)
+        if start < self.first + len(self._items):
+            self.refresh()
+        else:
+            self._update_scrollbar()
+    
+    def index_at(self, y: int) -> Optional[int]:
+        """y 좌표에 보이는 행의 데이터 위치 (행이 없으면 None)"""
+        offset = self._item_offset.get(self.tree.identify_row(y))
+        if offset is None or self.first + offset >= len(self.rows):
+            return None
+        return self.first + offset
+    
+    def toggle(self, index: int):
+        """행 하나의 선택 상태 토글"""
+        self.selection.toggle(index)
+        self.anchor = index
+        self._render_row(index)
+    
+    def extend_to(self, index: int):
+        """기준 행부터 index까지를 기준 행과 같은 상태로 지정 (Shift+클릭)"""
+        if self.anchor is None:
+            self.toggle(index)
+            return
+        start, stop = sorted((self.anchor, index))
+        self.selection.set_range(start, stop + 1, self.selection[self.anchor])
+        self.refresh()
+    
+    def set_all(self, value: bool):
+        """모든 행 선택/해제 (보이는 행만 다시 그림)"""
+        if value:
+            self.selection.select_all()
+        else:
+            self.selection.deselect_all()
+        self.refresh()
+    
+    def invert(self):
+        """선택 반전 (보이는 행만 다시 그림)"""
+        self.selection.invert()
+        self.refresh()
+    
+    def selected_rows(self) -> List[Tuple[str, ...]]:
+        """선택된 행 목록 (원래 순서)"""
+        return self.selection.compress(self.rows)
+    
+    def scroll(self, delta: int):
+        """delta 행만큼 스크롤"""
+        self.scroll_to(self.first + delta)
+    
+    def scroll_to(self, first: int):
+        """first 행이 맨 위에 오도록 스크롤"""
+        first = max(0, min(first, len(self.rows) - len(self._items)))
+        if first != self.first:
+            self.first = first
+            self.refresh()
+    
+    def refresh(self):
+        """보이는 행 다시 그리기"""
+        total = len(self.rows)
+        self.first = max(0, min(self.first, total - len(self._items)))
+        for offset, item in enumerate(self._items):
+            index = self.first + offset
+            values = self._row_values(index) if index < total else self._blank
+            self.tree.item(item, values=values)
+        self._update_scrollbar()
+    
+    def _row_values(self, index: int) -> Tuple[str, ...]:
+        mark = self.CHECKED if self.selection[index] else self.UNCHECKED
+        return (mark,) + tuple(self.rows[index])
+    
+    def _render_row(self, index: int):
+        """보이는 행이면 해당 항목만 다시 그리기"""
+        offset = index - self.first
+        if 0 <= offset < len(self._items):
+            self.tree.item(self._items[offset], values=self._row_values(index))
+    
+    def _update_scrollbar(self):
+        total = len(self.rows)
+        visible = len(self._items)
+        if total <= visible:
+            self.scrollbar.set(0.0, 1.0)
+        else:
+            self.scrollbar.set(self.first / total, (self.first + visible) / total)
+    
+    def _resize_items(self, count: int):
+        """재사용 항목 수를 화면 행 수에 맞춤"""
+        while len(self._items) < count:
+            item = self.tree.insert('', tk.END, values=self._blank)
+            self._item_offset[item] = len(self._items)
+            self._items.append(item)
+        while len(self._items) > count:
+            item = self._items.pop()
+            del self._item_offset[item]
+            self.tree.delete(item)
+    
+    def _row_metrics(self) -> Tuple[int, int]:
+        """(헤더 높이, 행 높이) - 첫 항목의 bbox로 측정"""
+        try:
+            x, y, width, height = self.tree.bbox(self._items[0])
+            if height > 0:
+                return (y, height)
+        except (ValueError, IndexError, tk.TclError):
+            pass
+        return (self.DEFAULT_HEADER_HEIGHT, self.DEFAULT_ROW_HEIGHT)
+    
+    def _on_configure(self, event):
+        """창 크기가 바뀌면 보이는 행 수만큼 항목을 맞춤"""
+        header_height, row_height = self._row_metrics()
+        count = max(1, (event.height - header_height) // row_height)
+        if count != len(self._items):
+            self._resize_items(count)
+            self.refresh()
+    
+    def _on_mousewheel(self, event):
+        # Windows는 120 단위, macOS는 작은 정수 단위로 delta가 들어옴
+        steps = event.delta // 120 if abs(event.delta) >= 120 else event.delta
+        self.scroll(-steps * self.WHEEL_ROWS)
+    
+    def _on_scrollbar(self, action: str, amount: str, unit: Optional[str] = None):
+        """스크롤바 명령을 행 위치로 변환"""
+        if action == 'moveto':
+            self.scroll_to(int(float(amount) * len(self.rows)))
+        elif action == 'scroll':
+            step = len(self._items) if unit == 'pages' else 1
+            self.scroll(int(amount) * step)
 
 
 # ============================================================================
@@ -436,7 +570,17 @@ class RenameMode:
 class SmartFileRenamer:
     """Smart File Renamer 메인 애플리케이션"""
     
+    SCAN_POLL_INTERVAL_MS = 50  # 스캔 큐 폴링 주기
+    SCAN_MAX_MESSAGES_PER_POLL = 20  # 폴링 1회당 처리할 최대 메시지 수
+    SHIFT_MASK = 0x0001  # 이벤트 state의 Shift 키 비트
+    PREVIEW_FIRST_PAINT_MS = 50  # 첫 화면을 채울 때 쓰는 최대 시간 예산
+    PREVIEW_CHUNK_BUDGET_MS = 30  # 이후 유휴 시간마다 쓰는 시간 예산
+    PREVIEW_TIME_CHECK_ROWS = 256  # 시간 예산 확인 주기 (행 수)
+    LIVE_PREVIEW_DELAY_MS = 250  # 입력이 멈춘 뒤 실시간 미리보기를 갱신할 때까지의 지연
+    BATCH_POLL_INTERVAL_MS = 100  # 이름 변경/Undo/Redo 진행 상황 폴링 주기
+    
     def __init__(self, root):
+        load_tkinter()
         self.root = root
         self.current_language = 'KR'
         self.lang = LANGUAGES[self.current_language]
@@ -445,10 +589,25 @@ class SmartFileRenamer:
         self.rename_mode = RenameMode()
         
         # UI 상태
-        self.preview_data: List[Tuple[str, str]] = []
-        self.file_checkboxes: dict = {}  # {item_id: BooleanVar}
-        self.item_id_to_index: dict = {}  # {item_id: index} - preview_data 인덱스 매핑
-        self.undo_stack: List[Tuple[str, str]] = []  # Undo를 위한 스택
+        self.preview_data: Sequence[Tuple[str, str]] = []  # 미리보기 행 (NamePlan)
+        self.history = UndoHistory.open_default()  # 영구 Undo/Redo 기록
+        
+        # 백그라운드 스캔 상태
+        self.scan_worker: Optional[ScanWorker] = None
+        self.scan_queue: Optional[queue.Queue] = None
+        
+        # 미리보기 나눠 채우기 상태
+        self.preview_loader: Optional[Iterator[Tuple[str, str]]] = None
+        self.preview_job: Optional[str] = None  # 예약된 after_idle ID
+        self.live_preview_job: Optional[str] = None  # 예약된 실시간 미리보기 갱신 ID
+        
+        # 백그라운드 이름 변경/Undo/Redo 상태
+        self.batch_worker: Optional[BatchWorker] = None
+        self.batch_queue: Optional[queue.Queue] = None
+        self.batch_on_done: Optional[Callable[[Any], None]] = None
+        self.batch_error_key = 'rename_error'
+        self.pending_journals: List[str] = []  # 복구 여부를 아직 묻지 않은 저널 경로
+        self.recovered_folder: Optional[str] = None  # 마지막으로 복구한 폴더 (복구가 모두 끝나면 스캔)
         
         # 파일 타입 필터 변수
         self.image_var = tk.BooleanVar(value=False)
@@ -463,6 +622,10 @@ class SmartFileRenamer:
         
         # UI 구성
         self.create_widgets()
+        self._update_history_buttons()
+        
+        # 이전 실행에서 중단된 이름 변경 배치 확인
+        self.root.after(0, self.check_unfinished_journals)
     
     def get_text(self, key: str) -> str:
         """현재 언어에 맞는 텍스트 반환"""
@@ -484,6 +647,8 @@ class SmartFileRenamer:
         
         # 버튼 및 라벨 업데이트
         self.select_folder_btn.config(text=self.lang['select_folder'])
+        self.cancel_scan_btn.config(text=self.lang['cancel_scan'])
+        self.recursive_check.config(text=self.lang['include_subfolders'])
         self.folder_path_label.config(text=self.lang['folder_path'])
         self.file_count_label.config(text=self.lang['file_count'])
         self.file_type_filter_label.config(text=self.lang['file_type_filter'])
@@ -495,12 +660,19 @@ class SmartFileRenamer:
         self.sequential_check.config(text=self.lang['sequential_numbering'])
         self.start_number_label.config(text=self.lang['start_number'])
         self.digit_padding_label.config(text=self.lang['digit_padding'])
+        self.template_label.config(text=self.lang['template'])
+        self.template_hint.config(text=self.lang['template_hint'])
         self.preview_btn.config(text=self.lang['preview'])
         self.select_all_btn.config(text=self.lang['select_all'])
         self.deselect_all_btn.config(text=self.lang['deselect_all'])
+        self.invert_selection_btn.config(text=self.lang['invert_selection'])
         self.rename_selected_btn.config(text=self.lang['rename_selected'])
         self.undo_btn.config(text=self.lang['undo_last_rename'])
+        self.redo_btn.config(text=self.lang['redo_last_undo'])
         self.status_label.config(text=self.lang['status'])
+        paused = self.batch_worker is not None and self.batch_worker.control.paused
+        self.pause_btn.config(text=self.lang['resume'] if paused else self.lang['pause'])
+        self.abort_btn.config(text=self.lang['abort'])
         
         # Treeview 컬럼 헤더
         self.preview_tree.heading('selected', text='✓')
@@ -555,6 +727,23 @@ class SmartFileRenamer:
         )
         self.select_folder_btn.pack(side=tk.LEFT, padx=5)
         
+        self.cancel_scan_btn = ttk.Button(
+            button_row,
+            text=self.lang['cancel_scan'],
+            command=self.cancel_scan,
+            state=tk.DISABLED
+        )
+        self.cancel_scan_btn.pack(side=tk.LEFT, padx=5)
+        
+        self.recursive_var = tk.BooleanVar(value=False)
+        self.recursive_check = ttk.Checkbutton(
+            button_row,
+            text=self.lang['include_subfolders'],
+            variable=self.recursive_var,
+            command=self.on_recursive_toggle
+        )
+        self.recursive_check.pack(side=tk.LEFT, padx=10)
+        
         # 폴더 경로 표시
         info_row = ttk.Frame(self.folder_section)
         info_row.pack(fill=tk.X)
@@ -676,6 +865,28 @@ class SmartFileRenamer:
         self.digit_padding_entry.insert(0, "3")
         self.digit_padding_entry.pack(side=tk.LEFT, padx=5)
         
+        # 이름 템플릿 (입력하면 접두사/순차 번호 형식 대신 사용)
+        template_row = ttk.Frame(self.settings_section)
+        template_row.pack(fill=tk.X, pady=(10, 0))
+        
+        self.template_label = ttk.Label(template_row, text=self.lang['template'] + ":")
+        self.template_label.pack(side=tk.LEFT, padx=5)
+        
+        self.template_entry = ttk.Entry(template_row, width=40)
+        self.template_entry.pack(side=tk.LEFT, padx=5)
+        
+        self.template_hint = ttk.Label(
+            template_row,
+            text=self.lang['template_hint'],
+            foreground="gray",
+            font=('TkDefaultFont', 9)
+        )
+        self.template_hint.pack(side=tk.LEFT, padx=5)
+        
+        # 입력할 때마다 미리보기 갱신 (입력이 멈출 때까지 지연)
+        for entry in (self.prefix_entry, self.start_number_entry, self.digit_padding_entry, self.template_entry):
+            entry.bind('<KeyRelease>', self.on_settings_change)
+        
         # 초기 상태: 순차 번호 비활성화
         self._toggle_sequential_controls(False)
         
@@ -708,6 +919,14 @@ class SmartFileRenamer:
         )
         self.undo_btn.pack(side=tk.LEFT, padx=5)
         
+        self.redo_btn = ttk.Button(
+            action_frame,
+            text=self.lang['redo_last_undo'],
+            command=self.perform_redo_operation,
+            state=tk.DISABLED
+        )
+        self.redo_btn.pack(side=tk.LEFT, padx=5)
+        
         # ====================================================================
         # 6. 미리보기 섹션
         # ====================================================================
@@ -732,17 +951,20 @@ class SmartFileRenamer:
         )
         self.deselect_all_btn.pack(side=tk.LEFT, padx=5)
         
-        # Treeview 및 스크롤바
-        tree_frame = ttk.Frame(self.preview_section)
-        tree_frame.pack(fill=tk.BOTH, expand=True)
+        self.invert_selection_btn = ttk.Button(
+            select_buttons_row,
+            text=self.lang['invert_selection'],
+            command=self.invert_selection
+        )
+        self.invert_selection_btn.pack(side=tk.LEFT, padx=5)
         
-        # 체크박스를 위한 컬럼 추가
-        self.preview_tree = ttk.Treeview(
-            tree_frame,
+        # 가상 미리보기 테이블 (보이는 행만 Treeview 항목으로 그림, 체크박스 컬럼 포함)
+        self.preview_table = VirtualPreviewTable(
+            self.preview_section,
             columns=('selected', 'current_name', 'new_name'),
-            show='headings',
             height=12
         )
+        self.preview_tree = self.preview_table.tree
         
         self.preview_tree.heading('selected', text='✓')
         self.preview_tree.heading('current_name', text=self.lang['current_name'])
@@ -751,11 +973,7 @@ class SmartFileRenamer:
         self.preview_tree.column('current_name', width=300, anchor=tk.W)
         self.preview_tree.column('new_name', width=300, anchor=tk.W)
         
-        scrollbar = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL, command=self.preview_tree.yview)
-        self.preview_tree.configure(yscrollcommand=scrollbar.set)
-        
-        self.preview_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.preview_table.pack(fill=tk.BOTH, expand=True)
         
         # 체크박스 클릭 이벤트 바인딩
         self.preview_tree.bind('<Button-1>', self.on_tree_click)
@@ -776,6 +994,27 @@ class SmartFileRenamer:
             font=('TkDefaultFont', 9)
         )
         self.status_value.pack(side=tk.LEFT, padx=5, fill=tk.X, expand=True)
+        
+        # 미리보기 채우기 진행률
+        self.preview_progress = ttk.Progressbar(status_frame, mode='determinate', length=160)
+        self.preview_progress.pack(side=tk.RIGHT, padx=5)
+        
+        # 이름 변경/Undo/Redo 실행 중에만 활성화
+        self.abort_btn = ttk.Button(
+            status_frame,
+            text=self.lang['abort'],
+            command=self.abort_batch,
+            state=tk.DISABLED
+        )
+        self.abort_btn.pack(side=tk.RIGHT, padx=5)
+        
+        self.pause_btn = ttk.Button(
+            status_frame,
+            text=self.lang['pause'],
+            command=self.toggle_batch_pause,
+            state=tk.DISABLED
+        )
+        self.pause_btn.pack(side=tk.RIGHT, padx=5)
     
     def _toggle_sequential_controls(self, enabled: bool):
         """순차 번호 관련 컨트롤 활성화/비활성화"""
@@ -789,6 +1028,46 @@ class SmartFileRenamer:
         """순차 번호 체크박스 토글 이벤트"""
         enabled = self.sequential_var.get()
         self._toggle_sequential_controls(enabled)
+        self.on_settings_change()
+    
+    def on_settings_change(self, event=None):
+        """이름 변경 설정 입력 이벤트 - 입력이 LIVE_PREVIEW_DELAY_MS 동안 멈추면 미리보기 갱신"""
+        if self.live_preview_job is not None:
+            self.root.after_cancel(self.live_preview_job)
+        self.live_preview_job = self.root.after(self.LIVE_PREVIEW_DELAY_MS, self.update_live_preview)
+    
+    def update_live_preview(self):
+        """
+        실시간 미리보기 갱신
+        
+        접두사만 바뀌었고 현재 계획이 완성되어 있으면 충돌 후보만 다시 계산하고 보이는 행만
+        다시 그린다 (선택 상태 유지). 그 외의 변경은 미리보기를 새로 생성한다.
+        입력 중에는 경고 창 대신 상태 표시줄에만 알린다.
+        """
+        self.live_preview_job = None
+        if not self.rename_mode.selected_folder or self.scan_worker is not None or self.batch_worker is not None:
+            return
+        
+        settings = self._read_preview_settings(show_warnings=False)
+        if settings is None:
+            self.clear_preview()
+            return
+        
+        prefix, use_sequential, start_number, digit_padding, template = settings
+        plan = self.preview_data
+        if isinstance(plan, NamePlan) and plan.matches(
+            self.rename_mode.filtered_files, use_sequential, start_number, digit_padding, template
+        ):
+            if prefix == plan.prefix:
+                return
+            if plan.can_update_prefix(prefix):
+                plan.set_prefix(prefix)
+                self.preview_table.refresh()
+                status_msg = f"{self.get_text('preview_complete')}: {len(plan)} {self.get_text('file_count').lower()}"
+                self._update_status(status_msg)
+                return
+        
+        self._start_preview_load(prefix, use_sequential, start_number, digit_padding, template)
     
     def on_language_change(self):
         """언어 변경 이벤트 핸들러"""
@@ -797,19 +1076,105 @@ class SmartFileRenamer:
     
     def on_file_type_filter_change(self):
         """파일 타입 필터 변경 이벤트 핸들러"""
-        if self.rename_mode.selected_folder:
+        # 스캔 중에는 완료 시점에 파일 수가 갱신됨 (이름 변경 중에는 완료 후 갱신)
+        if self.rename_mode.selected_folder and self.scan_worker is None and self.batch_worker is None:
             self._update_file_count()
             self.clear_preview()
     
+    def on_recursive_toggle(self):
+        """하위 폴더 포함 체크박스 토글 이벤트 - 선택된 폴더 다시 스캔"""
+        self.rename_mode.set_recursive(self.recursive_var.get())
+        if self.rename_mode.selected_folder:
+            self._start_background_scan(self.rename_mode.selected_folder)
+    
     def select_folder(self):
-        """폴더 선택"""
+        """폴더 선택 - 백그라운드 스캔 시작"""
         folder = filedialog.askdirectory(title=self.get_text('select_folder'))
         if folder:
-            self.rename_mode.set_folder(folder)
-            self.folder_path_value.config(text=folder, foreground="black")
-            self._update_file_count()
-            self._update_status(self.get_text('folder_selected'))
-            self.clear_preview()
+            self._start_background_scan(folder)
+    
+    def _start_background_scan(self, folder: str):
+        """백그라운드 스캔 시작"""
+        # 진행 중인 스캔이 있으면 중단
+        self._stop_scan_worker()
+        
+        scanner = self.rename_mode.start_scan(folder)
+        self.folder_path_value.config(text=folder, foreground="black")
+        self.file_count_value.config(text="0")
+        self.clear_preview()
+        
+        self.scan_queue = queue.Queue()
+        self.scan_worker = ScanWorker(scanner, self.scan_queue)
+        self._set_scanning_state(True)
+        self._update_status(self.get_text('scanning'))
+        self.scan_worker.start()
+        self.root.after(self.SCAN_POLL_INTERVAL_MS, self._poll_scan_queue)
+    
+    def _poll_scan_queue(self):
+        """스캔 큐 폴링 - 발견된 파일을 반영하고 파일 수를 실시간 갱신"""
+        worker = self.scan_worker
+        if worker is None or self.scan_queue is None:
+            return
+        
+        for _ in range(self.SCAN_MAX_MESSAGES_PER_POLL):
+            try:
+                kind, payload = self.scan_queue.get_nowait()
+            except queue.Empty:
+                break
+            
+            if kind == 'chunk':
+                self.rename_mode.add_scanned_chunk(payload)
+            elif kind == 'done':
+                self.rename_mode.finish_scan(payload)
+                self._finish_scan_worker()
+                self._update_file_count()
+                self._update_status(self.get_text('folder_selected'))
+                return
+            elif kind == 'error':
+                self.rename_mode.clear_files()
+                self._finish_scan_worker()
+                self._update_file_count()
+                self._update_status(f"{self.get_text('error')} {payload}")
+                return
+            elif kind == 'cancelled':
+                self._finish_scan_worker()
+                return
+        
+        # 스캔 중에는 발견된 전체 파일 수 표시
+        self.file_count_value.config(text=str(len(self.rename_mode.scanned_names)))
+        self.root.after(self.SCAN_POLL_INTERVAL_MS, self._poll_scan_queue)
+    
+    def cancel_scan(self):
+        """진행 중인 폴더 스캔 취소"""
+        if self.scan_worker is None:
+            return
+        
+        self._stop_scan_worker()
+        self.rename_mode.selected_folder = None
+        self.rename_mode.clear_files()
+        self.folder_path_value.config(text="")
+        self.file_count_value.config(text="0")
+        self._update_status(self.get_text('scan_cancelled'))
+    
+    def _stop_scan_worker(self):
+        """스캔 작업자에 중단 요청 후 남은 메시지 무시"""
+        if self.scan_worker is not None:
+            self.scan_worker.cancel()
+            self._finish_scan_worker()
+    
+    def _finish_scan_worker(self):
+        """스캔 작업자 정리 및 버튼 상태 복원"""
+        self.scan_worker = None
+        self.scan_queue = None
+        self._set_scanning_state(False)
+    
+    def _set_scanning_state(self, scanning: bool):
+        """스캔 중에는 미리보기/변경/Undo/Redo 버튼 비활성화 (스캔 결과를 합치는 동안 파일 목록을 바꾸지 않도록)"""
+        self.preview_btn.config(state=tk.DISABLED if scanning else tk.NORMAL)
+        self.cancel_scan_btn.config(state=tk.NORMAL if scanning else tk.DISABLED)
+        if scanning:
+            self.rename_selected_btn.config(state=tk.DISABLED)
+        self._update_history_buttons()
     
     def _update_file_count(self):
         """필터링된 파일 수 업데이트"""
@@ -817,6 +1182,10 @@ class SmartFileRenamer:
         selected_types = self._get_selected_file_types()
         self.rename_mode.apply_file_type_filter(selected_types)
         
+        self._refresh_file_count_label()
+    
+    def _refresh_file_count_label(self):
+        """현재 필터링된 파일 수 표시"""
         count = self.rename_mode.get_file_count()
         self.file_count_value.config(text=str(count))
     
@@ -838,55 +1207,66 @@ class SmartFileRenamer:
         self.status_value.config(text=message, foreground="black")
     
     def clear_preview(self):
-        """미리보기 초기화"""
-        for item in self.preview_tree.get_children():
-            self.preview_tree.delete(item)
+        """미리보기 초기화 (진행 중인 미리보기 채우기와 예약된 실시간 갱신 취소)"""
+        self._cancel_preview_load()
+        if self.live_preview_job is not None:
+            self.root.after_cancel(self.live_preview_job)
+            self.live_preview_job = None
+        self.preview_table.clear()
         self.preview_data = []
-        self.file_checkboxes.clear()
-        self.item_id_to_index.clear()
         self.rename_selected_btn.config(state=tk.DISABLED)
     
     def generate_preview(self):
         """미리보기 생성"""
+        if self.batch_worker is not None:
+            return
+        settings = self._read_preview_settings()
+        if settings is None:
+            return
+        self._start_preview_load(*settings)
+    
+    def _read_preview_settings(self, show_warnings: bool = True) -> Optional[Tuple[str, bool, int, int, Optional[str]]]:
+        """
+        미리보기 입력 검증 및 설정 읽기
+        
+        Args:
+            show_warnings: 검증 실패 시 경고 창 표시 여부 (False면 상태 표시줄에만 표시)
+        
+        Returns:
+            (접두사, 순차 번호 사용 여부, 시작 번호, 자릿수 패딩, 템플릿), 검증 실패 시 None
+        """
         # 입력 검증
         if not self.rename_mode.selected_folder:
-            messagebox.showwarning(
-                self.get_text('title'),
-                self.get_text('no_folder_selected')
-            )
-            self._update_status(self.get_text('warning_no_folder'))
-            return
+            self._warn_invalid_settings('no_folder_selected', 'warning_no_folder', show_warnings)
+            return None
         
         # 파일 타입 필터 검증
         selected_types = self._get_selected_file_types()
         if not selected_types:
-            messagebox.showwarning(
-                self.get_text('title'),
-                self.get_text('no_file_type_selected')
-            )
-            self._update_status(self.get_text('warning_no_file_type'))
-            return
+            self._warn_invalid_settings('no_file_type_selected', 'warning_no_file_type', show_warnings)
+            return None
         
         # 파일 타입 필터 적용
         self.rename_mode.apply_file_type_filter(selected_types)
         
-        file_count = self.rename_mode.get_file_count()
-        if file_count == 0:
-            messagebox.showwarning(
-                self.get_text('title'),
-                self.get_text('no_files')
-            )
-            self._update_status(self.get_text('warning_no_files'))
-            return
+        if self.rename_mode.get_file_count() == 0:
+            self._warn_invalid_settings('no_files', 'warning_no_files', show_warnings)
+            return None
+        
+        # 템플릿 검증 (접두사는 템플릿이 없거나 {prefix}를 쓸 때만 필요)
+        template = self.template_entry.get().strip() or None
+        uses_prefix = True
+        if template is not None:
+            try:
+                uses_prefix = 'prefix' in RenameTemplate(template).tokens
+            except ValueError as e:
+                self._warn_invalid_settings('invalid_template', 'warning_invalid_template', show_warnings, str(e))
+                return None
         
         prefix = self.prefix_entry.get().strip()
-        if not prefix:
-            messagebox.showwarning(
-                self.get_text('title'),
-                self.get_text('no_prefix_enter')
-            )
-            self._update_status(self.get_text('warning_no_prefix'))
-            return
+        if not prefix and uses_prefix:
+            self._warn_invalid_settings('no_prefix_enter', 'warning_no_prefix', show_warnings)
+            return None
         
         # 순차 번호 설정 읽기
         use_sequential = self.sequential_var.get()
@@ -908,45 +1288,111 @@ class SmartFileRenamer:
             except ValueError:
                 digit_padding = 3
         
-        # 미리보기 생성
+        return (prefix, use_sequential, start_number, digit_padding, template)
+    
+    def _warn_invalid_settings(self, message_key: str, status_key: str, show_warnings: bool, detail: str = ""):
+        """입력 검증 실패 알림 (detail은 메시지 뒤에 덧붙임)"""
+        message = self.get_text(message_key)
+        status = self.get_text(status_key)
+        if detail:
+            message = f"{message}: {detail}"
+            status = f"{status} ({detail})"
+        if show_warnings:
+            messagebox.showwarning(self.get_text('title'), message)
+        self._update_status(status)
+    
+    def _start_preview_load(
+        self,
+        prefix: str,
+        use_sequential: bool,
+        start_number: int,
+        digit_padding: int,
+        template: Optional[str] = None
+    ):
+        """새 이름 계획을 만들고 미리보기 채우기 시작 (진행 중인 채우기는 취소)"""
+        self.clear_preview()
+        plan = self.rename_mode.create_name_plan(
+            prefix=prefix,
+            use_sequential=use_sequential,
+            start_number=start_number,
+            digit_padding=digit_padding,
+            template=template
+        )
+        self.preview_loader = plan.iter_build()
+        
+        # 가상 테이블에 표시 (기본값: 모두 선택됨, 보이는 행만 그림)
+        self.preview_data = plan
+        self.preview_table.set_rows(plan)
+        self.preview_progress.config(maximum=len(plan.files), value=0)
+        
+        # 첫 화면(보이는 행 수)만 바로 채우고 나머지는 유휴 시간에 나눠 채움
+        self._load_preview_chunk(self.PREVIEW_FIRST_PAINT_MS, self.preview_table.visible_rows())
+    
+    def _load_preview_chunk(self, budget_ms: float, max_rows: Optional[int] = None):
+        """
+        시간 예산 안에서 미리보기 행을 생성해 추가하고, 남았으면 다음 유휴 시간에 계속
+        
+        Args:
+            budget_ms: 이번 호출의 시간 예산
+            max_rows: 이번 호출에서 생성할 최대 행 수 (None: 제한 없음)
+        """
+        self.preview_job = None
+        loader = self.preview_loader
+        if loader is None:
+            return
+        
+        deadline = time.perf_counter() + budget_ms / 1000.0
+        check_mask = self.PREVIEW_TIME_CHECK_ROWS - 1
+        count = 0
+        finished = True
         try:
-            self.clear_preview()
-            self.preview_data = self.rename_mode.generate_new_names(
-                prefix=prefix,
-                use_sequential=use_sequential,
-                start_number=start_number,
-                digit_padding=digit_padding
-            )
-            
-            # Treeview에 표시 (체크박스 포함)
-            self.item_id_to_index.clear()
-            for idx, (current_name, new_name) in enumerate(self.preview_data):
-                # 체크박스 변수 생성
-                var = tk.BooleanVar(value=True)  # 기본값: 선택됨
-                item_id = self.preview_tree.insert(
-                    '', tk.END,
-                    values=('☑', current_name, new_name)
-                )
-                self.file_checkboxes[item_id] = var
-                self.item_id_to_index[item_id] = idx
-            
-            # Rename Selected 버튼 활성화
-            self.rename_selected_btn.config(state=tk.NORMAL)
-            
-            status_msg = f"{self.get_text('preview_complete')}: {len(self.preview_data)} {self.get_text('file_count').lower()}"
-            self._update_status(status_msg)
-            
+            for _ in loader:
+                count += 1
+                if count == max_rows or (
+                    count & check_mask == 0 and time.perf_counter() >= deadline
+                ):
+                    finished = False
+                    break
         except Exception as e:
+            self.clear_preview()
             messagebox.showerror(
                 self.get_text('title'),
                 f"{self.get_text('rename_error')}: {str(e)}"
             )
             self._update_status(f"{self.get_text('error')} {str(e)}")
+            return
+        
+        self.preview_table.rows_added(count)
+        loaded = len(self.preview_data)
+        self.preview_progress.config(value=loaded)
+        
+        if not finished:
+            self._update_status(f"{self.get_text('preview_loading')} {loaded} / {self.preview_progress.cget('maximum')}")
+            self.preview_job = self.root.after_idle(self._load_preview_chunk, self.PREVIEW_CHUNK_BUDGET_MS)
+            return
+        
+        # 계획이 완성된 뒤에만 Rename Selected 버튼 활성화
+        self.preview_loader = None
+        self.rename_selected_btn.config(state=tk.NORMAL)
+        
+        status_msg = f"{self.get_text('preview_complete')}: {loaded} {self.get_text('file_count').lower()}"
+        self._update_status(status_msg)
+    
+    def _cancel_preview_load(self):
+        """진행 중인 미리보기 채우기 취소"""
+        if self.preview_job is not None:
+            self.root.after_cancel(self.preview_job)
+            self.preview_job = None
+        if self.preview_loader is not None:
+            self.preview_loader.close()
+            self.preview_loader = None
+        self.preview_progress.config(value=0)
     
     def on_tree_click(self, event):
         """Treeview 클릭 이벤트 - 체크박스 토글"""
         item = self.preview_tree.identify_row(event.y)
-        if not item:
+        index = self.preview_table.index_at(event.y)
+        if index is None:
             return
         
         region = self.preview_tree.identify_region(event.x, event.y)
@@ -982,49 +1428,33 @@ class SmartFileRenamer:
                     pass
         
         if is_first_column:
-            var = self.file_checkboxes.get(item)
-            if var:
-                # 체크 상태 토글
-                new_value = not var.get()
-                var.set(new_value)
-                self._update_checkbox_display(item)
-                return 'break'  # 기본 선택 동작 방지
-    
-    def _update_checkbox_display(self, item_id):
-        """체크박스 표시 업데이트"""
-        var = self.file_checkboxes.get(item_id)
-        if var:
-            checkmark = '☑' if var.get() else '☐'
-            current_values = list(self.preview_tree.item(item_id, 'values'))
-            if len(current_values) >= 2:
-                current_values[0] = checkmark
-                self.preview_tree.item(item_id, values=tuple(current_values))
+            if event.state & self.SHIFT_MASK:
+                # Shift+클릭: 마지막으로 클릭한 행부터 범위 지정
+                self.preview_table.extend_to(index)
+            else:
+                # 체크 상태 토글 (해당 행만 다시 그림)
+                self.preview_table.toggle(index)
+            return 'break'  # 기본 선택 동작 방지
     
     def select_all_files(self):
         """모든 파일 선택"""
-        for item_id, var in self.file_checkboxes.items():
-            var.set(True)
-            self._update_checkbox_display(item_id)
+        self.preview_table.set_all(True)
     
     def deselect_all_files(self):
         """모든 파일 선택 해제"""
-        for item_id, var in self.file_checkboxes.items():
-            var.set(False)
-            self._update_checkbox_display(item_id)
+        self.preview_table.set_all(False)
+    
+    def invert_selection(self):
+        """선택 반전"""
+        self.preview_table.invert()
     
     def rename_selected_files(self):
-        """선택된 파일만 이름 변경"""
-        if not self.preview_data:
+        """선택된 파일만 이름 변경 (백그라운드 실행)"""
+        if not self.preview_data or self.batch_worker is not None:
             return
         
         # 선택된 파일만 필터링
-        selected_files = []
-        for item_id, var in self.file_checkboxes.items():
-            if var and var.get():
-                idx = self.item_id_to_index.get(item_id)
-                if idx is not None and idx < len(self.preview_data):
-                    current_name, new_name = self.preview_data[idx]
-                    selected_files.append((current_name, new_name))
+        selected_files = self.preview_table.selected_rows()
         
         if not selected_files:
             messagebox.showwarning(
@@ -1034,55 +1464,279 @@ class SmartFileRenamer:
             self._update_status(self.get_text('warning_no_selection'))
             return
         
+        # 일부만 선택했으면 선택 해제한 파일의 현재 이름을 피해 새 이름 다시 확인
+        message = f"{self.get_text('confirm_rename')} ({len(selected_files)} {self.get_text('file_count').lower()})"
+        if len(selected_files) < len(self.preview_data):
+            selected_files, changed = self.rename_mode.replan_subset(selected_files)
+            if changed:
+                message += f"\n\n{changed} {self.get_text('names_adjusted')}"
+        
         # 확인 팝업
-        result = messagebox.askyesno(
-            self.get_text('title'),
-            f"{self.get_text('confirm_rename')} ({len(selected_files)} {self.get_text('file_count').lower()})"
-        )
+        result = messagebox.askyesno(self.get_text('title'), message)
         
         if not result:
             return
         
         # 파일 이름 변경 실행
-        try:
-            success_count, error_count, undo_stack = self.rename_mode.rename_files(selected_files)
-            
-            # 결과 메시지
-            if error_count == 0:
-                message = f"{self.get_text('rename_success')} ({success_count} {self.get_text('files_renamed')})"
-                messagebox.showinfo(self.get_text('title'), message)
-                self._update_status(f"{self.get_text('success_renamed')} {success_count} {self.get_text('files_renamed')}")
-            else:
-                message = f"{success_count} {self.get_text('files_renamed')} {error_count} errors occurred."
-                messagebox.showwarning(self.get_text('title'), message)
-                self._update_status(f"{self.get_text('partial_success')} {success_count} renamed, {error_count} errors")
-            
-            # Undo 스택 업데이트 (성공한 파일이 있는 경우에만)
-            if success_count > 0:
-                self.undo_stack = undo_stack
-                self.undo_btn.config(state=tk.NORMAL)
-            else:
-                self.undo_stack = []
-                self.undo_btn.config(state=tk.DISABLED)
+        self._start_batch(
+            lambda: self.rename_mode.rename_files(selected_files),
+            len(selected_files),
+            self._finish_rename,
+            'rename_error'
+        )
+    
+    def _finish_rename(self, result: Tuple[int, int, List[Tuple[str, str]]]):
+        """이름 변경 완료 처리 (중단된 경우 실행된 부분만 Undo 기록)"""
+        success_count, error_count, undo_stack = result
+        
+        # 결과 메시지
+        if error_count == 0 and not self.rename_mode.interrupted:
+            message = f"{self.get_text('rename_success')} ({success_count} {self.get_text('files_renamed')})"
+            messagebox.showinfo(self.get_text('title'), message)
+            self._update_status(f"{self.get_text('success_renamed')} {success_count} {self.get_text('files_renamed')}")
+        else:
+            message = f"{success_count} {self.get_text('files_renamed')} {error_count} errors occurred."
+            message += self._format_error_details() + self._format_aborted_note()
+            messagebox.showwarning(self.get_text('title'), message)
+            self._update_status(f"{self.get_text('partial_success')} {success_count} renamed, {error_count} errors")
+        
+        # Undo 기록 추가 (성공한 파일이 있는 경우에만)
+        if success_count > 0:
+            self.history.record_batch(self.rename_mode.selected_folder, undo_stack, self.rename_mode.recursive)
+        self._update_history_buttons()
+        
+        # 미리보기 초기화 및 파일 목록 갱신 (변경된 이름만 반영)
+        self.clear_preview()
+        self._refresh_after_batch()
+        self.prefix_entry.delete(0, tk.END)
+    
+    def _refresh_after_batch(self):
+        """작업 후 파일 목록 갱신 (외부 변경이 있었으면 UI가 멈추지 않도록 백그라운드로 다시 스캔)"""
+        if self.rename_mode.refresh_after_batch():
+            self._start_background_scan(self.rename_mode.selected_folder)
+        else:
+            self._refresh_file_count_label()
+    
+    def _start_batch(self, run: Callable[[], Any], total: int, on_done: Callable[[Any], None], error_key: str):
+        """
+        이름 변경/Undo/Redo를 백그라운드 작업자로 실행
+        
+        실행 중에는 다른 작업 버튼을 막고 일시정지/중단 버튼을 활성화한다. 진행 상황은
+        BATCH_POLL_INTERVAL_MS마다 큐에서 읽어 상태 표시줄과 진행률에 반영한다.
+        
+        Args:
+            run: 작업자 스레드에서 실행할 RenameMode 작업
+            total: 전체 처리 수 (진행률 최댓값)
+            on_done: 완료 시 run의 반환값으로 UI 스레드에서 호출
+            error_key: 예외 발생 시 표시할 메시지 키
+        """
+        def task(control: BatchControl):
+            with self.rename_mode.controlled(control):
+                return run()
+        
+        self._cancel_preview_load()
+        self.batch_queue = queue.Queue()
+        self.batch_worker = BatchWorker(task, self.batch_queue, total)
+        self.batch_on_done = on_done
+        self.batch_error_key = error_key
+        self._set_batch_state(True)
+        self.preview_progress.config(maximum=max(total, 1), value=0)
+        self._update_status(f"{self.get_text('batch_progress')} 0 / {total}")
+        self.batch_worker.start()
+        self.root.after(self.BATCH_POLL_INTERVAL_MS, self._poll_batch_queue)
+    
+    def _poll_batch_queue(self):
+        """작업자 큐 폴링 - 마지막 진행 상황만 표시하고 완료되면 결과 처리"""
+        if self.batch_worker is None or self.batch_queue is None:
+            return
+        
+        progress = None
+        while True:
+            try:
+                kind, payload = self.batch_queue.get_nowait()
+            except queue.Empty:
+                break
             
-            # 미리보기 초기화 및 파일 수 업데이트
-            self.clear_preview()
-            self.rename_mode._scan_files()
-            self._update_file_count()
-            self.prefix_entry.delete(0, tk.END)
+            if kind == 'progress':
+                progress = payload
+            elif kind == 'done':
+                on_done = self.batch_on_done
+                self._finish_batch_worker()
+                on_done(payload)
+                return
+            elif kind == 'error':
+                error_key = self.batch_error_key
+                self._finish_batch_worker()
+                messagebox.showerror(self.get_text('title'), f"{self.get_text(error_key)}: {str(payload)}")
+                self._update_status(f"{self.get_text('error')} {str(payload)}")
+                return
+        
+        if progress is not None:
+            self._show_batch_progress(progress)
+        self.root.after(self.BATCH_POLL_INTERVAL_MS, self._poll_batch_queue)
+    
+    def _show_batch_progress(self, progress: Dict[str, Any]):
+        """진행 상황 (처리 수, 실패 수, 처리 속도, 남은 시간, 현재 파일) 표시"""
+        processed = progress['done'] + progress['failed']
+        self.preview_progress.config(value=processed)
+        
+        parts = [f"{self.get_text('batch_progress')} {processed} / {progress['total']}"]
+        if progress['failed']:
+            parts.append(f"{self.get_text('batch_failed')} {progress['failed']}")
+        if progress['paused']:
+            parts.append(self.get_text('batch_paused'))
+        else:
+            parts.append(f"{progress['rate']:.0f}/s")
+            if progress['eta'] is not None:
+                parts.append(f"{self.get_text('batch_eta')} {int(progress['eta'] + 0.5)}s")
+        if progress['current']:
+            parts.append(progress['current'])
+        self._update_status(" · ".join(parts))
+    
+    def toggle_batch_pause(self):
+        """실행 중인 작업 일시정지/계속"""
+        if self.batch_worker is None:
+            return
+        control = self.batch_worker.control
+        if control.paused:
+            control.resume()
+            self.pause_btn.config(text=self.get_text('pause'))
+        else:
+            control.pause()
+            self.pause_btn.config(text=self.get_text('resume'))
+        self._show_batch_progress(control.snapshot())
+    
+    def abort_batch(self):
+        """실행 중인 작업 중단 (실행 중인 연쇄가 끝나면 멈춤)"""
+        if self.batch_worker is None:
+            return
+        self.batch_worker.control.abort()
+        self.pause_btn.config(text=self.get_text('pause'), state=tk.DISABLED)
+        self.abort_btn.config(state=tk.DISABLED)
+    
+    def _finish_batch_worker(self):
+        """작업자 정리 및 버튼 상태 복원"""
+        self.batch_worker = None
+        self.batch_queue = None
+        self.batch_on_done = None
+        self._set_batch_state(False)
+        self.preview_progress.config(value=0)
+    
+    def _set_batch_state(self, running: bool):
+        """실행 중에는 폴더 선택/미리보기/변경/Undo/Redo 버튼 비활성화"""
+        state = tk.DISABLED if running else tk.NORMAL
+        self.select_folder_btn.config(state=state)
+        self.recursive_check.config(state=state)
+        self.preview_btn.config(state=state)
+        self.pause_btn.config(text=self.get_text('pause'), state=tk.NORMAL if running else tk.DISABLED)
+        self.abort_btn.config(state=tk.NORMAL if running else tk.DISABLED)
+        if running:
+            self.rename_selected_btn.config(state=tk.DISABLED)
+            self.undo_btn.config(state=tk.DISABLED)
+            self.redo_btn.config(state=tk.DISABLED)
+        else:
+            if self.preview_data:
+                self.rename_selected_btn.config(state=tk.NORMAL)
+            self._update_history_buttons()
+    
+    def _format_aborted_note(self) -> str:
+        """마지막 작업이 중단되었으면 안내 문자열 (건너뛴 파일 수 포함)"""
+        if not self.rename_mode.interrupted:
+            return ""
+        note = f"\n\n{self.get_text('batch_aborted')}"
+        if self.rename_mode.skipped_count:
+            note += f" ({self.rename_mode.skipped_count} {self.get_text('files_skipped')})"
+        return note
+    
+    def _format_error_details(self, max_files: int = 5) -> str:
+        """마지막 작업의 오류 코드별 집계와 일부 파일 목록 문자열"""
+        errors = self.rename_mode.last_rename_errors
+        if not errors:
+            return ""
+        summary = ", ".join(f"{code} {count}" for code, count in self.rename_mode.summarize_errors().items())
+        lines = [f"{current_name} → {new_name}: {code}" for current_name, new_name, code in errors[:max_files]]
+        if len(errors) > max_files:
+            lines.append("...")
+        return f"\n\n{self.get_text('error_details')}: {summary}\n" + "\n".join(lines)
+    
+    def check_unfinished_journals(self):
+        """중단된 배치 저널이 있으면 하나씩 이어서 실행/되돌리기 선택"""
+        journal_dir = self.rename_mode.journal_dir
+        if not journal_dir:
+            return
+        self.pending_journals = list(RenameJournal.find_unfinished(journal_dir))
+        self._recover_next_journal()
+    
+    def _recover_next_journal(self):
+        """다음 저널의 복구 방법을 묻고 백그라운드로 복구 (남은 저널이 없으면 마지막 폴더를 스캔)"""
+        while self.pending_journals:
+            path = self.pending_journals.pop(0)
+            try:
+                journal = RenameJournal.load(path)
+            except (OSError, ValueError) as e:
+                self._update_status(f"{self.get_text('error')} {str(e)}")
+                continue
             
-        except Exception as e:
-            messagebox.showerror(
+            planned = sum(len(chain) for chain in journal.chains)
+            answer = messagebox.askyesnocancel(
                 self.get_text('title'),
-                f"{self.get_text('rename_error')}: {str(e)}"
+                f"{self.get_text('journal_found')}\n{journal.folder}\n"
+                f"({len(journal.done_ops)} / {planned})\n\n{self.get_text('journal_choice')}"
             )
-            self._update_status(f"{self.get_text('error')} {str(e)}")
-            self.undo_stack = []
-            self.undo_btn.config(state=tk.DISABLED)
+            if answer is None:
+                continue
+            
+            # 이어서 실행하면 남은 작업, 되돌리면 실행된 작업이 진행률 기준
+            total = planned - len(journal.done_ops) if answer else len(journal.done_ops)
+            self._start_batch(
+                lambda: self.rename_mode.recover_journal(journal, resume=answer),
+                total,
+                lambda result: self._finish_journal_recovery(journal, answer, result),
+                'rename_error'
+            )
+            return
+        
+        if self.recovered_folder is not None:
+            folder, self.recovered_folder = self.recovered_folder, None
+            self.recursive_var.set(self.rename_mode.recursive)
+            self._start_background_scan(folder)
+    
+    def _finish_journal_recovery(
+        self,
+        journal: RenameJournal,
+        resume: bool,
+        result: Tuple[int, int, List[Tuple[str, str]]]
+    ):
+        """저널 복구 완료 처리 후 다음 저널로 진행"""
+        success_count, error_count, undo_stack = result
+        
+        done_text = self.get_text('files_renamed') if resume else self.get_text('files_restored')
+        message = f"{self.get_text('journal_recovered')} ({success_count} {done_text})"
+        if error_count:
+            message += f" {error_count} errors occurred." + self._format_error_details()
+        message += self._format_aborted_note()
+        messagebox.showinfo(self.get_text('title'), message)
+        
+        if undo_stack:
+            self.history.record_batch(journal.folder, undo_stack, journal.recursive)
+        self._update_history_buttons()
+        self.recovered_folder = journal.folder
+        self._recover_next_journal()
+    
+    def _update_history_buttons(self):
+        """Undo/Redo 기록 유무에 따라 버튼 상태 갱신 (스캔/작업 중에는 비활성화)"""
+        busy = self.scan_worker is not None or self.batch_worker is not None
+        has_undo = not busy and self.history.latest(UndoHistory.STATE_DONE) is not None
+        has_redo = not busy and self.history.next_redo() is not None
+        self.undo_btn.config(state=tk.NORMAL if has_undo else tk.DISABLED)
+        self.redo_btn.config(state=tk.NORMAL if has_redo else tk.DISABLED)
     
     def perform_undo_operation(self):
-        """Undo 작업 실행"""
-        if not self.undo_stack:
+        """Undo 작업 실행 (가장 최근에 적용된 배치, 백그라운드 실행)"""
+        if self.batch_worker is not None or self.scan_worker is not None:
+            return
+        batch = self.history.latest(UndoHistory.STATE_DONE)
+        if batch is None:
             messagebox.showwarning(
                 self.get_text('title'),
                 self.get_text('no_undo_available')
@@ -1100,46 +1754,405 @@ class SmartFileRenamer:
             return
         
         # Undo 실행
-        try:
-            success_count, error_count = self.rename_mode.perform_undo(self.undo_stack)
-            
-            # 결과 메시지
-            if error_count == 0:
-                message = f"{self.get_text('undo_success')} ({success_count} {self.get_text('files_restored')})"
-                messagebox.showinfo(self.get_text('title'), message)
-                self._update_status(f"{self.get_text('success_renamed')} {success_count} {self.get_text('files_restored')}")
-            else:
-                message = f"{success_count} {self.get_text('files_restored')} {error_count} errors occurred."
-                messagebox.showwarning(self.get_text('title'), message)
-                self._update_status(f"{self.get_text('partial_success')} {success_count} restored, {error_count} errors")
-            
-            # Undo 스택 초기화 및 버튼 비활성화
-            self.undo_stack = []
-            self.undo_btn.config(state=tk.DISABLED)
-            
-            # 파일 수 업데이트
-            self.rename_mode._scan_files()
-            self._update_file_count()
-            self.clear_preview()
-            
-        except Exception as e:
-            messagebox.showerror(
+        self._start_batch(
+            lambda: self.rename_mode.undo_batch(self.history, batch[0]),
+            batch[3],
+            self._finish_undo,
+            'undo_error'
+        )
+    
+    def _finish_undo(self, result: Tuple[int, int]):
+        """Undo 완료 처리 (중단된 경우 되돌리지 않은 부분은 적용된 배치로 남음)"""
+        success_count, error_count = result
+        
+        # 결과 메시지
+        if error_count == 0 and not self.rename_mode.interrupted:
+            message = f"{self.get_text('undo_success')} ({success_count} {self.get_text('files_restored')})"
+            messagebox.showinfo(self.get_text('title'), message)
+            self._update_status(f"{self.get_text('success_renamed')} {success_count} {self.get_text('files_restored')}")
+        else:
+            message = f"{success_count} {self.get_text('files_restored')} {error_count} errors occurred."
+            message += self._format_error_details() + self._format_aborted_note()
+            messagebox.showwarning(self.get_text('title'), message)
+            self._update_status(f"{self.get_text('partial_success')} {success_count} restored, {error_count} errors")
+        
+        self._after_history_operation()
+    
+    def perform_redo_operation(self):
+        """Redo 작업 실행 (가장 최근에 되돌린 배치, 백그라운드 실행)"""
+        if self.batch_worker is not None or self.scan_worker is not None:
+            return
+        batch = self.history.next_redo()
+        if batch is None:
+            messagebox.showwarning(
                 self.get_text('title'),
-                f"{self.get_text('undo_error')}: {str(e)}"
+                self.get_text('no_redo_available')
             )
-            self._update_status(f"{self.get_text('error')} {str(e)}")
+            self._update_status(self.get_text('no_redo_available'))
+            return
+        
+        # 확인 팝업
+        result = messagebox.askyesno(
+            self.get_text('title'),
+            self.get_text('confirm_redo')
+        )
+        
+        if not result:
+            return
+        
+        # Redo 실행
+        self._start_batch(
+            lambda: self.rename_mode.redo_batch(self.history, batch[0]),
+            batch[3],
+            self._finish_redo,
+            'rename_error'
+        )
+    
+    def _finish_redo(self, result: Tuple[int, int]):
+        """Redo 완료 처리 (중단된 경우 다시 실행된 부분만 적용된 배치로 남음)"""
+        success_count, error_count = result
+        
+        # 결과 메시지
+        if error_count == 0 and not self.rename_mode.interrupted:
+            message = f"{self.get_text('rename_success')} ({success_count} {self.get_text('files_renamed')})"
+            messagebox.showinfo(self.get_text('title'), message)
+            self._update_status(f"{self.get_text('success_renamed')} {success_count} {self.get_text('files_renamed')}")
+        else:
+            message = f"{success_count} {self.get_text('files_renamed')} {error_count} errors occurred."
+            message += self._format_error_details() + self._format_aborted_note()
+            messagebox.showwarning(self.get_text('title'), message)
+            self._update_status(f"{self.get_text('partial_success')} {success_count} renamed, {error_count} errors")
+        
+        self._after_history_operation()
+    
+    def _after_history_operation(self):
+        """Undo/Redo 후 버튼, 폴더 표시, 파일 목록 갱신"""
+        self._update_history_buttons()
+        
+        # 다른 폴더의 배치였으면 해당 폴더로 전환되었으므로 표시 갱신
+        self.folder_path_value.config(text=self.rename_mode.selected_folder, foreground="black")
+        self.recursive_var.set(self.rename_mode.recursive)
+        
+        # 파일 목록 갱신 (변경된 이름만 반영)
+        self.clear_preview()
+        self._refresh_after_batch()
+
+
+# ============================================================================
+# 명령줄 인터페이스 - GUI 없이 실행 (cron, 디스플레이 없는 서버)
+# ============================================================================
+
+class NdjsonWriter:
+    """레코드를 한 줄에 하나씩 JSON으로 출력 (NDJSON, 여러 스레드에서 호출해도 줄이 섞이지 않음)"""
+    
+    def __init__(self, stream):
+        self.stream = stream
+        self._lock = threading.Lock()
+    
+    def emit(self, event: str, **fields):
+        line = json.dumps({'event': event, **fields}, ensure_ascii=False) + '\n'
+        with self._lock:
+            self.stream.write(line)
+    
+    def emit_errors(self, errors: List[Tuple[str, str, str]], **fields):
+        for current_name, new_name, code in errors:
+            self.emit('error', **fields, old=current_name, new=new_name, code=code)
+    
+    def progress_reporter(self) -> Callable[[Dict[str, Any]], None]:
+        """BatchControl 진행 상황을 progress 레코드로 출력하는 콜백 (작업 스레드에서 호출됨)"""
+        def report(progress: Dict[str, Any]):
+            self.emit('progress', **{
+                key: round(value, 3) if isinstance(value, float) else value for key, value in progress.items()
+            })
+        return report
+
+
+def build_cli_parser() -> argparse.ArgumentParser:
+    """명령줄 인자 파서"""
+    parser = argparse.ArgumentParser(
+        prog='smart_file_renamer.py',
+        description='Smart File Renamer - run without arguments to open the GUI. '
+                    'Subcommands write one JSON record per line (NDJSON) to stdout.'
+    )
+    subparsers = parser.add_subparsers(dest='command')
+    
+    subparsers.add_parser('gui', help='open the GUI')
+    
+    def add_filter_options(p):
+        p.add_argument('-r', '--recursive', action='store_true', help='include subfolders')
+        p.add_argument('--max-depth', type=int, default=None, help='subfolder depth limit for --recursive')
+        p.add_argument('--types', default=','.join(FileTypeClassifier.FILE_TYPES),
+                       help='comma-separated file types: image,video,document,other (default: all)')
+    
+    def add_scan_options(p):
+        p.add_argument('folder')
+        add_filter_options(p)
+    
+    def add_name_options(p, with_folder=True):
+        if with_folder:
+            add_scan_options(p)
+        else:
+            add_filter_options(p)
+        p.add_argument('--prefix', default='')
+        p.add_argument('--sequential', action='store_true', help='prefix + sequence number instead of prefix + name')
+        p.add_argument('--start', type=int, default=1, help='first sequence number')
+        p.add_argument('--padding', type=int, default=3, help='sequence number digits')
+        p.add_argument('--template', default=None, help='name template, e.g. "{date}_{n:04}{ext}"')
+    
+    p = subparsers.add_parser('scan', help='list files: {"event": "file", "name", "type"}')
+    add_scan_options(p)
+    
+    p = subparsers.add_parser('plan', help='dry run - stream planned names: {"event": "plan", "old", "new"}')
+    add_name_options(p)
+    
+    p = subparsers.add_parser('rename', help='rename files and record the batch in the undo history')
+    add_name_options(p)
+    p.add_argument('--dry-run', action='store_true', help='same as plan')
+    p.add_argument('--progress', action='store_true', help='also write progress records (at most 10/s)')
+    
+    p = subparsers.add_parser(
+        'batch', help='rename many folders with one configuration in parallel processes: '
+                      'one "folder" record per folder, then a summary; each folder is its own undo step'
+    )
+    p.add_argument('folders', nargs='*', help='folders to rename (or use --root)')
+    p.add_argument('--root', default=None, help='pick the folders under this folder that match --glob')
+    p.add_argument('--glob', default='*', help='folder pattern relative to --root, "**" for any depth (default: *)')
+    p.add_argument('--workers', type=int, default=None, help='folders processed at once (default: CPU count)')
+    add_name_options(p, with_folder=False)
+    p.add_argument('--dry-run', action='store_true', help='plan only, write no files and no undo history')
+    
+    for command in ('undo', 'redo'):
+        p = subparsers.add_parser(command, help=f'{command} the most recent batch in the undo history')
+        p.add_argument('--progress', action='store_true', help='also write progress records (at most 10/s)')
+    
+    return parser
+
+
+def _cli_types(args, out: NdjsonWriter) -> Optional[Set[str]]:
+    """--types 값의 타입 집합 (알 수 없는 타입이면 error 레코드 출력 후 None)"""
+    types = {file_type.strip() for file_type in args.types.split(',') if file_type.strip()}
+    unknown = types - set(FileTypeClassifier.FILE_TYPES)
+    if unknown:
+        out.emit('error', code='USAGE', message=f"unknown file type: {', '.join(sorted(unknown))}")
+        return None
+    return types
+
+
+def _cli_scan(args, out: NdjsonWriter) -> Optional[RenameMode]:
+    """폴더 스캔 및 타입 필터 적용 (폴더/타입이 잘못되면 error 레코드 출력 후 None)"""
+    types = _cli_types(args, out)
+    if types is None:
+        return None
+    
+    folder = os.path.abspath(args.folder)
+    if not os.path.isdir(folder):
+        out.emit('error', code='ENOENT', message=f"not a folder: {folder}")
+        return None
+    
+    mode = RenameMode()
+    mode.set_recursive(args.recursive, args.max_depth)
+    mode.set_folder(folder)
+    mode.apply_file_type_filter(types)
+    return mode
+
+
+def _cli_check_name_options(args, out: NdjsonWriter) -> bool:
+    """이름 규칙 인자 확인 (잘못되면 error 레코드 출력 후 False)"""
+    if not args.prefix and not args.template:
+        out.emit('error', code='USAGE', message="--prefix or --template is required")
+        return False
+    if args.start < 0 or not 1 <= args.padding <= 10:
+        out.emit('error', code='USAGE', message="--start must be >= 0 and --padding between 1 and 10")
+        return False
+    return True
+
+
+def _cli_iter_plan(args, mode: RenameMode, out: NdjsonWriter) -> Optional[Iterator[Tuple[str, str]]]:
+    """새 이름을 하나씩 생성하는 반복자 (설정이 잘못되면 error 레코드 출력 후 None)"""
+    if not _cli_check_name_options(args, out):
+        return None
+    try:
+        return mode.iter_new_names(args.prefix, args.sequential, args.start, args.padding, args.template)
+    except ValueError as e:
+        out.emit('error', code='TEMPLATE', message=str(e))
+        return None
+
+
+def run_cli(argv: Optional[List[str]] = None) -> int:
+    """
+    명령줄 실행
+    
+    이름 계획은 한 줄씩 바로 출력하고, 실행은 계획을 청크 단위로 받아 진행하므로 계획 전체를
+    메모리에 모으지 않는다. 표준 출력에는 NDJSON 레코드만 쓰며(파일별 오류, 잘못된 폴더/템플릿도
+    error 레코드), argparse가 거부한 인자와 예상하지 못한 예외만 표준 오류로 나간다.
+    
+    Returns:
+        종료 코드 (0: 성공, 1: 일부 파일 실패, 2: 잘못된 인자/폴더/템플릿)
+    """
+    args = build_cli_parser().parse_args(argv)
+    if args.command in (None, 'gui'):
+        run_gui()
+        return 0
+    
+    out = NdjsonWriter(sys.stdout)
+    try:
+        return _run_cli_command(args, out)
+    except BrokenPipeError:
+        # 출력을 받는 쪽(head 등)이 먼저 닫힘 - 종료 시 flush 오류가 나지 않도록 표준 출력을 버림
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+
+
+def _run_cli_command(args, out: NdjsonWriter) -> int:
+    if args.command in ('undo', 'redo'):
+        return _cli_history(args, out)
+    if args.command == 'batch':
+        return _cli_batch(args, out)
+    
+    started = time.perf_counter()
+    mode = _cli_scan(args, out)
+    if mode is None:
+        return 2
+    
+    if args.command == 'scan':
+        for name in mode.filtered_files:
+            out.emit('file', name=name, type=FileTypeClassifier.get_file_type(name))
+        out.emit('summary', folder=mode.selected_folder, files=mode.get_file_count(),
+                 elapsed=round(time.perf_counter() - started, 3))
+        return 0
+    
+    plan = _cli_iter_plan(args, mode, out)
+    if plan is None:
+        return 2
+    
+    if args.command == 'plan' or args.dry_run:
+        planned = 0
+        for current_name, new_name in plan:
+            out.emit('plan', old=current_name, new=new_name)
+            planned += 1
+        out.emit('summary', folder=mode.selected_folder, planned=planned, dry_run=True,
+                 elapsed=round(time.perf_counter() - started, 3))
+        return 0
+    
+    # 계획 생성과 실행을 청크마다 번갈아 진행하고 Undo 기록도 청크마다 커밋
+    control = BatchControl(mode.get_file_count(), report=out.progress_reporter() if args.progress else None)
+    history = UndoHistory.open_default()
+    batch_id = None
+    success_count = 0
+    error_count = 0
+    try:
+        with mode.controlled(control):
+            for chunk_success, chunk_errors, undo_rows in mode.rename_stream(plan):
+                success_count += chunk_success
+                error_count += chunk_errors
+                if undo_rows:
+                    if batch_id is None:
+                        batch_id = history.begin_batch(mode.selected_folder, mode.recursive)
+                    history.append_rows(batch_id, undo_rows)
+    finally:
+        history.close()
+    out.emit_errors(mode.last_rename_errors)
+    out.emit('summary', folder=mode.selected_folder, renamed=success_count, failed=error_count,
+             batch=batch_id, elapsed=round(time.perf_counter() - started, 3))
+    return 1 if error_count else 0
+
+
+def _cli_batch(args, out: NdjsonWriter) -> int:
+    """여러 폴더 일괄 이름 변경 (폴더마다 folder 레코드, 파일별 오류는 error 레코드)"""
+    types = _cli_types(args, out)
+    if types is None or not _cli_check_name_options(args, out):
+        return 2
+    if bool(args.folders) == bool(args.root):
+        out.emit('error', code='USAGE', message="give either folders or --root")
+        return 2
+    if args.workers is not None and args.workers < 1:
+        out.emit('error', code='USAGE', message="--workers must be >= 1")
+        return 2
+    
+    options = {
+        'types': sorted(types), 'recursive': args.recursive, 'max_depth': args.max_depth,
+        'prefix': args.prefix, 'sequential': args.sequential, 'start': args.start, 'padding': args.padding,
+        'template': args.template, 'dry_run': args.dry_run,
+    }
+    try:
+        runner = FolderBatchRunner(options, workers=args.workers)
+    except ValueError as e:
+        out.emit('error', code='TEMPLATE', message=str(e))
+        return 2
+    try:
+        folders = runner.check_folders(
+            FolderBatchRunner.find_folders(args.root, args.glob) if args.root else args.folders
+        )
+    except ValueError as e:
+        out.emit('error', code='USAGE', message=str(e))
+        return 2
+    if not folders:
+        out.emit('error', code='ENOENT', message=f"no folders match {os.path.join(args.root, args.glob)}")
+        return 2
+    
+    def report(folder_report: Dict[str, Any]):
+        out.emit_errors(folder_report.pop('errors'), folder=folder_report['folder'])
+        out.emit('folder', **{
+            key: round(value, 3) if isinstance(value, float) else value for key, value in folder_report.items()
+        })
+    
+    # 실행한 폴더마다 Undo 기록 배치 하나 (undo 한 번에 폴더 하나씩 최근 것부터 되돌림)
+    runner.history = None if args.dry_run else UndoHistory.open_default()
+    try:
+        summary = runner.run(folders, on_report=report)
+    finally:
+        if runner.history is not None:
+            runner.history.close()
+    
+    summary['elapsed'] = round(summary['elapsed'], 3)
+    out.emit('summary', dry_run=args.dry_run, **summary)
+    return 1 if summary['failed'] or summary['failed_folders'] else 0
+
+
+def _cli_history(args, out: NdjsonWriter) -> int:
+    """Undo/Redo 기록의 배치 되돌리기/다시 실행"""
+    history = UndoHistory.open_default()
+    try:
+        if args.command == 'undo':
+            batch = history.latest(UndoHistory.STATE_DONE)
+        else:
+            batch = history.next_redo()
+        if batch is None:
+            out.emit('error', code='NO_BATCH', message=f"nothing to {args.command}")
+            return 2
+        
+        started = time.perf_counter()
+        mode = RenameMode()
+        control = BatchControl(batch[3], report=out.progress_reporter() if args.progress else None)
+        with mode.controlled(control):
+            if args.command == 'undo':
+                success_count, error_count = mode.undo_batch(history, batch[0])
+            else:
+                success_count, error_count = mode.redo_batch(history, batch[0])
+        out.emit_errors(mode.last_rename_errors)
+        out.emit('summary', folder=batch[1], batch=batch[0], renamed=success_count, failed=error_count,
+                 elapsed=round(time.perf_counter() - started, 3))
+        return 1 if error_count else 0
+    finally:
+        history.close()
 
 
 # ============================================================================
 # 진입점
 # ============================================================================
 
-def main():
-    """메인 함수"""
+def run_gui():
+    """GUI 실행"""
+    load_tkinter()
     root = tk.Tk()
-    app = SmartFileRenamer(root)
+    SmartFileRenamer(root)
     root.mainloop()
 
 
+def main(argv: Optional[List[str]] = None) -> int:
+    """메인 함수 - 인자가 없으면 GUI, 하위 명령이 있으면 명령줄 모드"""
+    return run_cli(argv)
+
+
 if __name__ == '__main__':
-    main()
+    sys.exit(main())